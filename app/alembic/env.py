@@ -11,7 +11,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# 由应用内（src.db.bootstrap）传入连接调用时，不覆盖应用的日志配置
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -62,6 +63,14 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # 由 src.db.bootstrap 调用时复用其连接（在初始化锁内执行）
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     configuration = config.get_section(config.config_ini_section, {})
     
     # Override database URL if environment variable is set
@@ -0,0 +1,32 @@
+"""添加分页排序字段索引
+
+Revision ID: 5c3e9a7d2b14
+Revises: 827605f1ad30
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c3e9a7d2b14'
+down_revision: Union[str, None] = '827605f1ad30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 游标分页按 (排序字段, id) 做 seek，需要排序字段上有索引
+    # SQLite 的二级索引隐含 rowid（即 id），单列索引即可覆盖 (字段, id)
+    op.create_index(op.f('ix_users_created_at'), 'users', ['created_at'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_tasks_created_at'), 'tasks', ['created_at'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_tasks_due_date'), 'tasks', ['due_date'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tasks_due_date'), table_name='tasks', if_exists=True)
+    op.drop_index(op.f('ix_tasks_created_at'), table_name='tasks', if_exists=True)
+    op.drop_index(op.f('ix_users_created_at'), table_name='users', if_exists=True)
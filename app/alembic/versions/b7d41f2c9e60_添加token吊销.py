@@ -0,0 +1,41 @@
+"""添加Token吊销
+
+Revision ID: b7d41f2c9e60
+Revises: 5c3e9a7d2b14
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d41f2c9e60'
+down_revision: Union[str, None] = '5c3e9a7d2b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 已有用户的 Token 版本为 0（旧 Token 没有 gen 声明，按 0 处理）
+    op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0', comment='Token 版本：递增后此前签发的 Token 全部失效'))
+    op.create_table(
+        'auth_revocations',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='事件ID'),
+        sa.Column('user_id', sa.Integer(), nullable=False, comment='用户ID'),
+        sa.Column('generation', sa.Integer(), nullable=True, comment='用户级吊销：用户新的 Token 版本'),
+        sa.Column('token_id', sa.String(length=32), nullable=True, comment='单个 Token 吊销：Token 的 jti'),
+        sa.Column('expires_at', sa.DateTime(), nullable=False, comment='过期时间（之后吊销的 Token 已全部过期，可以清除）'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_auth_revocations_expires_at'), 'auth_revocations', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_auth_revocations_expires_at'), table_name='auth_revocations')
+    op.drop_table('auth_revocations')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('token_version')
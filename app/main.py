@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
 from logging import getLogger
 import logging
 from fastapi import FastAPI, HTTPException
@@ -10,12 +12,35 @@ import loguru
 
 # 导入API路由
 from src.api.v1 import router as router_v1
+from src.db import engine, async_engine, read_engine, async_read_engine
+from src.db.bootstrap import init_schema
+from src.middleware.auth import password_pool
+from src.middleware.revocation import revocation_sync
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """启动时初始化数据库结构（已是最新版本时只查询一次版本表）并加载 Token 吊销表，关闭时释放连接"""
+    init_schema(engine)
+    revocation_sync.refresh()
+    sync_task = asyncio.create_task(revocation_sync.run())
+    yield
+    sync_task.cancel()
+    password_pool.shutdown(wait=False)
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+    engine.dispose()
+    if read_engine is not engine:
+        read_engine.dispose()
+
 
 # 创建FastAPI应用
 app = FastAPI(
     title="Just Enough Stack API",
     description="轻量级全栈开发框架 - 后端API服务",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # 配置CORS中间件
@@ -53,6 +78,8 @@ async def http_exception_handler(request, exc):
             "message": exc.detail,
             "error_code": exc.status_code,
         },
+        # 保留 Retry-After（429）、WWW-Authenticate（401）等响应头
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -3,6 +3,7 @@
 数据库迁移管理脚本
 """
 import os
+import sys
 import argparse
 from alembic import command
 from alembic.config import Config
@@ -74,6 +75,30 @@ def downgrade(revision: str):
         return False
     return True
 
+def bootstrap():
+    """初始化数据库结构（新数据库建表，旧数据库升级到最新版本）"""
+    from src.db import engine
+    from src.db.bootstrap import init_schema
+
+    try:
+        init_schema(engine)
+        print("✅ 数据库结构已是最新版本")
+    except Exception as e:
+        print(f"❌ 初始化失败: {e}")
+        return False
+    return True
+
+def check():
+    """检查数据库结构是否为最新版本"""
+    from src.db import engine
+    from src.db.bootstrap import is_schema_at_head
+
+    if is_schema_at_head(engine):
+        print("✅ 数据库结构已是最新版本")
+        return True
+    print("❌ 数据库结构需要升级")
+    return False
+
 def main():
     parser = argparse.ArgumentParser(description="数据库迁移管理")
     subparsers = parser.add_subparsers(dest="command", help="可用命令")
@@ -94,6 +119,12 @@ def main():
     # 显示当前版本命令
     subparsers.add_parser("current", help="显示当前数据库版本")
     
+    # 初始化数据库结构命令
+    subparsers.add_parser("bootstrap", help="初始化数据库结构（建表或升级到最新版本）")
+
+    # 检查版本命令
+    subparsers.add_parser("check", help="检查数据库结构是否为最新版本")
+
     # 回滚命令
     downgrade_parser = subparsers.add_parser("downgrade", help="回滚到指定版本")
     downgrade_parser.add_argument("revision", help="目标版本")
@@ -112,6 +143,10 @@ def main():
         show_current()
     elif args.command == "downgrade":
         downgrade(args.revision)
+    elif args.command == "bootstrap":
+        bootstrap()
+    elif args.command == "check":
+        sys.exit(0 if check() else 1)
     else:
         parser.print_help()
 
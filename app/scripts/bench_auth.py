@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+认证方式吞吐量基准
+
+对比同一个需要 manage_users 权限的接口在三种写法下的每秒请求数：
+    - baseline: 不做认证（框架本身的开销）
+    - depends: Depends(check_user_permission(...)) 依赖链
+    - middleware: AuthenticationMiddleware + AuthRoute + @requires
+
+直接调用 ASGI 应用（不经过网络和 HTTP 客户端），Token 缓存对两种认证方式
+都开启，只测量认证在框架中的开销。
+
+用法（在 app 目录下）:
+    python scripts/bench_auth.py [--requests 5000] [--concurrency 1,16]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi import APIRouter, Depends, FastAPI, Request  # noqa: E402
+
+from je_stack.auth import (  # noqa: E402
+    AuthenticationMiddleware,
+    AuthRoute,
+    CurrentUser,
+    check_user_permission,
+    create_token_for_user,
+    get_request_user,
+    requires,
+)
+
+
+def build_baseline_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> Dict[str, Any]:
+        return {"id": item_id, "user_id": 1}
+
+    return app
+
+
+def build_depends_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(
+        item_id: int,
+        current_user: CurrentUser = Depends(check_user_permission(permission="manage_users")),
+    ) -> Dict[str, Any]:
+        return {"id": item_id, "user_id": current_user.user_id}
+
+    return app
+
+
+def build_middleware_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AuthenticationMiddleware)
+    router = APIRouter(route_class=AuthRoute)
+
+    @router.get("/items/{item_id}")
+    @requires(permission="manage_users")
+    async def get_item(item_id: int, request: Request) -> Dict[str, Any]:
+        return {"id": item_id, "user_id": get_request_user(request).user_id}
+
+    app.include_router(router)
+    return app
+
+
+async def call(app: FastAPI, path: str, headers: List[tuple]) -> int:
+    """发送一个 GET 请求，返回状态码"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    status_code = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def measure(app: FastAPI, headers: List[tuple], requests: int, concurrency: int) -> float:
+    """并发发送请求，返回每秒请求数"""
+    status_code = await call(app, "/items/1", headers)
+    assert status_code == 200, f"unexpected status {status_code}"
+
+    async def worker(count: int):
+        for i in range(count):
+            await call(app, f"/items/{i}", headers)
+
+    per_worker = requests // concurrency
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    return per_worker * concurrency / (time.perf_counter() - started)
+
+
+async def run(requests: int, concurrencies: List[int]) -> None:
+    token = create_token_for_user(username="admin", user_id=1, role="admin")
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    apps = [
+        ("baseline", build_baseline_app(), []),
+        ("depends", build_depends_app(), headers),
+        ("middleware", build_middleware_app(), headers),
+    ]
+
+    print(f"{'concurrency':<14}" + "".join(f"{name + ' (req/s)':>22}" for name, _, _ in apps))
+    for concurrency in concurrencies:
+        results = [
+            await measure(app, app_headers, requests, concurrency)
+            for _, app, app_headers in apps
+        ]
+        print(f"{concurrency:<14}" + "".join(f"{r:>22.0f}" for r in results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="认证方式吞吐量基准")
+    parser.add_argument("--requests", type=int, default=5000, help="每项的请求数")
+    parser.add_argument("--concurrency", default="1,16", help="并发数，逗号分隔")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, [int(c) for c in args.concurrency.split(",")]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+DAO 热点查询微基准
+
+对比旧写法（每次调用重新构造 session.query(...) 链）与 BaseDAO 预构建语句
+（bindparam + 语句缓存）在 TaskDAO / UserDAO 常用读路径上的单次调用开销。
+使用内存 SQLite，并关闭进程内行缓存，只测量语句构造和编译的差异。
+
+用法（在 app 目录下）:
+    python scripts/bench_dao.py [--rows 1000] [--number 2000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.dao import TaskDAO, UserDAO  # noqa: E402
+from src.orm import Base, TaskModel, UserModel  # noqa: E402
+
+
+def measure(func: Callable[[int], object], number: int) -> float:
+    """返回单次调用的平均耗时（微秒）"""
+    for i in range(min(number, 100)):
+        func(i)
+    started = time.perf_counter()
+    for i in range(number):
+        func(i)
+    return (time.perf_counter() - started) / number * 1_000_000
+
+
+def seed(session: Session, rows: int) -> None:
+    """写入测试数据"""
+    user_dao = UserDAO(session)
+    user_dao.add_lines(
+        {"username": f"user{i}", "password": "x", "nickname": f"nick{i}"}
+        for i in range(rows)
+    )
+    TaskDAO(session).create_tasks(
+        [
+            {"title": f"task{i}", "creator_id": i % rows + 1, "status": "pending"}
+            for i in range(rows)
+        ]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DAO 热点查询微基准")
+    parser.add_argument("--rows", type=int, default=1000, help="每张表的数据行数")
+    parser.add_argument("--number", type=int, default=2000, help="每项的调用次数")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        seed(session, args.rows)
+        task_dao = TaskDAO(session)
+        user_dao = UserDAO(session)
+        task_dao.cache = None
+        user_dao.cache = None
+        rows = args.rows
+
+        def reset():
+            # 每次调用前清空 identity map，避免 get() 直接返回已加载对象
+            session.expunge_all()
+
+        cases = [
+            (
+                "TaskDAO.get_task_by_id",
+                lambda i: (
+                    reset(),
+                    session.query(TaskModel).filter(TaskModel.id == i % rows + 1).first(),
+                ),
+                lambda i: (reset(), task_dao.get_task_by_id(i % rows + 1)),
+            ),
+            (
+                "TaskDAO.get_lines_by_field",
+                lambda i: session.query(TaskModel)
+                .filter(TaskModel.creator_id == i % rows + 1)
+                .all(),
+                lambda i: task_dao.get_lines_by_field("creator_id", i % rows + 1),
+            ),
+            (
+                "UserDAO.get_user_by_username",
+                lambda i: (
+                    reset(),
+                    session.query(UserModel)
+                    .filter(UserModel.username == f"user{i % rows}")
+                    .first(),
+                ),
+                lambda i: (reset(), user_dao.get_user_by_username(f"user{i % rows}")),
+            ),
+            (
+                "UserDAO.exists",
+                lambda i: session.query(UserModel)
+                .filter(UserModel.id == i % rows + 1)
+                .count()
+                > 0,
+                lambda i: user_dao.exists(i % rows + 1),
+            ),
+        ]
+
+        print(f"{'hot path':<32}{'before (µs)':>14}{'after (µs)':>14}{'speedup':>10}")
+        for name, before, after in cases:
+            before_us = measure(before, args.number)
+            after_us = measure(after, args.number)
+            print(
+                f"{name:<32}{before_us:>14.1f}{after_us:>14.1f}"
+                f"{before_us / after_us:>9.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
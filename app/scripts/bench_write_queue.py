@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+SQLite 并发写入基准
+
+对比多个线程各自使用 Session 直接提交（每次写入一个事务、争抢写锁）
+与通过 WriteQueue 组提交（单个写线程合并事务）的写入吞吐量。
+使用临时文件数据库和 durable 预设（WAL + synchronous=FULL），每次提交都会 fsync。
+
+用法（在 app 目录下）:
+    python scripts/bench_write_queue.py [--threads 1,4,16] [--writes 200]
+"""
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from loguru import logger  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from je_stack.utils import create_database_engine, WriteQueue  # noqa: E402
+from src.orm import Base, TaskModel, UserModel  # noqa: E402
+
+
+def add_task(session: Session, title: str) -> int:
+    """单个写操作：插入一条任务"""
+    task = TaskModel(title=title, creator_id=1)
+    session.add(task)
+    session.flush()
+    return task.id
+
+
+def run_threads(threads: int, writes: int, write: Callable[[str], None]) -> float:
+    """多个线程并发写入，返回每秒写入数"""
+
+    def worker(k: int):
+        for i in range(writes):
+            write(f"task-{k}-{i}")
+
+    workers = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return threads * writes / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 并发写入基准")
+    parser.add_argument("--threads", default="1,4,16", help="并发线程数，逗号分隔")
+    parser.add_argument("--writes", type=int, default=200, help="每个线程的写入次数")
+    args = parser.parse_args()
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_database_engine(
+            f"sqlite:///{tmp}/bench.db", pool_size=32, sqlite_profile="durable"
+        )
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(UserModel(username="bench", password="x", nickname="bench"))
+            session.commit()
+
+        retries = 0
+
+        def direct(title: str) -> None:
+            nonlocal retries
+            while True:
+                try:
+                    with Session(engine) as session:
+                        add_task(session, title)
+                        session.commit()
+                    return
+                except OperationalError:  # database is locked
+                    retries += 1
+
+        print(f"{'threads':>8}{'direct (w/s)':>16}{'queue (w/s)':>16}{'speedup':>10}")
+        with WriteQueue(engine) as write_queue:
+            for threads in (int(n) for n in args.threads.split(",")):
+                direct_rate = run_threads(threads, args.writes, direct)
+                queue_rate = run_threads(
+                    threads, args.writes, lambda title: write_queue.run(add_task, title)
+                )
+                print(
+                    f"{threads:>8}{direct_rate:>16.0f}{queue_rate:>16.0f}"
+                    f"{queue_rate / direct_rate:>9.2f}x"
+                )
+        if retries:
+            print(f"direct: {retries} 次 database is locked 重试")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
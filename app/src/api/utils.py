@@ -1,9 +1,10 @@
 from functools import wraps
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.types.standard_response import StandardResponse
-from src.db import engine
+from src.db import engine, async_engine, read_engine, async_read_engine
 
 
 def get_db_session():
@@ -11,6 +12,24 @@ def get_db_session():
         yield session
 
 
+async def get_async_db_session():
+    # 异步会话中访问过期属性会触发隐式 IO，因此提交后不过期对象
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+def get_read_db_session():
+    """只读会话（GET 接口使用），文件型 SQLite 上走 query_only 的读连接池"""
+    with Session(read_engine) as session:
+        yield session
+
+
+async def get_async_read_db_session():
+    """get_read_db_session 的异步版本"""
+    async with AsyncSession(async_read_engine, expire_on_commit=False) as session:
+        yield session
+
+
 def exception_wrapper(
     error_message: str | None = None,
     catch_http_exc: bool = False,
@@ -1,22 +1,48 @@
 """任务管理 API 端点"""
 
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Annotated, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from src.middleware.auth import CurrentUser, check_user_permission
-from src.dao.task_dao import TaskDAO
+from src.dao.base import AsyncBaseDAO, AsyncBatchLoader, FormValidationError
+from src.dao.task_dao import AsyncTaskDAO, task_query
 from src.types.standard_response import StandardResponse
+from src.orm import UserModel
 from src.types.task_models import TaskCreate, TaskUpdate, TaskResponse
-from ..utils import exception_wrapper, get_db_session
+from ..utils import (
+    exception_wrapper,
+    get_async_db_session,
+    get_async_read_db_session,
+)
 
 router = APIRouter(prefix="/tasks", tags=["任务管理"])
 
+# 列表接口只查询响应需要的字段，返回 Row 而不是完整的 ORM 实例
+TASK_LIST_COLUMNS = list(TaskResponse.model_fields)
 
-def get_task_dao(db_session: Annotated[Session, Depends(get_db_session)]):
-    """获取任务 DAO 依赖"""
-    return TaskDAO(db_session)
+
+def get_task_dao(db_session: Annotated[AsyncSession, Depends(get_async_db_session)]):
+    """获取任务 DAO 依赖（异步会话，数据库访问不阻塞事件循环）"""
+    return AsyncTaskDAO(db_session)
+
+
+def get_task_read_dao(
+    db_session: Annotated[AsyncSession, Depends(get_async_read_db_session)],
+):
+    """获取只读任务 DAO 依赖（GET 接口使用读连接池）"""
+    return AsyncTaskDAO(db_session)
+
+
+def get_creator_loader(
+    db_session: Annotated[AsyncSession, Depends(get_async_read_db_session)],
+):
+    """请求级的任务创建者加载器：列表中所有创建者合并为一次 IN 查询"""
+    return AsyncBatchLoader(
+        AsyncBaseDAO(db_session, UserModel), columns=["id", "nickname"]
+    )
 
 
 @router.post("/", response_model=StandardResponse, status_code=status.HTTP_201_CREATED)
@@ -24,10 +50,10 @@ def get_task_dao(db_session: Annotated[Session, Depends(get_db_session)]):
 async def create_task(
     task_data: TaskCreate,
     current_user: CurrentUser = Depends(check_user_permission()),
-    task_dao: TaskDAO = Depends(get_task_dao),
+    task_dao: AsyncTaskDAO = Depends(get_task_dao),
 ):
     """创建任务"""
-    task = task_dao.create_task(
+    task = await task_dao.create_task(
         title=task_data.title,
         creator_id=current_user.user_id,
         description=task_data.description,
@@ -46,20 +72,66 @@ async def create_task(
 async def get_tasks(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: Literal["id", "created_at", "due_date"] = "id",
+    descending: bool = False,
+    task_status: Optional[str] = Query(None, alias="status"),
+    priority: Optional[str] = None,
+    keyword: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
     current_user: CurrentUser = Depends(check_user_permission()),
-    task_dao: TaskDAO = Depends(get_task_dao),
+    task_dao: AsyncTaskDAO = Depends(get_task_read_dao),
+    creator_loader: AsyncBatchLoader = Depends(get_creator_loader),
 ):
-    """获取任务列表（分页）"""
-    tasks = task_dao.get_all_tasks(skip=skip, limit=limit)
-
+    """获取任务列表（分页）
+
+    传入上一页返回的 next_cursor 即可翻页（游标分页，任意页代价相同）；
+    skip > 0 时退回到 OFFSET 分页以兼容旧客户端。
+    status / priority / keyword / due_after / due_before 过滤均在数据库中完成。
+    """
+    query = task_query(
+        status=task_status,
+        priority=priority,
+        keyword=keyword,
+        due_after=due_after,
+        due_before=due_before,
+        sort=[f"-{order_by}" if descending else order_by],
+    )
+    next_cursor = None
+    try:
+        if skip > 0:
+            tasks = await task_dao.get_all_tasks(
+                skip=skip, limit=limit, columns=TASK_LIST_COLUMNS, query=query
+            )
+        else:
+            tasks, next_cursor = await task_dao.get_tasks_page(
+                cursor=cursor,
+                limit=limit,
+                order_by=order_by,
+                descending=descending,
+                columns=TASK_LIST_COLUMNS,
+                query=query,
+            )
+    except FormValidationError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    creators = await creator_loader.load_many(t.creator_id for t in tasks)
     return StandardResponse(
         success=True,
         message="获取任务列表成功",
         data={
-            "tasks": [TaskResponse.from_orm(t).dict() for t in tasks],
+            "tasks": [
+                {
+                    **TaskResponse.from_orm(t).dict(),
+                    "creator_nickname": creator.nickname if creator else None,
+                }
+                for t, creator in zip(tasks, creators)
+            ],
             "total": len(tasks),
             "skip": skip,
             "limit": limit,
+            "next_cursor": next_cursor,
         },
     )
 
@@ -68,10 +140,12 @@ async def get_tasks(
 @exception_wrapper(catch_http_exc=True)
 async def get_my_tasks(
     current_user: CurrentUser = Depends(check_user_permission()),
-    task_dao: TaskDAO = Depends(get_task_dao),
+    task_dao: AsyncTaskDAO = Depends(get_task_read_dao),
 ):
     """获取我的任务"""
-    tasks = task_dao.get_tasks_by_creator(current_user.user_id)
+    tasks = await task_dao.get_tasks_by_creator(
+        current_user.user_id, columns=TASK_LIST_COLUMNS
+    )
 
     return StandardResponse(
         success=True,
@@ -85,10 +159,10 @@ async def get_my_tasks(
 async def get_task(
     task_id: int,
     current_user: CurrentUser = Depends(check_user_permission()),
-    task_dao: TaskDAO = Depends(get_task_dao),
+    task_dao: AsyncTaskDAO = Depends(get_task_read_dao),
 ):
     """获取任务详情"""
-    task = task_dao.get_task_by_id(task_id)
+    task = await task_dao.get_task_by_id(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="任务不存在")
 
@@ -103,24 +177,28 @@ async def update_task(
     task_id: int,
     task_data: TaskUpdate,
     current_user: CurrentUser = Depends(check_user_permission()),
-    task_dao: TaskDAO = Depends(get_task_dao),
+    task_dao: AsyncTaskDAO = Depends(get_task_dao),
 ):
     """更新任务"""
-    task = task_dao.get_task_by_id(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="任务不存在")
+    # 校验和写入在同一个事务中，返回响应前提交；出错时在异常到达
+    # exception_wrapper 之前整体回滚
+    async with task_dao.transaction():
+        task = await task_dao.get_task_by_id(task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="任务不存在")
+
+        # 检查权限：只有创建者可以更新
+        if task.creator_id != current_user.user_id:
+            raise HTTPException(status_code=403, detail="无权限修改此任务")
 
-    # 检查权限：只有创建者可以更新
-    if task.creator_id != current_user.user_id:
-        raise HTTPException(status_code=403, detail="无权限修改此任务")
+        update_data = task_data.dict(exclude_unset=True)
+        success = await task_dao.update_task(task_id, **update_data)
 
-    update_data = task_data.dict(exclude_unset=True)
-    success = task_dao.update_task(task_id, **update_data)
+        if not success:
+            raise HTTPException(status_code=500, detail="更新任务失败")
 
-    if not success:
-        raise HTTPException(status_code=500, detail="更新任务失败")
+        updated_task = await task_dao.get_task_by_id(task_id)
 
-    updated_task = task_dao.get_task_by_id(task_id)
     return StandardResponse(
         success=True, message="任务更新成功", data={"task": TaskResponse.from_orm(updated_task).dict()}
     )
@@ -131,22 +209,23 @@ async def update_task(
 async def delete_task(
     task_id: int,
     current_user: CurrentUser = Depends(check_user_permission()),
-    task_dao: TaskDAO = Depends(get_task_dao),
+    task_dao: AsyncTaskDAO = Depends(get_task_dao),
 ):
     """删除任务"""
-    task = task_dao.get_task_by_id(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="任务不存在")
-
-    # 检查权限：只有创建者或管理员可以删除
-    if task.creator_id != current_user.user_id and current_user.role not in [
-        "admin",
-        "super_admin",
-    ]:
-        raise HTTPException(status_code=403, detail="无权限删除此任务")
-
-    success = task_dao.delete_task(task_id)
-    if not success:
-        raise HTTPException(status_code=500, detail="删除任务失败")
+    async with task_dao.transaction():
+        task = await task_dao.get_task_by_id(task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="任务不存在")
+
+        # 检查权限：只有创建者或管理员可以删除
+        if task.creator_id != current_user.user_id and current_user.role not in [
+            "admin",
+            "super_admin",
+        ]:
+            raise HTTPException(status_code=403, detail="无权限删除此任务")
+
+        success = await task_dao.delete_task(task_id)
+        if not success:
+            raise HTTPException(status_code=500, detail="删除任务失败")
 
     return StandardResponse(success=True, message="任务删除成功", data={})
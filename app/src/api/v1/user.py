@@ -1,43 +1,56 @@
 import asyncio
 import os
+from functools import partial
 from typing import Dict, Any, Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from loguru import logger
 
+from src.db import engine
 from src.middleware.auth import (
     CurrentUser,
+    PasswordPoolBusyError,
+    ahash_password,
+    averify_password,
     check_user_permission,
     create_token_for_user,
-    hash_password,
-    verify_password,
+    password_pool,
 )
 from src.dao.user_dao import UserDAO
+from src.middleware.rate_limit import (
+    login_failures,
+    login_rate_limit,
+    register_rate_limit,
+    reserve_login_attempt,
+)
+from src.middleware.revocation import revocation_sync
+from src.exc import AlreadyExistsError
 from src.types.standard_response import StandardResponse
 from src.types.models import UserType
 from src.types.users import UserLoginRequest, UserResponse, LoginResponse
 
-from ..utils import exception_wrapper, get_db_session
+from ..utils import exception_wrapper, get_db_session, get_read_db_session
 
 # 创建用户路由 - 路径对应 /user
 router = APIRouter(prefix="/user", tags=["用户管理"])
 
 
+def save_rehashed_password(user_id: int, old_hash: str, new_hash: str) -> None:
+    """保存重新哈希的密码（在密码线程池中执行，使用独立的会话）"""
+    with Session(engine) as session:
+        if UserDAO(session).replace_password_hash(user_id, old_hash, new_hash):
+            logger.info(f"✓ 用户 ID {user_id} 的密码哈希已更新为当前参数")
+
+
 class AuthService:
     """用户认证服务"""
 
     def __init__(self, session: Session):
         self.user_dao = UserDAO(session)
 
-    def register_user(self, user_data: UserType) -> UserResponse:
+    async def register_user(self, user_data: UserType) -> UserResponse:
         """用户注册"""
         try:
-            existing_user = self.user_dao.get_user_by_username(user_data.username)
-            if existing_user:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"用户名 '{user_data.username}' 已存在",
-                )
             if len(user_data.username) < 3:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -48,14 +61,21 @@ class AuthService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="密码长度至少为6个字符",
                 )
-            hashed_password = hash_password(user_data.password)
-            self.user_dao.add_user(
-                username=user_data.username,
-                password=hashed_password,
-                nickname=user_data.nickname,
-                full_name=user_data.full_name,
-            )
-            new_user = self.user_dao.get_user_by_username(user_data.username)
+            hashed_password = await ahash_password(user_data.password)
+            try:
+                # 用户名冲突由唯一约束判断，不需要先查询
+                user_id = self.user_dao.add_user(
+                    username=user_data.username,
+                    password=hashed_password,
+                    nickname=user_data.nickname,
+                    full_name=user_data.full_name,
+                )
+            except AlreadyExistsError:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"用户名 '{user_data.username}' 已存在",
+                )
+            new_user = self.user_dao.get_line_by_id(user_id)
             if not new_user:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -72,6 +92,11 @@ class AuthService:
             )
         except HTTPException:
             raise
+        except PasswordPoolBusyError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="服务繁忙，请稍后重试",
+            )
         except Exception as e:
             logger.error(f"✗ 用户注册异常: {e}")
             raise HTTPException(
@@ -79,18 +104,23 @@ class AuthService:
                 detail="用户注册过程中发生错误",
             )
 
-    def login_user(self, login_data: UserLoginRequest) -> LoginResponse:
+    async def login_user(self, login_data: UserLoginRequest) -> LoginResponse:
         """用户登录"""
         try:
+            # 本次尝试已由 reserve_login_attempt 预占，失败时保持计数
             user = self.user_dao.get_user_by_username(login_data.username)
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED, detail="用户名或密码错误"
-                )
-            if not verify_password(login_data.password, user.password):
+            if not user or not await averify_password(login_data.password, user.password):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED, detail="用户名或密码错误"
                 )
+            if login_failures is not None:
+                login_failures.reset(login_data.username)
+            # 哈希的算法或参数低于当前配置时，在后台重新哈希（不影响登录延迟）
+            password_pool.schedule_rehash(
+                login_data.password,
+                user.password,
+                partial(save_rehashed_password, user.id, user.password),
+            )
             access_token = create_token_for_user(
                 username=user.username,
                 user_id=user.id,
@@ -98,6 +128,7 @@ class AuthService:
                 role=user.role,
                 is_active=user.is_active,
                 full_name=user.full_name,
+                token_version=user.token_version,
             )
             logger.info(f"✓ 用户 '{login_data.username}' 登录成功！")
             return LoginResponse(
@@ -113,6 +144,11 @@ class AuthService:
             )
         except HTTPException:
             raise
+        except PasswordPoolBusyError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="服务繁忙，请稍后重试",
+            )
         except Exception as e:
             logger.error(f"✗ 用户登录异常: {e}")
             raise HTTPException(
@@ -189,8 +225,18 @@ def get_auth_service(db_session: Annotated[Session, Depends(get_db_session)]):
     return AuthService(db_session)
 
 
+def get_read_auth_service(
+    db_session: Annotated[Session, Depends(get_read_db_session)],
+):
+    """只读接口使用的认证服务（读连接池）"""
+    return AuthService(db_session)
+
+
 @router.post(
-    "/register", response_model=StandardResponse, status_code=status.HTTP_201_CREATED
+    "/register",
+    response_model=StandardResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(register_rate_limit)],
 )
 @exception_wrapper(catch_http_exc=True)
 async def register_user(
@@ -205,7 +251,7 @@ async def register_user(
         await asyncio.sleep(3.0)
         raise HTTPException(status_code=403, detail="错误的注册 Token")
 
-    user = auth_service.register_user(user_data)
+    user = await auth_service.register_user(user_data)
     return StandardResponse(
         success=True,
         message="用户注册成功",
@@ -221,14 +267,19 @@ async def register_user(
     )
 
 
-@router.post("/login", response_model=StandardResponse)
+@router.post(
+    "/login",
+    response_model=StandardResponse,
+    # 先按 IP / 全局限流，再按用户名预占（都在查询数据库和验证密码之前）
+    dependencies=[Depends(login_rate_limit), Depends(reserve_login_attempt)],
+)
 @exception_wrapper(catch_http_exc=True)
 async def login_user(
     login_data: UserLoginRequest,
     auth_service: AuthService = Depends(get_auth_service),
 ):
     """用户登录 - POST /user/login"""
-    login_response = auth_service.login_user(login_data)
+    login_response = await auth_service.login_user(login_data)
     return StandardResponse(
         success=True,
         message="登录成功",
@@ -247,11 +298,22 @@ async def login_user(
     )
 
 
+@router.post("/logout", response_model=StandardResponse)
+@exception_wrapper(catch_http_exc=True)
+async def logout_user(
+    current_user: CurrentUser = Depends(check_user_permission()),
+    db_session: Session = Depends(get_db_session),
+):
+    """用户登出 - POST /user/logout（吊销当前 Token）"""
+    revocation_sync.revoke_token(db_session, current_user)
+    return StandardResponse(success=True, message="已登出", data={})
+
+
 @router.get("/profile", response_model=StandardResponse)
 @exception_wrapper(catch_http_exc=True)
 async def get_current_user_profile(
     current_user: CurrentUser = Depends(check_user_permission()),
-    auth_service: AuthService = Depends(get_auth_service),
+    auth_service: AuthService = Depends(get_read_auth_service),
 ):
     """获取当前用户信息 - GET /user/profile"""
     username = current_user.username
@@ -8,11 +8,19 @@ from sqlalchemy.orm import Session
 from loguru import logger
 from pydantic import BaseModel, Field
 
-from src.middleware.auth import CurrentUser, check_user_permission
+from src.middleware.auth import (
+    CurrentUser,
+    auth_middleware,
+    check_user_permission,
+    password_pool,
+)
+from src.middleware.rate_limit import rate_limit_stats
+from src.middleware.revocation import revocation_sync
+from src.dao.base import FormValidationError
 from src.dao.user_dao import UserDAO
 from src.types.standard_response import StandardResponse
 from src.types.user_role import UserRole
-from ..utils import exception_wrapper, get_db_session
+from ..utils import exception_wrapper, get_db_session, get_read_db_session
 
 
 class UserManagementResponse(BaseModel):
@@ -86,11 +94,40 @@ class UsersListResponse(BaseModel):
     page: int
     per_page: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 # 创建用户管理路由
 router = APIRouter(prefix="/user-management", tags=["用户管理"])
 
+# 用户列表只查询响应需要的字段（不加载 password、extra 等大字段）
+USER_LIST_COLUMNS = [
+    "id",
+    "username",
+    "nickname",
+    "full_name",
+    "role",
+    "is_active",
+    "created_at",
+    "updated_at",
+]
+
+
+def to_management_response(user) -> UserManagementResponse:
+    """将用户 ORM 实例或投影查询的 Row 转换为用户管理响应模型"""
+    return UserManagementResponse(
+        id=user.id,
+        username=user.username,
+        nickname=user.nickname,
+        full_name=user.full_name,
+        role=user.role,
+        role_description=UserRole.get_description(user.role),
+        is_active=user.is_active,
+        created_at=user.created_at.isoformat(),
+        updated_at=user.updated_at.isoformat() if user.updated_at else "",
+        permissions=UserRole.get_permissions(user.role) if user.is_active else [],
+    )
+
 
 @router.get("/users", response_model=StandardResponse)
 @exception_wrapper(catch_http_exc=True)
@@ -100,8 +137,12 @@ async def get_users_list(
     role: Optional[str] = Query(None, description="按角色筛选"),
     keyword: Optional[str] = Query(None, description="搜索关键词"),
     is_active: Optional[bool] = Query(None, description="按状态筛选"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    sort: Optional[str] = Query(
+        None, description="排序字段，逗号分隔，- 前缀表示降序，如 -created_at,username"
+    ),
     current_user: CurrentUser = Depends(check_user_permission()),
-    db_session: Session = Depends(get_db_session),
+    db_session: Session = Depends(get_read_db_session),
 ):
     """获取用户列表.
 
@@ -111,6 +152,8 @@ async def get_users_list(
         role (Optional[str]): 按角色筛选，可选
         keyword (Optional[str]): 搜索关键词，可选
         is_active (Optional[bool]): 按状态筛选，可选
+        cursor (Optional[str]): 游标分页的游标，传入时忽略 page
+        sort (Optional[str]): 排序字段，指定时使用页码分页
         current_user (CurrentUser): 当前登录用户信息
         db_session (Session): 数据库会话
 
@@ -119,48 +162,41 @@ async def get_users_list(
     """
     try:
         user_dao = UserDAO(db_session)
+        next_cursor = None
+
+        # 过滤、排序和计数都在数据库中完成
+        sort_fields = [f for f in sort.split(",") if f] if sort else []
+        # 只允许按列表返回的字段排序（不能按 password 等字段排序）
+        invalid = [f for f in sort_fields if f.lstrip("-") not in USER_LIST_COLUMNS]
+        if invalid:
+            raise FormValidationError(f"不支持的排序字段: {', '.join(invalid)}")
+        query = user_dao.list_query(
+            role=role, keyword=keyword, is_active=is_active, sort=sort_fields
+        )
 
-        # 根据查询条件获取用户
-        if keyword:
-            users = user_dao.search_users(keyword)
-            total = len(users)
-            # 简单分页处理
-            start_idx = (page - 1) * per_page
-            end_idx = start_idx + per_page
-            users = users[start_idx:end_idx]
-        elif role:
-            users = user_dao.get_users_by_role(role)
-            total = len(users)
-            # 简单分页处理
-            start_idx = (page - 1) * per_page
-            end_idx = start_idx + per_page
-            users = users[start_idx:end_idx]
+        if not sort_fields and (cursor is not None or page == 1):
+            # 游标分页：第一页与 OFFSET 分页结果一致，之后按 next_cursor 翻页
+            users, next_cursor = user_dao.get_users_page(
+                cursor, per_page, columns=USER_LIST_COLUMNS, query=query
+            )
+            if query.filters:
+                total = user_dao.count_where(query)
+            else:
+                # 列表页的总数只用于展示，使用近似计数避免每次扫描用户表
+                total = user_dao.get_lines_num(approximate=True)
         else:
-            result = user_dao.get_users_with_pagination(page, per_page)
+            result = user_dao.get_users_with_pagination(
+                page,
+                per_page,
+                columns=USER_LIST_COLUMNS,
+                approximate_total=True,
+                query=query,
+            )
             users = result["users"]
             total = result["total"]
 
-        # 状态筛选
-        if is_active is not None:
-            users = [u for u in users if u.is_active == is_active]
-
         # 转换为响应格式
-        user_responses = []
-        for user in users:
-            user_responses.append(
-                UserManagementResponse(
-                    id=user.id,
-                    username=user.username,
-                    nickname=user.nickname,
-                    full_name=user.full_name,
-                    role=user.role,
-                    role_description=user.get_role_description(),
-                    is_active=user.is_active,
-                    created_at=user.created_at.isoformat(),
-                    updated_at=user.updated_at.isoformat() if user.updated_at else "",
-                    permissions=user.get_permissions(),
-                )
-            )
+        user_responses = [to_management_response(user) for user in users]
 
         pages = (total + per_page - 1) // per_page
 
@@ -170,12 +206,15 @@ async def get_users_list(
             page=page,
             per_page=per_page,
             pages=pages,
+            next_cursor=next_cursor,
         )
 
         return StandardResponse(
             success=True, message="获取用户列表成功", data=result.model_dump()
         )
 
+    except FormValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except Exception as e:
         logger.error(f"获取用户列表失败: {e}")
         raise HTTPException(
@@ -204,7 +243,11 @@ async def update_user_role(
     try:
         user_dao = UserDAO(db_session)
 
-        success = user_dao.update_user_role(request.user_id, request.role)
+        with user_dao.transaction():
+            success = user_dao.update_user_role(request.user_id, request.role)
+            if success:
+                # 旧 Token 中的角色和权限位已过期，使其全部失效
+                revocation_sync.revoke_user(db_session, request.user_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在或角色无效"
@@ -217,18 +260,7 @@ async def update_user_role(
                 status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在"
             )
 
-        result = UserManagementResponse(
-            id=user.id,
-            username=user.username,
-            nickname=user.nickname,
-            full_name=user.full_name,
-            role=user.role,
-            role_description=user.get_role_description(),
-            is_active=user.is_active,
-            created_at=user.created_at.isoformat(),
-            updated_at=user.updated_at.isoformat() if user.updated_at else "",
-            permissions=user.get_permissions(),
-        )
+        result = to_management_response(user)
 
         return StandardResponse(
             success=True, message="用户角色更新成功", data={"user": result.model_dump()}
@@ -264,7 +296,11 @@ async def update_user_status(
     try:
         user_dao = UserDAO(db_session)
 
-        success = user_dao.update_user_status(request.user_id, request.is_active)
+        with user_dao.transaction():
+            success = user_dao.update_user_status(request.user_id, request.is_active)
+            if success:
+                # 旧 Token 中的激活状态已过期，使其全部失效
+                revocation_sync.revoke_user(db_session, request.user_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在"
@@ -277,18 +313,7 @@ async def update_user_status(
                 status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在"
             )
 
-        result = UserManagementResponse(
-            id=user.id,
-            username=user.username,
-            nickname=user.nickname,
-            full_name=user.full_name,
-            role=user.role,
-            role_description=user.get_role_description(),
-            is_active=user.is_active,
-            created_at=user.created_at.isoformat(),
-            updated_at=user.updated_at.isoformat() if user.updated_at else "",
-            permissions=user.get_permissions(),
-        )
+        result = to_management_response(user)
 
         return StandardResponse(
             success=True, message="用户状态更新成功", data={"user": result.model_dump()}
@@ -309,7 +334,7 @@ async def update_user_status(
 async def get_user_permissions(
     user_id: int,
     current_user: CurrentUser = Depends(check_user_permission()),
-    db_session: Session = Depends(get_db_session),
+    db_session: Session = Depends(get_read_db_session),
 ):
     """获取用户权限信息.
 
@@ -358,7 +383,7 @@ async def get_user_permissions(
 @exception_wrapper(catch_http_exc=True)
 async def get_current_user_permissions(
     current_user: CurrentUser = Depends(check_user_permission()),
-    db_session: Session = Depends(get_db_session),
+    db_session: Session = Depends(get_read_db_session),
 ):
     """获取当前用户权限信息.
 
@@ -400,3 +425,29 @@ async def get_current_user_permissions(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="获取当前用户权限失败",
         )
+
+
+@router.get("/auth-stats", response_model=StandardResponse)
+@exception_wrapper(catch_http_exc=True)
+async def get_auth_stats(
+    current_user: CurrentUser = Depends(check_user_permission(role="admin")),
+):
+    """获取认证相关的监控指标（限流、Token 缓存、吊销表、密码线程池）.
+
+    Args:
+        current_user (CurrentUser): 当前登录用户信息（需要管理员角色）
+
+    Returns:
+        StandardResponse: 包含各项指标的标准响应
+    """
+    token_cache = auth_middleware.token_cache
+    return StandardResponse(
+        success=True,
+        message="获取认证指标成功",
+        data={
+            "rate_limits": rate_limit_stats(),
+            "token_cache": token_cache.stats() if token_cache is not None else None,
+            "revocations": auth_middleware.revocations.stats(),
+            "password_pool": password_pool.stats(),
+        },
+    )
@@ -1,7 +1,10 @@
 from .user_dao import UserDAO
-from .task_dao import TaskDAO
+from .task_dao import TaskDAO, AsyncTaskDAO
+from .revocation_dao import RevocationDAO
 
 __all__ = [
     "UserDAO",
     "TaskDAO",
+    "AsyncTaskDAO",
+    "RevocationDAO",
 ]
@@ -0,0 +1,47 @@
+"""Token 吊销事件数据访问对象"""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from src.dao.base import BaseDAO, Filter, QuerySpec
+from src.orm import AuthRevocationModel
+
+# 同步吊销事件时查询的字段
+REVOCATION_EVENT_COLUMNS = ["id", "user_id", "generation", "token_id", "expires_at"]
+
+
+class RevocationDAO(BaseDAO):
+    """Token 吊销事件管理器（只追加，过期后清除）"""
+
+    def __init__(self, session: Session):
+        super().__init__(session, AuthRevocationModel)
+
+    def add_user_revocation(
+        self, user_id: int, generation: int, expires_at: datetime
+    ) -> AuthRevocationModel:
+        """记录用户级吊销：版本低于 generation 的 Token 失效"""
+        return self.add_line(
+            user_id=user_id, generation=generation, expires_at=expires_at
+        )
+
+    def add_token_revocation(
+        self, user_id: int, token_id: str, expires_at: datetime
+    ) -> AuthRevocationModel:
+        """记录单个 Token 吊销"""
+        return self.add_line(user_id=user_id, token_id=token_id, expires_at=expires_at)
+
+    def get_events_after(
+        self, event_id: int, now: datetime, limit: int | None = None
+    ) -> list[Any]:
+        """按 ID 顺序获取 event_id 之后、尚未过期的吊销事件（Row 列表）"""
+        query = QuerySpec.build(
+            [Filter("id", "gt", event_id), Filter("expires_at", "gt", now)],
+            sort=["id"],
+        )
+        return self.find(query, limit=limit, columns=REVOCATION_EVENT_COLUMNS)
+
+    def delete_expired(self, now: datetime) -> int:
+        """清除已过期的吊销事件，返回删除的数量"""
+        return self.delete_where([AuthRevocationModel.expires_at <= now])
@@ -1,16 +1,53 @@
 """任务数据访问对象"""
 
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Any, Dict, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from loguru import logger
 
-from src.dao.base import BaseDAO
+from src.dao.base import BaseDAO, AsyncBaseDAO, Filter, QuerySpec, dao_cache
 from src.orm import TaskModel
 
 
+def _task_update_values(update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """过滤出任务表中存在且非空的更新字段"""
+    return {
+        key: value
+        for key, value in update_data.items()
+        if hasattr(TaskModel, key) and value is not None
+    }
+
+
+def task_query(
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    creator_id: Optional[int] = None,
+    keyword: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    sort: Sequence[str] = (),
+) -> QuerySpec:
+    """构造任务列表查询条件，未传入的条件不参与过滤"""
+    filters = []
+    if status is not None:
+        filters.append(Filter("status", "eq", status))
+    if priority is not None:
+        filters.append(Filter("priority", "eq", priority))
+    if creator_id is not None:
+        filters.append(Filter("creator_id", "eq", creator_id))
+    if keyword:
+        filters.append(Filter(("title", "description"), "contains", keyword))
+    if due_after is not None or due_before is not None:
+        filters.append(Filter("due_date", "range", (due_after, due_before)))
+    return QuerySpec.build(filters, sort)
+
+
 class TaskDAO(BaseDAO):
     """任务数据访问对象"""
 
+    cache = dao_cache
+
     def __init__(self, session: Session):
         super().__init__(session, TaskModel)
 
@@ -32,48 +69,185 @@ class TaskDAO(BaseDAO):
             "priority": priority,
             "due_date": due_date,
         }
-        self.add_line(**task_data)
+        task = self.add_line(**task_data)
         logger.info(f"Task created: {title}")
-        return (
-            self._session.query(TaskModel)
-            .filter(TaskModel.title == title, TaskModel.creator_id == creator_id)
-            .order_by(TaskModel.id.desc())
-            .first()
-        )
+        return task
+
+    def create_tasks(
+        self, tasks: List[Dict[str, Any]], batch_size: int = 1000
+    ) -> List[int]:
+        """批量创建任务（用于导入/初始化数据），返回新任务ID列表"""
+        task_ids = self.add_lines(tasks, batch_size=batch_size, return_ids=True)
+        logger.info(f"Tasks imported: {len(task_ids)}")
+        return task_ids  # type: ignore
 
     def get_task_by_id(self, task_id: int) -> Optional[TaskModel]:
         """根据ID获取任务"""
         return self.get_line_by_id(task_id)
 
-    def get_tasks_by_creator(self, creator_id: int) -> List[TaskModel]:
-        """获取用户创建的所有任务"""
-        return self._session.query(TaskModel).filter(TaskModel.creator_id == creator_id).all()
+    def get_tasks_by_creator(
+        self, creator_id: int, columns: Optional[Sequence[str]] = None
+    ) -> List[Any]:
+        """获取用户创建的所有任务（指定 columns 时返回只含这些字段的 Row）"""
+        stmt = self._select(columns).where(TaskModel.creator_id == creator_id)
+        return self._fetch_all(stmt, columns)
 
-    def get_all_tasks(self, skip: int = 0, limit: int = 100) -> List[TaskModel]:
-        """获取所有任务（分页）"""
-        return self._session.query(TaskModel).offset(skip).limit(limit).all()
+    def get_all_tasks(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[str]] = None,
+        query: Optional[QuerySpec] = None,
+    ) -> List[Any]:
+        """获取所有任务（分页），传入 query 时按条件过滤和排序"""
+        if query is not None:
+            return self.find(query, limit=limit, offset=skip, columns=columns)
+        return self.get_lines(limit=limit, offset=skip, columns=columns)
+
+    def get_tasks_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        descending: bool = False,
+        columns: Optional[Sequence[str]] = None,
+        query: Optional[QuerySpec] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """游标分页获取任务，返回 (任务列表, 下一页游标)
+
+        query 只使用其中的过滤条件，排序由 order_by / descending 决定
+        """
+        return self.get_page(
+            after=cursor,
+            limit=limit,
+            order_by=order_by,
+            descending=descending,
+            filters=query,
+            columns=columns,
+        )
 
     def update_task(self, task_id: int, **update_data) -> bool:
         """更新任务"""
-        task = self.get_task_by_id(task_id)
-        if not task:
-            return False
+        values = _task_update_values(update_data)
+        if not values:
+            return self.exists(task_id)
 
-        for key, value in update_data.items():
-            if hasattr(task, key) and value is not None:
-                setattr(task, key, value)
+        if not self.update_where({"id": task_id}, values):
+            return False
 
-        self._session.commit()
         logger.info(f"Task updated: {task_id}")
         return True
 
     def delete_task(self, task_id: int) -> bool:
         """删除任务"""
-        task = self.get_task_by_id(task_id)
-        if not task:
+        if not self.delete_where({"id": task_id}):
+            return False
+
+        logger.info(f"Task deleted: {task_id}")
+        return True
+
+    def cancel_overdue_tasks(self, creator_id: int) -> int:
+        """取消用户所有已逾期且未完成的任务，返回受影响的任务数"""
+        return self.update_where(
+            [
+                TaskModel.creator_id == creator_id,
+                TaskModel.due_date < datetime.now(),
+                TaskModel.status.in_(["pending", "in_progress"]),
+            ],
+            {"status": "cancelled"},
+        )  # type: ignore
+
+
+class AsyncTaskDAO(AsyncBaseDAO):
+    """任务数据访问对象（异步版本，供 async 路由使用）"""
+
+    cache = dao_cache
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, TaskModel)
+
+    async def create_task(
+        self,
+        title: str,
+        creator_id: int,
+        description: Optional[str] = None,
+        status: str = "pending",
+        priority: str = "medium",
+        due_date: Optional[str] = None,
+    ) -> TaskModel:
+        """创建任务"""
+        task = await self.add_line(
+            title=title,
+            creator_id=creator_id,
+            description=description,
+            status=status,
+            priority=priority,
+            due_date=due_date,
+        )
+        logger.info(f"Task created: {title}")
+        return task
+
+    async def get_task_by_id(self, task_id: int) -> Optional[TaskModel]:
+        """根据ID获取任务"""
+        return await self.get_line_by_id(task_id)
+
+    async def get_tasks_by_creator(
+        self, creator_id: int, columns: Optional[Sequence[str]] = None
+    ) -> List[Any]:
+        """获取用户创建的所有任务（指定 columns 时返回只含这些字段的 Row）"""
+        stmt = self._select(columns).where(TaskModel.creator_id == creator_id)
+        return await self._fetch_all(stmt, columns)
+
+    async def get_all_tasks(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[str]] = None,
+        query: Optional[QuerySpec] = None,
+    ) -> List[Any]:
+        """获取所有任务（分页），传入 query 时按条件过滤和排序"""
+        if query is not None:
+            return await self.find(query, limit=limit, offset=skip, columns=columns)
+        return await self.get_lines(limit=limit, offset=skip, columns=columns)
+
+    async def get_tasks_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        descending: bool = False,
+        columns: Optional[Sequence[str]] = None,
+        query: Optional[QuerySpec] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """游标分页获取任务，返回 (任务列表, 下一页游标)
+
+        query 只使用其中的过滤条件，排序由 order_by / descending 决定
+        """
+        return await self.get_page(
+            after=cursor,
+            limit=limit,
+            order_by=order_by,
+            descending=descending,
+            filters=query,
+            columns=columns,
+        )
+
+    async def update_task(self, task_id: int, **update_data) -> bool:
+        """更新任务"""
+        values = _task_update_values(update_data)
+        if not values:
+            return await self.exists(task_id)
+
+        if not await self.update_where({"id": task_id}, values):
+            return False
+
+        logger.info(f"Task updated: {task_id}")
+        return True
+
+    async def delete_task(self, task_id: int) -> bool:
+        """删除任务"""
+        if not await self.delete_where({"id": task_id}):
             return False
 
-        self._session.delete(task)
-        self._session.commit()
         logger.info(f"Task deleted: {task_id}")
         return True
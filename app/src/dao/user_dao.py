@@ -1,15 +1,24 @@
+from typing import Any, Iterable, Iterator, Sequence
+
 from loguru import logger
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.orm import UserModel
 from src.exc import AlreadyExistsError, NotExistsError
 from src.types.user_role import UserRole
 
-from .base import BaseDAO
+from .base import BaseDAO, Filter, QuerySpec
+
+# 对外展示的用户信息字段
+USER_INFO_COLUMNS = ["id", "nickname", "full_name", "username"]
 
 
 class UserDAO(BaseDAO):
-    """用户表单管理器 - SQLAlchemy版本"""
+    """用户表单管理器 - SQLAlchemy版本
+
+    用户行包含密码哈希，不放入进程内缓存（dao_cache）
+    """
 
     def __init__(self, session: Session):
         super().__init__(session, UserModel)
@@ -22,38 +31,41 @@ class UserDAO(BaseDAO):
         full_name: str | None = None,
         role: str = UserRole.GUEST,
         is_active: bool = True,
-    ):
-        """添加用户 - 使用ORM方式，新用户默认为游客权限"""
+    ) -> int:
+        """添加用户，新用户默认为游客权限，返回新用户 ID
+
+        使用 INSERT ... ON CONFLICT DO NOTHING，不需要先查询用户名，
+        并发注册同一用户名时也只有一个能成功
+        """
 
-        # 检查用户名是否已存在
-        existing_user = (
-            self._session.query(UserModel).filter_by(username=username).one_or_none()
+        ids = self.upsert(
+            {
+                "username": username,
+                "password": password,
+                "nickname": nickname,
+                "full_name": full_name,
+                "role": role,
+                "is_active": is_active,
+            },
+            conflict_columns=["username"],
+            update_columns=[],
         )
-        if existing_user:
+        if not ids:
             logger.info(f"✗ 用户名 '{username}' 已存在")
             raise AlreadyExistsError()
 
-        # 创建新用户
-        new_user = UserModel(
-            username=username,
-            password=password,
-            nickname=nickname,
-            full_name=full_name,
-            role=role,
-            is_active=is_active,
-        )
-
-        self._session.add(new_user)
-        self._session.commit()
-
         logger.info(f"✓ 用户 '{username}' 添加成功！角色: {UserRole.get_description(role)}")
+        return ids[0]
 
     def get_user_by_username(self, username: str) -> UserModel | None:
         """根据用户名获取用户"""
 
-        user = self._session.query(UserModel).filter_by(username=username).one_or_none()
+        return self.get_line_by_unique("username", username)
 
-        return user
+    def _find_user(self, username: str) -> UserModel | None:
+        """直接从数据库按用户名查询（写操作使用，不经过进程内缓存）"""
+        users = self.get_lines_by_field("username", username, limit=1)
+        return users[0] if users else None
 
     def get_user_info_by_id(self, user_id: int) -> dict | None:
         """
@@ -79,10 +91,22 @@ class UserDAO(BaseDAO):
             logger.error(f"获取用户信息时发生错误: {str(e)}")
             return None
 
+    def get_users_info_by_ids(self, user_ids: Iterable[int]) -> dict[int, dict]:
+        """批量获取用户信息（一次查询），返回 {用户ID: get_user_info_by_id 格式的字典}"""
+        users = self.get_lines_by_ids(user_ids, columns=USER_INFO_COLUMNS)
+        return {
+            user_id: {
+                "nickname": user.nickname,
+                "full_name": user.full_name,
+                "username": user.username,
+            }
+            for user_id, user in users.items()
+        }
+
     def update_user(self, username: str, **kwargs):
         """更新用户信息"""
 
-        user = self._session.query(UserModel).filter_by(username=username).one_or_none()
+        user = self._find_user(username)
 
         if not user:
             logger.info(f"✗ 用户 '{username}' 不存在")
@@ -93,32 +117,56 @@ class UserDAO(BaseDAO):
             if hasattr(user, key):
                 setattr(user, key, value)
 
-        self._session.commit()
+        user_id = user.id
+        self._commit()
+        self._invalidate_cache([user_id])
         logger.info(f"✓ 用户 '{username}' 更新成功！")
 
     def delete_user(self, username: str):
         """删除用户"""
 
-        user = self._session.query(UserModel).filter_by(username=username).one_or_none()
+        user = self._find_user(username)
 
         if not user:
             logger.info(f"✗ 用户 '{username}' 不存在")
             raise NotExistsError()
 
+        user_id = user.id
         self._session.delete(user)
-        self._session.commit()
+        self._commit()
+        self._invalidate_cache([user_id])
 
         logger.info(f"✓ 用户 '{username}' 删除成功！")
 
     def get_all_users(self) -> list[UserModel]:
         """获取所有用户列表"""
-        return self._session.query(UserModel).all()
+        return self.get_lines()
+
+    def iter_all_users(self, chunk_size: int = 1000) -> Iterator[UserModel]:
+        """流式遍历所有用户（导出、后台扫描使用，内存占用不随用户数增长）"""
+        return self.iter_lines(chunk_size=chunk_size)
 
-    def get_users_with_pagination(self, page: int = 1, per_page: int = 20) -> dict:
-        """分页获取用户列表"""
+    def get_users_with_pagination(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        columns: Sequence[str] | None = None,
+        approximate_total: bool = False,
+        query: QuerySpec | None = None,
+    ) -> dict:
+        """分页获取用户列表（指定 columns 时 users 为只含这些字段的 Row）
+
+        传入 query 时过滤、排序和计数都在数据库中完成；
+        approximate_total 为 True 且没有过滤条件时 total 使用近似计数，不再每页扫描用户表
+        """
         offset = (page - 1) * per_page
-        users = self._session.query(UserModel).offset(offset).limit(per_page).all()
-        total = self._session.query(UserModel).count()
+        if query is None:
+            query = QuerySpec()
+        users = self.find(query, limit=per_page, offset=offset, columns=columns)
+        if query.filters:
+            total = self.count_where(query)
+        else:
+            total = self.get_lines_num(approximate=approximate_total)
 
         return {
             "users": users,
@@ -128,47 +176,101 @@ class UserDAO(BaseDAO):
             "pages": (total + per_page - 1) // per_page
         }
 
+    def get_users_page(
+        self,
+        cursor: str | None = None,
+        per_page: int = 20,
+        order_by: str = "id",
+        columns: Sequence[str] | None = None,
+        query: QuerySpec | None = None,
+    ) -> tuple[list[Any], str | None]:
+        """游标分页获取用户列表，返回 (用户列表, 下一页游标)
+
+        query 只使用其中的过滤条件，排序由 order_by 决定
+        """
+        return self.get_page(
+            after=cursor,
+            limit=per_page,
+            order_by=order_by,
+            filters=query,
+            columns=columns,
+        )
+
     def update_user_role(self, user_id: int, role: str) -> bool:
         """更新用户权限"""
         if role not in [r.value for r in UserRole]:
             logger.error(f"无效的角色: {role}")
             return False
 
-        user = self.get_line_by_id(user_id)
-        if not user:
+        if not self.update_where({"id": user_id}, {"role": role}):
             logger.error(f"用户不存在: ID {user_id}")
             return False
 
-        old_role = user.role
-        user.role = role
-        self._session.commit()
-
-        logger.info(f"✓ 用户 '{user.username}' 权限更新成功！{old_role} -> {role}")
+        logger.info(f"✓ 用户 ID {user_id} 权限更新成功！-> {role}")
         return True
 
     def update_user_status(self, user_id: int, is_active: bool) -> bool:
         """更新用户激活状态"""
-        user = self.get_line_by_id(user_id)
-        if not user:
+        if not self.update_where({"id": user_id}, {"is_active": is_active}):
             logger.error(f"用户不存在: ID {user_id}")
             return False
 
-        old_status = user.is_active
-        user.is_active = is_active
-        self._session.commit()
-
         status_text = "激活" if is_active else "禁用"
-        logger.info(f"✓ 用户 '{user.username}' 状态更新成功！{old_status} -> {status_text}")
+        logger.info(f"✓ 用户 ID {user_id} 状态更新成功！-> {status_text}")
         return True
 
-    def search_users(self, keyword: str) -> list[UserModel]:
+    def replace_password_hash(
+        self, user_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        """把密码哈希替换为新参数下的哈希（密码未被修改时才替换）"""
+        return bool(
+            self.update_where(
+                {"id": user_id, "password": old_hash}, {"password": new_hash}
+            )
+        )
+
+    def bump_token_version(self, user_id: int) -> int | None:
+        """递增用户的 Token 版本（此前签发的 Token 随之失效）
+
+        Returns:
+            新的 Token 版本，用户不存在时返回 None
+        """
+        if not self.update_where(
+            {"id": user_id}, {"token_version": UserModel.token_version + 1}
+        ):
+            logger.error(f"用户不存在: ID {user_id}")
+            return None
+        return self._session.scalar(
+            select(UserModel.token_version).where(UserModel.id == user_id)
+        )
+
+    def search_users(
+        self, keyword: str, columns: Sequence[str] | None = None
+    ) -> list[Any]:
         """搜索用户"""
-        return self._session.query(UserModel).filter(
-            UserModel.username.contains(keyword) |
-            UserModel.nickname.contains(keyword) |
-            UserModel.full_name.contains(keyword)
-        ).all()
+        return self.find(self.list_query(keyword=keyword), columns=columns)
 
-    def get_users_by_role(self, role: str) -> list[UserModel]:
+    def get_users_by_role(
+        self, role: str, columns: Sequence[str] | None = None
+    ) -> list[Any]:
         """根据角色获取用户列表"""
-        return self._session.query(UserModel).filter_by(role=role).all()
+        return self.find(self.list_query(role=role), columns=columns)
+
+    @staticmethod
+    def list_query(
+        role: str | None = None,
+        keyword: str | None = None,
+        is_active: bool | None = None,
+        sort: Sequence[str] = (),
+    ) -> QuerySpec:
+        """构造用户列表查询条件，未传入的条件不参与过滤"""
+        filters = []
+        if role is not None:
+            filters.append(Filter("role", "eq", role))
+        if keyword:
+            filters.append(
+                Filter(("username", "nickname", "full_name"), "contains", keyword)
+            )
+        if is_active is not None:
+            filters.append(Filter("is_active", "eq", is_active))
+        return QuerySpec.build(filters, sort)
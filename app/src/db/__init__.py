@@ -1,24 +1,53 @@
 import os
 
-from sqlalchemy import create_engine, text, inspect
-from loguru import logger
-
-from src.orm import Base
+from je_stack.utils.database import (
+    create_database_engine,
+    create_async_database_engine,
+    is_sqlite_file_url,
+)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///app.db")
-engine = create_engine(DATABASE_URL, echo=False)
+# SQLite 连接预设：durable / throughput / readonly，见 je_stack.utils.database.SQLITE_PROFILES
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "throughput")
+# 较大的页面对 BLOB 字段更友好（只在新建数据库时生效）
+SQLITE_PRAGMAS = {"page_size": 8192}
+# 文件型 SQLite 为只读请求单独使用 query_only 的读连接池（WAL 下读不阻塞写）
+SPLIT_READ_WRITE = is_sqlite_file_url(DATABASE_URL)
+READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "10"))
 
-# Optimize large Blob field
-if DATABASE_URL.startswith("sqlite"):
-    inspector = inspect(engine)
-    if not inspector.get_table_names():
-        with engine.connect() as conn:
-            conn.execute(text("PRAGMA page_size = 8192;"))
-            conn.execute(text("VACUUM;"))
-else:
-    logger.warning("No BLOB optimization applied")
+# 导入时不访问数据库；建表 / 迁移见 src.db.bootstrap（应用启动时由 lifespan 调用）
+engine = create_database_engine(
+    DATABASE_URL,
+    sqlite_profile=SQLITE_PROFILE,
+    sqlite_pragma_overrides=SQLITE_PRAGMAS,
+)
 
-Base.metadata.create_all(engine)
+# 异步引擎（SQLite 使用 aiosqlite），供 async 路由使用，避免阻塞事件循环。
+# 拆分读写时只保留一个写连接，写请求在连接池中排队（await，不阻塞事件循环）；
+# 同步写引擎在 async 路由中同步等待连接，保持默认连接池大小以免阻塞事件循环
+async_engine = create_async_database_engine(
+    DATABASE_URL,
+    sqlite_profile=SQLITE_PROFILE,
+    sqlite_pragma_overrides=SQLITE_PRAGMAS,
+    **({"pool_size": 1, "max_overflow": 0} if SPLIT_READ_WRITE else {}),
+)
+
+if SPLIT_READ_WRITE:
+    read_engine = create_database_engine(
+        DATABASE_URL,
+        sqlite_profile="readonly",
+        pool_size=READ_POOL_SIZE,
+        max_overflow=0,
+    )
+    async_read_engine = create_async_database_engine(
+        DATABASE_URL,
+        sqlite_profile="readonly",
+        pool_size=READ_POOL_SIZE,
+        max_overflow=0,
+    )
+else:
+    read_engine = engine
+    async_read_engine = async_engine
 
 
-__all__ = ["engine"]
+__all__ = ["engine", "async_engine", "read_engine", "async_read_engine"]
@@ -0,0 +1,186 @@
+"""
+数据库结构初始化
+
+在应用启动（FastAPI lifespan）或部署脚本（migrate.py bootstrap）中显式调用，
+导入 src.db 不再有建表等副作用。
+
+启动时先读取 alembic_version 表判断数据库是否已是最新版本，是则直接返回，
+只需要一次查询；否则在跨进程锁内完成初始化，多个 worker 同时启动时只有
+一个会执行建表 / 迁移，其他 worker 等待后走快速路径：
+    - 新数据库：按 ORM 模型建表并标记为最新版本（不逐个执行迁移）
+    - 旧版本数据库：执行 alembic upgrade head
+    - 没有版本记录但已有表（此前由导入时的 create_all 创建）：按实际表结构
+      标记对应的旧版本（见 legacy_revision），再执行 alembic upgrade head
+"""
+
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from loguru import logger
+from sqlalchemy import Connection, Engine, inspect, text
+
+from je_stack.utils.database import is_sqlite_file_url
+from src.orm import Base
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# 引入迁移之前由 create_all 创建的表结构对应的版本
+_LEGACY_REVISION = "827605f1ad30"
+# 没有 role / is_active 字段的更早的表结构
+_LEGACY_BASE_REVISION = "a103d1f8a504"
+
+# PostgreSQL advisory lock 的键（任意固定值）
+_PG_LOCK_KEY = 7_315_402_118
+
+
+def get_alembic_config(database_url: str) -> Config:
+    """获取指定数据库的 Alembic 配置（与当前工作目录无关）"""
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    config.set_main_option("sqlalchemy.url", database_url)
+    return config
+
+
+@lru_cache(maxsize=None)
+def head_revisions() -> Tuple[str, ...]:
+    """迁移脚本的最新版本（进程内只解析一次迁移目录）"""
+    script = ScriptDirectory.from_config(get_alembic_config(""))
+    return tuple(sorted(script.get_heads()))
+
+
+def current_revisions(connection: Connection) -> Tuple[str, ...]:
+    """数据库当前的版本（alembic_version 表不存在时为空）"""
+    context = MigrationContext.configure(connection)
+    return tuple(sorted(context.get_current_heads()))
+
+
+def is_schema_at_head(engine: Engine) -> bool:
+    """数据库结构是否已是最新版本"""
+    with engine.connect() as connection:
+        return current_revisions(connection) == head_revisions()
+
+
+def init_schema(engine: Engine) -> bool:
+    """确保数据库结构为最新版本
+
+    Args:
+        engine: 同步数据库引擎（写连接）
+
+    Returns:
+        是否执行了建表或迁移（已是最新版本时为 False）
+    """
+    if is_schema_at_head(engine):
+        logger.debug("Database schema is at head")
+        return False
+
+    with _bootstrap_lock(engine):
+        # 等锁期间其他进程可能已完成初始化
+        with engine.connect() as connection:
+            current = current_revisions(connection)
+            if current == head_revisions():
+                return False
+            legacy = legacy_revision(connection)
+
+        if current:
+            logger.info(f"Upgrading database schema: {current} -> {head_revisions()}")
+            _upgrade(engine)
+        elif legacy:
+            # create_all 不会修改已有的表，不能直接标记为最新版本
+            logger.warning(
+                f"Database has tables but no alembic version, stamping {legacy} and upgrading"
+            )
+            _upgrade(engine, stamp=legacy)
+        else:
+            logger.info("Creating database schema")
+            with engine.begin() as connection:
+                Base.metadata.create_all(connection)
+                MigrationContext.configure(connection).stamp(
+                    ScriptDirectory.from_config(get_alembic_config("")), "heads"
+                )
+    logger.info("Database schema is up to date")
+    return True
+
+
+def legacy_revision(connection: Connection) -> Optional[str]:
+    """没有版本记录的数据库按实际表结构对应的版本（没有 users 表时为 None）"""
+    inspector = inspect(connection)
+    if "users" not in inspector.get_table_names():
+        return None
+    columns = {column["name"] for column in inspector.get_columns("users")}
+    return _LEGACY_REVISION if "role" in columns else _LEGACY_BASE_REVISION
+
+
+def _upgrade(engine: Engine, stamp: Optional[str] = None) -> None:
+    """在引擎的连接上执行 alembic upgrade head（先标记为 stamp 版本）"""
+    config = get_alembic_config(engine.url.render_as_string(hide_password=False))
+    with engine.begin() as connection:
+        # env.py 使用传入的连接，并且不会重新配置日志
+        config.attributes["connection"] = connection
+        if stamp:
+            command.stamp(config, stamp)
+        command.upgrade(config, "head")
+
+
+@contextmanager
+def _bootstrap_lock(engine: Engine) -> Iterator[None]:
+    """跨进程的初始化锁：文件型 SQLite 使用文件锁，PostgreSQL 使用 advisory lock"""
+    url = engine.url.render_as_string(hide_password=False)
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _PG_LOCK_KEY})
+            try:
+                yield
+            finally:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": _PG_LOCK_KEY}
+                )
+        return
+
+    if fcntl is None or not is_sqlite_file_url(url) or not engine.url.database:
+        yield
+        return
+
+    lock_path = f"{os.path.abspath(engine.url.database)}.bootstrap.lock"
+    with open(lock_path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def main():
+    """命令行入口：python -m src.db.bootstrap [--check]"""
+    import argparse
+    import sys
+
+    from src.db import engine
+
+    parser = argparse.ArgumentParser(description="初始化数据库结构")
+    parser.add_argument(
+        "--check", action="store_true", help="只检查是否为最新版本（否则退出码为 1）"
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        at_head = is_schema_at_head(engine)
+        print("✅ 数据库结构已是最新版本" if at_head else "❌ 数据库结构需要升级")
+        sys.exit(0 if at_head else 1)
+    init_schema(engine)
+    print("✅ 数据库结构已是最新版本")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+登录 / 注册限流
+
+限额由环境变量配置，格式为「次数/时间单位」（second / minute / hour / day），
+设为 0 关闭对应的限流：
+    - LOGIN_RATE_PER_IP / LOGIN_RATE_GLOBAL: 登录请求速率（在查询数据库和验证密码之前检查）
+    - LOGIN_FAILURES_PER_USERNAME: 每个用户名的登录失败次数，超出后该用户名暂时无法登录
+      （每次登录在验证密码之前预占一次，登录成功后清零）
+    - REGISTER_RATE_PER_IP / REGISTER_RATE_GLOBAL: 注册请求速率
+
+限流状态保存在进程内，多 worker 部署时每个 worker 单独计数。
+"""
+
+import os
+from typing import Any, Dict
+
+from je_stack.auth.rate_limit import RateLimiter, RequestRateLimit, too_many_requests
+from src.types.users import UserLoginRequest
+
+login_rate_limit = RequestRateLimit(
+    per_ip=RateLimiter.parse(os.getenv("LOGIN_RATE_PER_IP", "20/minute"), name="login_ip"),
+    global_=RateLimiter.parse(os.getenv("LOGIN_RATE_GLOBAL", "20/second"), name="login_global"),
+)
+
+login_failures = RateLimiter.parse(
+    os.getenv("LOGIN_FAILURES_PER_USERNAME", "10/hour"), name="login_failures"
+)
+
+register_rate_limit = RequestRateLimit(
+    per_ip=RateLimiter.parse(os.getenv("REGISTER_RATE_PER_IP", "10/hour"), name="register_ip"),
+    global_=RateLimiter.parse(
+        os.getenv("REGISTER_RATE_GLOBAL", "5/second"), name="register_global"
+    ),
+)
+
+
+async def reserve_login_attempt(login_data: UserLoginRequest) -> None:
+    """按用户名预占一次登录尝试（FastAPI 依赖，在路由的 exception_wrapper 之外执行）
+
+    预占在验证密码之前原子地完成，同一用户名的并发请求不会都通过检查；
+    登录成功后由路由调用 login_failures.reset 清零，失败的尝试保持计数
+
+    Raises:
+        HTTPException(429): 用户名的失败次数已超限（带 Retry-After 头）
+    """
+    if login_failures is None:
+        return
+    wait = login_failures.acquire(login_data.username)
+    if wait:
+        raise too_many_requests(wait, "登录失败次数过多，请稍后重试")
+
+
+def rate_limit_stats() -> Dict[str, Any]:
+    """各限流器的指标"""
+    return {
+        "login": login_rate_limit.stats(),
+        "login_failures": login_failures.stats() if login_failures is not None else None,
+        "register": register_rate_limit.stats(),
+    }
+
+
+__all__ = [
+    "login_rate_limit",
+    "login_failures",
+    "reserve_login_attempt",
+    "register_rate_limit",
+    "rate_limit_stats",
+    "too_many_requests",
+]
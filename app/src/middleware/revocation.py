@@ -0,0 +1,143 @@
+"""
+Token 吊销同步
+
+吊销事件写入 auth_revocations 表（与用户表的修改在同一事务中），提交后立即
+应用到当前进程的内存吊销表；其他进程每隔 REVOCATION_SYNC_INTERVAL 秒按事件 ID
+增量查询一次新事件（通常为空结果的索引范围扫描），请求中不再查询数据库。
+其他进程最多在一个同步间隔内仍接受被吊销的 Token。
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+
+from je_stack.crud.unit_of_work import in_unit_of_work
+
+from src.dao.revocation_dao import RevocationDAO
+from src.dao.user_dao import UserDAO
+from src.db import read_engine
+from src.middleware.auth import ACCESS_TOKEN_EXPIRE_DAYS, CurrentUser, auth_middleware
+
+# 各进程同步吊销事件的间隔（秒）
+REVOCATION_SYNC_INTERVAL = float(os.getenv("REVOCATION_SYNC_INTERVAL", "1"))
+# 每次同步重新读取最近的若干个事件 ID：并发写入时 ID 较小的事件可能较晚提交，
+# 事件可以重复应用
+_SYNC_OVERLAP = 100
+
+
+class RevocationSync:
+    """吊销事件的写入与增量同步"""
+
+    def __init__(self, read_engine: Engine, interval: float = REVOCATION_SYNC_INTERVAL):
+        self.read_engine = read_engine
+        self.interval = interval
+        self.revocations = auth_middleware.revocations
+
+    def refresh(self) -> int:
+        """从数据库拉取新的吊销事件并清除已过期的内存记录，返回新应用的事件数"""
+        now = datetime.now()
+        after = max(0, self.revocations.last_event_id - _SYNC_OVERLAP)
+        with Session(self.read_engine) as session:
+            events = RevocationDAO(session).get_events_after(after, now)
+        applied = 0
+        for e in events:
+            applied += self._apply(
+                e.id, e.user_id, e.generation, e.token_id, e.expires_at.timestamp()
+            )
+        self.revocations.prune()
+        return applied
+
+    async def run(self) -> None:
+        """后台同步循环（在应用 lifespan 中启动）"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.warning(f"同步 Token 吊销事件失败: {e}")
+
+    def revoke_user(self, session: Session, user_id: int) -> int | None:
+        """使用户此前签发的 Token 全部失效（禁用用户、变更角色后调用）
+
+        递增用户的 token_version 并记录吊销事件；在调用方的工作单元中时随之
+        提交。提交后立即应用到当前进程
+
+        Returns:
+            用户新的 Token 版本，用户不存在时返回 None
+        """
+        user_dao = UserDAO(session)
+        with user_dao.transaction():
+            generation = user_dao.bump_token_version(user_id)
+            if generation is None:
+                return None
+            expires_at = datetime.now() + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
+            revocation_dao = RevocationDAO(session)
+            revocation = revocation_dao.add_user_revocation(user_id, generation, expires_at)
+            revocation_dao.delete_expired(datetime.now())
+            event_id = revocation.id
+        self._apply_after_commit(
+            session, event_id, user_id, generation, None, expires_at.timestamp()
+        )
+        logger.info(f"✓ 用户 ID {user_id} 的 Token 已全部失效（版本 {generation}）")
+        return generation
+
+    def revoke_token(self, session: Session, current_user: CurrentUser) -> bool:
+        """吊销当前请求的 Token（用户登出），Token 没有 jti 时返回 False"""
+        if current_user.token_id is None:
+            return False
+        expires_at = current_user.exp.astimezone().replace(tzinfo=None)
+        revocation = RevocationDAO(session).add_token_revocation(
+            current_user.user_id, current_user.token_id, expires_at
+        )
+        self._apply_after_commit(
+            session,
+            revocation.id,
+            current_user.user_id,
+            None,
+            current_user.token_id,
+            current_user.exp.timestamp(),
+        )
+        return True
+
+    def _apply_after_commit(
+        self,
+        session: Session,
+        event_id: int,
+        user_id: int,
+        generation: int | None,
+        token_id: str | None,
+        expires_at: float,
+    ) -> None:
+        """应用到当前进程：处于工作单元中时等事务提交后再应用（回滚则不应用）"""
+
+        def apply(_session=None):
+            self._apply(event_id, user_id, generation, token_id, expires_at)
+
+        if in_unit_of_work(session):
+            event.listen(session, "after_commit", apply, once=True)
+        else:
+            apply()
+
+    def _apply(
+        self,
+        event_id: int,
+        user_id: int,
+        generation: int | None,
+        token_id: str | None,
+        expires_at: float,
+    ) -> bool:
+        """应用一条吊销事件；用户级吊销同时清除该用户已缓存的 Token"""
+        changed = self.revocations.apply_event(
+            event_id, user_id, generation, token_id, expires_at
+        )
+        if changed and generation is not None and auth_middleware.token_cache is not None:
+            auth_middleware.token_cache.invalidate_user(user_id)
+        return changed
+
+
+# 全局吊销同步实例（从读连接池同步）
+revocation_sync = RevocationSync(read_engine)
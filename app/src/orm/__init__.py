@@ -53,6 +53,13 @@ class UserModel(Base):
         default=True,
         comment="用户是否激活",
     )
+    token_version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="Token 版本：递增后此前签发的 Token 全部失效",
+    )
     extra: Mapped[str | None] = mapped_column(
         Text,
         nullable=True,
@@ -61,6 +68,7 @@ class UserModel(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
+        index=True,
         comment="创建时间",
         default=datetime.now,
     )
@@ -142,6 +150,7 @@ class TaskModel(Base):
     due_date: Mapped[datetime | None] = mapped_column(
         DateTime,
         nullable=True,
+        index=True,
         comment="截止日期",
     )
     creator_id: Mapped[int | None] = mapped_column(
@@ -153,6 +162,7 @@ class TaskModel(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
+        index=True,
         default=datetime.now,
         comment="创建时间",
     )
@@ -172,3 +182,46 @@ class TaskModel(Base):
 
     def __repr__(self):
         return f"<TaskModel(id={self.id}, title='{self.title}', status='{self.status}', priority='{self.priority}')>"
+
+
+class AuthRevocationModel(Base):
+    """Token 吊销事件表（只追加，各进程按 ID 增量同步到内存吊销表）"""
+
+    __tablename__ = "auth_revocations"
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        comment="事件ID",
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="用户ID",
+    )
+    generation: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="用户级吊销：用户新的 Token 版本",
+    )
+    token_id: Mapped[str | None] = mapped_column(
+        String(32),
+        nullable=True,
+        comment="单个 Token 吊销：Token 的 jti",
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        index=True,
+        comment="过期时间（之后吊销的 Token 已全部过期，可以清除）",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.now,
+        comment="创建时间",
+    )
+
+    def __repr__(self):
+        return f"<AuthRevocationModel(id={self.id}, user_id={self.user_id}, generation={self.generation}, token_id='{self.token_id}')>"
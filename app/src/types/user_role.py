@@ -1,9 +1,83 @@
 """
 用户权限角色定义
+
+权限在模块加载时编译为整数位掩码：每个权限占一位，角色的掩码为其所有权限
+的按位或，超级管理员为 -1（所有位，包括以后新增的权限）。权限检查是一次
+按位与运算，不需要构造和遍历列表。
 """
 
 from enum import Enum
 
+# 所有权限，元组中的位置即位序号（位掩码只在进程内使用，不写入 Token）
+PERMISSIONS: tuple[str, ...] = (
+    "view_public_queries",
+    "view_public_evaluations",
+    "create_query",
+    "edit_own_query",
+    "delete_own_query",
+    "edit_any_query",
+    "delete_any_query",
+    "create_evaluation",
+    "edit_own_evaluation",
+    "delete_own_evaluation",
+    "edit_any_evaluation",
+    "delete_any_evaluation",
+    "upload_deliverables",
+    "manage_users",
+    "view_user_list",
+    "edit_user_permissions",
+)
+
+# 权限 -> 位
+PERMISSION_BITS: dict[str, int] = {name: 1 << i for i, name in enumerate(PERMISSIONS)}
+
+# 拥有所有权限的掩码
+ALL_PERMISSIONS = -1
+
+_ROLE_PERMISSIONS: dict[str, tuple[str, ...]] = {
+    "guest": ("view_public_queries", "view_public_evaluations"),
+    "user": (
+        "view_public_queries",
+        "view_public_evaluations",
+        "create_query",
+        "edit_own_query",
+        "delete_own_query",
+        "create_evaluation",
+        "edit_own_evaluation",
+        "delete_own_evaluation",
+        "upload_deliverables",
+    ),
+    "admin": (
+        "view_public_queries",
+        "view_public_evaluations",
+        "create_query",
+        "edit_own_query",
+        "delete_own_query",
+        "edit_any_query",
+        "delete_any_query",
+        "create_evaluation",
+        "edit_own_evaluation",
+        "delete_own_evaluation",
+        "edit_any_evaluation",
+        "delete_any_evaluation",
+        "upload_deliverables",
+        "manage_users",
+        "view_user_list",
+        "edit_user_permissions",
+    ),
+    "super_admin": ("*",),  # 所有权限
+}
+
+# 角色 -> 权限掩码
+ROLE_MASKS: dict[str, int] = {
+    role: (
+        ALL_PERMISSIONS
+        if "*" in permissions
+        else sum(PERMISSION_BITS[name] for name in set(permissions))
+    )
+    for role, permissions in _ROLE_PERMISSIONS.items()
+}
+
 
 class UserRole(str, Enum):
     """用户角色枚举"""
@@ -27,54 +101,38 @@ class UserRole(str, Enum):
     @classmethod
     def get_permissions(cls, role: str) -> list[str]:
         """获取角色权限列表"""
-        permissions = {
-            cls.GUEST: [
-                "view_public_queries",
-                "view_public_evaluations"
-            ],
-            cls.USER: [
-                "view_public_queries",
-                "view_public_evaluations",
-                "create_query",
-                "edit_own_query",
-                "delete_own_query",
-                "create_evaluation",
-                "edit_own_evaluation",
-                "delete_own_evaluation",
-                "upload_deliverables"
-            ],
-            cls.ADMIN: [
-                "view_public_queries",
-                "view_public_evaluations",
-                "create_query",
-                "edit_own_query",
-                "delete_own_query",
-                "edit_any_query",
-                "delete_any_query",
-                "create_evaluation",
-                "edit_own_evaluation",
-                "delete_own_evaluation",
-                "edit_any_evaluation",
-                "delete_any_evaluation",
-                "upload_deliverables",
-                "manage_users",
-                "view_user_list",
-                "edit_user_permissions"
-            ],
-            cls.SUPER_ADMIN: [
-                "*"  # 所有权限
-            ]
-        }
-        return permissions.get(role, [])
+        return list(_ROLE_PERMISSIONS.get(role, ()))
+
+    @classmethod
+    def role_mask(cls, role: str) -> int:
+        """获取角色的权限掩码，未知角色为 0"""
+        return ROLE_MASKS.get(role, 0)
+
+    @classmethod
+    def permission_mask(cls, *permissions: str) -> int:
+        """把权限名编译为掩码（在定义路由时调用一次）"""
+        mask = 0
+        for name in permissions:
+            bit = PERMISSION_BITS.get(name)
+            if bit is None:
+                raise ValueError(f"未知权限: {name}")
+            mask |= bit
+        return mask
+
+    @staticmethod
+    def mask_allows(mask: int, required: int) -> bool:
+        """掩码是否包含所有需要的权限位"""
+        return mask & required == required
 
     @classmethod
     def can_access(cls, user_role: str, required_permission: str) -> bool:
         """检查用户角色是否有指定权限"""
-        if user_role == cls.SUPER_ADMIN:
-            return True
-
-        user_permissions = cls.get_permissions(user_role)
-        return required_permission in user_permissions or "*" in user_permissions
+        mask = ROLE_MASKS.get(user_role, 0)
+        bit = PERMISSION_BITS.get(required_permission)
+        if bit is None:
+            # 未知权限只有拥有所有权限的角色可以访问
+            return mask == ALL_PERMISSIONS
+        return mask & bit != 0
 
     @classmethod
     def get_all_roles(cls) -> list[dict]:
@@ -83,7 +141,7 @@ class UserRole(str, Enum):
             {
                 "value": role.value,
                 "label": cls.get_description(role.value),
-                "permissions": cls.get_permissions(role.value)
+                "permissions": cls.get_permissions(role.value),
             }
             for role in cls
-        ]
\ No newline at end of file
+        ]
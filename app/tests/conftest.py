@@ -0,0 +1,61 @@
+"""
+测试公共配置
+
+应用模块在导入时读取环境变量（数据库地址、限流和哈希参数），因此在导入
+任何 src / main 模块之前先指向临时数据库并关闭与测试无关的限流。
+"""
+
+import os
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix="je-stack-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR}/app.db"
+os.environ["JWT_SECRET_KEY"] = "test-secret-key-with-at-least-32-bytes"
+os.environ["USER_REGISTER_TOKEN"] = "test-register-token"
+os.environ["PASSWORD_BCRYPT_ROUNDS"] = "4"
+os.environ["LOGIN_RATE_PER_IP"] = "0"
+os.environ["LOGIN_RATE_GLOBAL"] = "0"
+os.environ["REGISTER_RATE_PER_IP"] = "0"
+os.environ["REGISTER_RATE_GLOBAL"] = "0"
+os.environ["LOGIN_FAILURES_PER_USERNAME"] = "3/hour"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from je_stack.utils import DatabaseSessionManager
+from src.dao.base import dao_cache
+from src.orm import Base
+
+
+@pytest.fixture(autouse=True)
+def clear_dao_cache():
+    """DAO 共享的进程内缓存不跨测试保留"""
+    dao_cache.clear()
+    yield
+    dao_cache.clear()
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """按 ORM 模型建表的独立文件数据库（与应用一样显式开启 WAL 和外键约束）"""
+    manager = DatabaseSessionManager(f"sqlite:///{tmp_path}/test.db", sqlite_profile="durable")
+    manager.create_all_tables(Base)
+    yield manager
+    manager.engine.dispose()
+    manager.read_engine.dispose()
+
+
+@pytest.fixture
+def session(db_manager):
+    with Session(db_manager.engine) as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def client():
+    """整个测试会话共用的应用客户端（启动时初始化临时数据库）"""
+    from main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,129 @@
+"""接口层（TestClient 调用完整应用）"""
+
+import itertools
+
+import pytest
+from sqlalchemy import event, text
+
+from src.dao.base import dao_cache
+
+PASSWORD = "Passw0rd!"
+_usernames = (f"api_user_{i}" for i in itertools.count())
+
+
+@pytest.fixture
+def register(client):
+    def register(role=None):
+        username = next(_usernames)
+        response = client.post(
+            "/api/v1/user/register",
+            json={
+                "username": username,
+                "password": PASSWORD,
+                "nickname": username,
+                "register_token": "test-register-token",
+            },
+        )
+        assert response.status_code == 201, response.json()
+        if role is not None:
+            from src.db import engine
+
+            with engine.begin() as connection:
+                connection.execute(
+                    text("UPDATE users SET role = :role WHERE username = :username"),
+                    {"role": role, "username": username},
+                )
+            dao_cache.clear()
+        return username
+
+    return register
+
+
+def login(client, username, password=PASSWORD):
+    return client.post("/api/v1/user/login", json={"username": username, "password": password})
+
+
+def auth_headers(client, username):
+    token = login(client, username).json()["data"]["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_task_update_is_committed_before_response(client, register):
+    owner = auth_headers(client, register())
+    other = auth_headers(client, register())
+    task = client.post("/api/v1/tasks/", json={"title": "draft"}, headers=owner).json()["data"]["task"]
+
+    response = client.put(f"/api/v1/tasks/{task['id']}", json={"title": "final"}, headers=owner)
+    assert response.json()["data"]["task"]["title"] == "final"
+    assert client.get(f"/api/v1/tasks/{task['id']}", headers=owner).json()["data"]["task"]["title"] == "final"
+
+    response = client.put(f"/api/v1/tasks/{task['id']}", json={"title": "stolen"}, headers=other)
+    assert response.json()["success"] is False
+    response = client.delete(f"/api/v1/tasks/{task['id']}", headers=other)
+    assert response.json()["success"] is False
+    assert client.get(f"/api/v1/tasks/{task['id']}", headers=owner).json()["data"]["task"]["title"] == "final"
+
+    assert client.delete(f"/api/v1/tasks/{task['id']}", headers=owner).json()["success"] is True
+    assert client.get(f"/api/v1/tasks/{task['id']}", headers=owner).json()["success"] is False
+
+
+def test_task_update_commit_failure_reaches_the_response(client, register):
+    from src.db import async_engine
+
+    owner = auth_headers(client, register())
+    task = client.post("/api/v1/tasks/", json={"title": "draft"}, headers=owner).json()["data"]["task"]
+
+    def fail(connection):
+        raise RuntimeError("commit failed")
+
+    # 提交在构造响应之前执行，提交失败必须体现在响应中，而不是在响应发送后被吞掉
+    event.listen(async_engine.sync_engine, "commit", fail)
+    try:
+        response = client.put(f"/api/v1/tasks/{task['id']}", json={"title": "final"}, headers=owner)
+    finally:
+        event.remove(async_engine.sync_engine, "commit", fail)
+    assert response.json()["success"] is False
+    dao_cache.clear()
+    assert client.get(f"/api/v1/tasks/{task['id']}", headers=owner).json()["data"]["task"]["title"] == "draft"
+
+
+def test_permissions_follow_the_role(client, register):
+    user = auth_headers(client, register())
+    admin = auth_headers(client, register(role="admin"))
+
+    assert client.get("/api/v1/user-management/auth-stats", headers=user).status_code == 403
+    response = client.get("/api/v1/user-management/auth-stats", headers=admin)
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+
+
+def test_permission_names_are_checked_when_the_route_is_defined():
+    from src.middleware.auth import check_user_permission
+
+    with pytest.raises(ValueError):
+        check_user_permission(permission="no_such_permission")
+    with pytest.raises(ValueError):
+        check_user_permission(permission="manage_users", role="admin")
+
+
+def test_username_lockout_returns_429(client, register):
+    username = register()
+    for _ in range(3):
+        response = login(client, username, "wrong")
+        assert response.status_code == 200
+        assert response.json()["success"] is False
+
+    # 失败次数用完后，正确的密码也在验证前被拒绝
+    response = login(client, username)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_successful_login_resets_failures(client, register):
+    username = register()
+    for _ in range(2):
+        login(client, username, "wrong")
+    assert login(client, username).json()["success"] is True
+    for _ in range(2):
+        login(client, username, "wrong")
+    assert login(client, username).status_code == 200
@@ -0,0 +1,103 @@
+"""纯 ASGI 认证中间件与 @requires"""
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from je_stack.auth import (
+    AuthMiddlewareTool,
+    AuthenticationMiddleware,
+    AuthRoute,
+    get_request_user,
+    requires,
+)
+
+
+@pytest.fixture
+def auth():
+    return AuthMiddlewareTool(secret_key="test-secret-key-with-at-least-32-bytes")
+
+
+@pytest.fixture
+def client(auth):
+    app = FastAPI()
+    app.add_middleware(AuthenticationMiddleware, auth=auth)
+    router = APIRouter(route_class=AuthRoute)
+
+    @router.get("/public")
+    def public(request: Request):
+        state = request.scope["state"]
+        return {"user": state["current_user"] and state["current_user"].username}
+
+    @router.get("/me")
+    @requires()
+    def me(request: Request):
+        return {"user_id": get_request_user(request).user_id}
+
+    @router.get("/users")
+    @requires(permission="manage_users")
+    async def users():
+        return {"ok": True}
+
+    @router.get("/admin")
+    @requires(role="admin")
+    def admin():
+        return {"ok": True}
+
+    app.include_router(router)
+    with TestClient(app) as client:
+        yield client
+
+
+def headers(auth, **claims):
+    token = auth.create_access_token({"sub": "john", "user_id": 7, **claims})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_public_routes_do_not_need_a_token(client, auth):
+    assert client.get("/public").json() == {"user": None}
+    assert client.get("/public", headers={"Authorization": "Bearer bad"}).status_code == 200
+    assert client.get("/public", headers=headers(auth)).json() == {"user": "john"}
+
+
+def test_login_required(client, auth):
+    response = client.get("/me")
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    # 无效 Token 的原因透传给客户端
+    response = client.get("/me", headers={"Authorization": "Bearer bad"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "无效的Token格式"
+    assert client.get("/me", headers={"Authorization": "Basic abc"}).status_code == 401
+    assert client.get("/me", headers=headers(auth)).json() == {"user_id": 7}
+
+
+@pytest.mark.parametrize(
+    "role, users, admin",
+    [("user", 403, 403), ("admin", 200, 200), ("super_admin", 200, 200), (None, 403, 403)],
+)
+def test_permissions_and_roles(client, auth, role, users, admin):
+    claims = {"role": role} if role else {}
+    assert client.get("/users", headers=headers(auth, **claims)).status_code == users
+    assert client.get("/admin", headers=headers(auth, **claims)).status_code == admin
+
+
+def test_inactive_users_are_rejected(client, auth):
+    response = client.get("/me", headers=headers(auth, is_active=False))
+    assert response.status_code == 403
+
+
+def test_revoked_tokens(client, auth):
+    request_headers = headers(auth, jti="t1")
+    assert client.get("/me", headers=request_headers).status_code == 200
+
+    auth.revoke_token(auth.authenticate(request_headers["Authorization"][7:]))
+
+    assert client.get("/me", headers=request_headers).status_code == 401
+
+
+def test_invalid_requirements_fail_at_definition():
+    with pytest.raises(ValueError):
+        requires(permission="no_such_permission")
+    with pytest.raises(ValueError):
+        requires(permission="manage_users", role="admin")
@@ -0,0 +1,139 @@
+"""get_lines_by_ids 与请求级批量加载器"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from je_stack.crud import AsyncBaseDAO, AsyncBatchLoader, BatchLoader, base
+from je_stack.utils.database import create_async_database_engine
+from src.dao import TaskDAO
+from src.orm import TaskModel
+
+
+@pytest.fixture
+def selects(db_manager):
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append(statement)
+
+    event.listen(db_manager.engine, "before_cursor_execute", capture)
+    return captured
+
+
+@pytest.fixture
+def ids(session):
+    return TaskDAO(session).add_lines(
+        [{"title": f"t{i}"} for i in range(5)], return_ids=True
+    )
+
+
+def test_one_query_for_many_ids(session, ids, selects):
+    dao = TaskDAO(session)
+    selects.clear()
+
+    lines = dao.get_lines_by_ids([ids[0], ids[3], ids[0], 999])
+
+    assert len(selects) == 1
+    assert sorted(lines) == sorted([ids[0], ids[3]])
+    assert lines[ids[3]].title == "t3"
+
+
+def test_large_id_lists_are_chunked(session, ids, selects, monkeypatch):
+    monkeypatch.setattr(base, "_IDS_CHUNK_SIZE", 2)
+    selects.clear()
+
+    rows = TaskDAO(session).get_lines_by_ids(ids, columns=["title"])
+
+    assert len(selects) == 3
+    assert {id: row.title for id, row in rows.items()} == {
+        id: f"t{i}" for i, id in enumerate(ids)
+    }
+
+
+def test_cached_rows_are_not_queried_again(db_manager, ids, selects):
+    with db_manager.ReadSessionLocal() as session:
+        TaskDAO(session).get_lines_by_ids(ids[:3])
+    selects.clear()
+
+    with db_manager.ReadSessionLocal() as session:
+        lines = TaskDAO(session).get_lines_by_ids(ids)
+
+    assert len(lines) == 5
+    assert len(selects) == 1
+    assert "IN (?, ?)" in selects[0]
+
+
+def test_batch_loader(session, ids, selects):
+    loader = BatchLoader(TaskDAO(session), columns=["id", "title"])
+    loader.prime([ids[0], ids[1], None])
+    selects.clear()
+
+    assert loader.load(ids[0]).title == "t0"
+    assert loader.load(ids[1]).title == "t1"
+    assert loader.load(None) is None
+    assert len(selects) == 1
+
+    assert [row and row.title for row in loader.load_many([ids[1], 999, ids[2]])] == [
+        "t1",
+        None,
+        "t2",
+    ]
+    assert len(selects) == 2
+    loader.clear(ids[2])
+    loader.load(ids[2])
+    assert len(selects) == 3
+
+
+def test_async_batch_loader(db_manager, ids):
+    engine = create_async_database_engine(
+        str(db_manager.engine.url).replace("sqlite://", "sqlite+aiosqlite://", 1)
+    )
+    async_selects = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: async_selects.append(statement),
+    )
+
+    async def main():
+        async with AsyncSession(engine) as session:
+            loader = AsyncBatchLoader(AsyncBaseDAO(session, TaskModel), columns=["title"])
+            first = await asyncio.gather(
+                loader.load(ids[0]), loader.load(ids[1]), loader.load(ids[0]), loader.load(None)
+            )
+            second = await loader.load_many([ids[1], ids[4], 999])
+            return first, second
+
+    try:
+        first, second = asyncio.run(main())
+    finally:
+        asyncio.run(engine.dispose())
+    assert [row and row.title for row in first] == ["t0", "t1", "t0", None]
+    assert [row and row.title for row in second] == ["t1", "t4", None]
+    # 并发的 load 合并为一次查询，已加载的 ID 不再查询
+    assert len(async_selects) == 2
+    assert "IN (?, ?)" in async_selects[1]
+
+
+def test_async_batch_loader_failures_are_not_remembered():
+    class FlakyDAO:
+        calls = 0
+
+        async def get_lines_by_ids(self, ids, columns=None):
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("database unavailable")
+            return {id: f"row {id}" for id in ids}
+
+    async def main():
+        dao = FlakyDAO()
+        loader = AsyncBatchLoader(dao)
+        with pytest.raises(RuntimeError):
+            await loader.load_many([1, 2])
+        return await loader.load_many([1, 2]), dao.calls
+
+    assert asyncio.run(main()) == (["row 1", "row 2"], 2)
@@ -0,0 +1,106 @@
+"""init_schema：新数据库、旧版本数据库、没有版本记录的旧数据库"""
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect, text
+
+from src.db.bootstrap import (
+    current_revisions,
+    get_alembic_config,
+    head_revisions,
+    init_schema,
+    is_schema_at_head,
+    legacy_revision,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/bootstrap.db")
+    yield engine
+    engine.dispose()
+
+
+def create_legacy_tables(engine, revision):
+    """按引入迁移之前 create_all 的方式建表（初始迁移为空，不会建表）"""
+    role_columns = (
+        "role VARCHAR(20), is_active BOOLEAN, " if revision == "827605f1ad30" else ""
+    )
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(50) NOT NULL "
+                "UNIQUE, password VARCHAR(255) NOT NULL, nickname VARCHAR(50) NOT NULL, "
+                f"full_name VARCHAR(100), {role_columns}extra TEXT, "
+                "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, "
+                "description TEXT, status VARCHAR(20) NOT NULL, priority VARCHAR(20) NOT NULL, "
+                "due_date DATETIME, creator_id INTEGER REFERENCES users (id), "
+                "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            )
+        )
+
+
+def stamp(engine, revision):
+    config = get_alembic_config(engine.url.render_as_string(hide_password=False))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.stamp(config, revision)
+
+
+def assert_at_head(engine):
+    assert is_schema_at_head(engine)
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("users")}
+    assert {"role", "is_active", "token_version"} <= columns
+    indexes = {index["name"] for index in inspector.get_indexes("tasks")}
+    assert {"ix_tasks_created_at", "ix_tasks_due_date"} <= indexes
+    assert "auth_revocations" in inspector.get_table_names()
+
+
+def test_fresh_database(engine):
+    assert init_schema(engine)
+    assert_at_head(engine)
+    assert not init_schema(engine)
+
+
+def test_old_revision_is_upgraded(engine):
+    create_legacy_tables(engine, "827605f1ad30")
+    stamp(engine, "827605f1ad30")
+    with engine.connect() as connection:
+        assert current_revisions(connection) == ("827605f1ad30",)
+
+    assert init_schema(engine)
+    assert_at_head(engine)
+
+
+@pytest.mark.parametrize("revision", ["a103d1f8a504", "827605f1ad30"])
+def test_legacy_database_without_version_is_upgraded(engine, revision):
+    create_legacy_tables(engine, revision)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO users (username, password, nickname, created_at, updated_at) "
+                "VALUES ('old', 'x', 'old', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            )
+        )
+        assert current_revisions(connection) == ()
+        assert legacy_revision(connection) == revision
+
+    assert init_schema(engine)
+    assert_at_head(engine)
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT token_version FROM users")) == 0
+
+
+def test_legacy_revision_without_tables(engine):
+    with engine.connect() as connection:
+        assert legacy_revision(connection) is None
+
+
+def test_head_revisions():
+    assert head_revisions() == ("b7d41f2c9e60",)
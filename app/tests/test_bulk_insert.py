@@ -0,0 +1,58 @@
+"""add_lines 批量插入"""
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+
+from src.dao import TaskDAO
+from src.orm import TaskModel
+
+
+def titles(db_manager):
+    with db_manager.ReadSessionLocal() as session:
+        return list(session.scalars(select(TaskModel.title).order_by(TaskModel.id)))
+
+
+def test_commits_once_per_batch(db_manager, session):
+    commits = []
+    event.listen(db_manager.engine, "commit", lambda conn: commits.append(1))
+    dao = TaskDAO(session)
+
+    count = dao.add_lines(({"title": f"t{i}"} for i in range(25)), batch_size=10)
+
+    assert count == 25
+    assert len(commits) == 3
+    assert titles(db_manager) == [f"t{i}" for i in range(25)]
+    # 新行不放入 identity map
+    assert len(session.identity_map) == 0
+
+
+def test_return_ids_follow_input_order(db_manager, session):
+    dao = TaskDAO(session)
+    dao.add_line(title="existing")
+
+    ids = dao.add_lines([{"title": "b"}, {"title": "a"}, {"title": "c"}], return_ids=True)
+
+    with db_manager.ReadSessionLocal() as read:
+        assert [read.get(TaskModel, id).title for id in ids] == ["b", "a", "c"]
+
+
+def test_failed_batch_rolls_back_only_itself(db_manager, session):
+    dao = TaskDAO(session)
+    rows = [{"title": "ok1"}, {"title": "ok2"}, {"title": "bad", "creator_id": 999}]
+
+    with pytest.raises(IntegrityError):
+        dao.add_lines(rows, batch_size=2)
+
+    assert titles(db_manager) == ["ok1", "ok2"]
+    # 失败后 Session 仍然可用
+    dao.add_lines([{"title": "after"}])
+    assert titles(db_manager) == ["ok1", "ok2", "after"]
+
+
+def test_empty_input_and_invalid_batch_size(session):
+    dao = TaskDAO(session)
+    assert dao.add_lines([]) == 0
+    assert dao.add_lines([], return_ids=True) == []
+    with pytest.raises(ValueError):
+        dao.add_lines([{"title": "a"}], batch_size=0)
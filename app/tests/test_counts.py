@@ -0,0 +1,67 @@
+"""exists 与计数（缓存 / 近似值）"""
+
+from sqlalchemy import text
+
+from src.dao import TaskDAO, UserDAO
+from src.dao.base import dao_cache
+
+
+def test_exists_does_not_trust_the_cache(db_manager, session):
+    dao = TaskDAO(session)
+    task = dao.add_line(title="a")
+    with db_manager.ReadSessionLocal() as other:
+        TaskDAO(other).get_line_by_id(task.id)
+    assert dao_cache.get(("TaskModel", task.id)) is not None
+
+    # 其他进程删除的行在本进程缓存中依然存在，直到 TTL 过期
+    with db_manager.engine.begin() as connection:
+        connection.execute(text("DELETE FROM tasks"))
+    assert dao_cache.get(("TaskModel", task.id)) is not None
+    assert not dao.exists(task.id)
+
+
+def test_exists(session):
+    dao = TaskDAO(session)
+    task = dao.add_line(title="a")
+    assert dao.exists(task.id)
+    assert not dao.exists(task.id + 1)
+
+
+def test_counts_are_cached_until_a_write(session):
+    dao = TaskDAO(session)
+    dao.add_lines([{"title": "a"}, {"title": "b", "status": "completed"}])
+
+    assert dao.count_where({"status": "pending"}) == 1
+    hits = dao_cache.hits
+    assert dao.count_where({"status": "pending"}) == 1
+    assert dao_cache.hits == hits + 1
+
+    dao.add_line(title="c")
+    assert dao.count_where({"status": "pending"}) == 2
+    assert dao.get_lines_num() == 3
+    assert dao.count_by_field("status", "completed") == 1
+
+
+def test_approximate_count_uses_sqlite_stats(session):
+    dao = TaskDAO(session)
+    dao.add_lines([{"title": f"t{i}"} for i in range(10)])
+    # 没有统计信息时退回精确计数
+    assert dao.get_lines_num(approximate=True) == 10
+
+    dao_cache.clear()
+    session.execute(text("ANALYZE"))
+    session.commit()
+    dao.add_lines([{"title": "late"}])
+    dao_cache.clear()
+    assert dao.get_lines_num(approximate=True) == 10
+    assert dao.get_lines_num() == 11
+
+
+def test_user_rows_are_not_cached(session):
+    dao = UserDAO(session)
+    user_id = dao.add_user("alice", "secret-hash", "Alice")
+    session.expunge_all()
+
+    assert dao.get_user_by_username("alice").id == user_id
+    assert dao.get_line_by_id(user_id) is not None
+    assert dao_cache.stats()["size"] == 0
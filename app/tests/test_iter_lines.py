@@ -0,0 +1,64 @@
+"""iter_lines 流式遍历"""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from je_stack.utils.database import create_async_database_engine
+from src.dao import AsyncTaskDAO, TaskDAO
+
+
+def test_streams_in_id_order_and_releases_chunks(session):
+    dao = TaskDAO(session)
+    dao.add_lines({"title": f"t{i}", "priority": "high" if i % 3 else "low"} for i in range(50))
+
+    seen, in_session = [], []
+    for task in dao.iter_lines(chunk_size=8):
+        seen.append(task.id)
+        in_session.append(len(session.identity_map))
+
+    assert seen == sorted(seen) and len(seen) == 50
+    # Session 中最多保留一个分块
+    assert max(in_session) <= 8
+    assert len(session.identity_map) == 0
+    # 分离后的对象仍可访问已加载的字段
+    assert [t.title for t in dao.iter_lines(chunk_size=8)][:2] == ["t0", "t1"]
+
+
+def test_filters(session):
+    dao = TaskDAO(session)
+    dao.add_lines({"title": f"t{i}", "priority": "high" if i % 3 else "low"} for i in range(30))
+
+    assert sum(1 for _ in dao.iter_lines(chunk_size=4, filters={"priority": "low"})) == 10
+
+
+def test_stopping_early_closes_the_cursor(session):
+    dao = TaskDAO(session)
+    dao.add_lines({"title": f"t{i}"} for i in range(20))
+
+    lines = dao.iter_lines(chunk_size=5)
+    next(lines)
+    lines.close()
+    # 游标关闭后同一 Session 可以继续读写
+    dao.add_line(title="after")
+    assert dao.count_where() == 21
+
+
+def test_async_iter_lines(db_manager, session):
+    TaskDAO(session).add_lines({"title": f"t{i}"} for i in range(12))
+    engine = create_async_database_engine(
+        str(db_manager.engine.url).replace("sqlite://", "sqlite+aiosqlite://", 1)
+    )
+
+    async def main():
+        async with AsyncSession(engine) as async_session:
+            dao = AsyncTaskDAO(async_session)
+            titles = [task.title async for task in dao.iter_lines(chunk_size=5)]
+            return titles, len(async_session.identity_map)
+
+    try:
+        titles, remaining = asyncio.run(main())
+    finally:
+        asyncio.run(engine.dispose())
+    assert titles == [f"t{i}" for i in range(12)]
+    assert remaining == 0
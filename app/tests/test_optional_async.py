@@ -0,0 +1,55 @@
+"""异步支持是可选依赖：只安装同步依赖时 je_stack 依然可以导入和使用"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+SCRIPT = textwrap.dedent(
+    """
+    import importlib.abc
+    import sys
+
+    class BlockAsync(importlib.abc.MetaPathFinder):
+        def find_spec(self, name, path, target=None):
+            if name.split(".")[0] in ("greenlet", "aiosqlite"):
+                raise ImportError(f"No module named {name!r}")
+
+    sys.meta_path.insert(0, BlockAsync())
+
+    import je_stack
+    from je_stack.auth import PasswordHasherPool
+    from je_stack.crud import BaseDAO, unit_of_work
+    from je_stack.utils import DatabaseSessionManager
+    from sqlalchemy.orm import Session
+
+    manager = DatabaseSessionManager("sqlite://")
+    with Session(manager.engine) as session, unit_of_work(session):
+        pass
+    PasswordHasherPool(max_workers=1).stats()
+
+    try:
+        je_stack.crud.AsyncBaseDAO
+    except ImportError:
+        print("async unavailable")
+    """
+)
+
+
+def test_sync_only_install():
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT], cwd=ROOT, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "async unavailable"
+
+
+def test_async_names_are_still_exported():
+    import je_stack
+    from je_stack.crud import AsyncBaseDAO
+    from je_stack.crud.async_base import AsyncBaseDAO as direct
+
+    assert AsyncBaseDAO is direct
+    assert je_stack.AsyncBaseDAO is direct
@@ -0,0 +1,91 @@
+"""游标（Keyset）分页"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from je_stack.crud.pagination import decode_cursor, encode_cursor
+from src.dao import TaskDAO
+from src.dao.base import FormValidationError
+
+
+@pytest.mark.parametrize(
+    "value", [None, 3, "text", datetime(2024, 5, 1, 12, 30), date(2024, 5, 1)]
+)
+def test_cursor_round_trip(value):
+    cursor = encode_cursor("due_date", True, value, 42)
+
+    assert "=" not in cursor
+    order_by, descending, decoded, id = decode_cursor(cursor)
+    expected = value.isoformat() if isinstance(value, (datetime, date)) else value
+    assert (order_by, descending, decoded, id) == ("due_date", True, expected, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor("id", False, 1, 1)[:-3]])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+def dao(session):
+    dao = TaskDAO(session)
+    start = datetime(2024, 1, 1)
+    # 截止日期有重复值和 NULL，验证 (due_date, id) 排序的连续性
+    dao.add_lines(
+        {
+            "title": f"t{i}",
+            "due_date": None if i % 4 == 0 else start + timedelta(days=i % 3),
+            "priority": "high" if i % 2 else "low",
+        }
+        for i in range(23)
+    )
+    return dao
+
+
+def walk(dao, **kwargs):
+    ids, cursor, pages = [], None, 0
+    while True:
+        lines, cursor = dao.get_page(after=cursor, limit=5, **kwargs)
+        ids.extend(line.id for line in lines)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+@pytest.mark.parametrize("order_by", ["id", "due_date", "created_at"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_every_row_once(dao, order_by, descending):
+    def key(task):
+        value = getattr(task, order_by)
+        # 升序时 NULL 在前，降序时 NULL 在后
+        return (value is not None, value or datetime.min, task.id)
+
+    expected = [t.id for t in sorted(dao.get_lines(), key=key, reverse=descending)]
+
+    ids, pages = walk(dao, order_by=order_by, descending=descending)
+
+    assert ids == expected
+    assert pages == 5
+
+
+def test_filters_and_projection(dao):
+    ids, _ = walk(dao, filters={"priority": "high"}, order_by="due_date", columns=["title"])
+    assert len(ids) == 11
+
+    lines, cursor = dao.get_page(limit=2, order_by="due_date", columns=["title"])
+    # 投影查询自动补充 id 和排序字段
+    assert set(lines[0]._fields) == {"title", "id", "due_date"}
+    assert cursor is not None
+
+
+def test_cursor_must_match_the_ordering(dao):
+    _, cursor = dao.get_page(limit=5, order_by="due_date")
+
+    with pytest.raises(FormValidationError) as error:
+        dao.get_page(after=cursor, limit=5, order_by="due_date", descending=True)
+    assert error.value.error_code == "INVALID_CURSOR"
+    with pytest.raises(FormValidationError):
+        dao.get_page(after="garbage", limit=5)
+    with pytest.raises(FormValidationError):
+        dao.get_page(limit=5, order_by="no_such_column")
@@ -0,0 +1,127 @@
+"""PasswordHasherPool 与密码上下文"""
+
+import asyncio
+import threading
+
+import pytest
+
+from je_stack.auth import PasswordHasherPool, PasswordPoolBusyError, build_password_context
+
+
+class BlockingContext:
+    """哈希在 release 被设置前一直阻塞的假 CryptContext"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def hash(self, password):
+        self.started.set()
+        self.release.wait(5)
+        return f"hashed:{password}"
+
+    def verify(self, password, hashed):
+        return hashed == f"hashed:{password}"
+
+    def needs_update(self, hashed):
+        return not hashed.startswith("hashed:")
+
+
+@pytest.fixture
+def context():
+    context = BlockingContext()
+    yield context
+    context.release.set()
+
+
+@pytest.fixture
+def pool(context):
+    pool = PasswordHasherPool(max_workers=1, max_queue=2, context=context)
+    yield pool
+    context.release.set()
+    pool.shutdown()
+
+
+def test_hash_and_verify(pool, context):
+    context.release.set()
+
+    async def main():
+        hashed = await pool.hash("secret")
+        return hashed, await pool.verify("secret", hashed)
+
+    assert asyncio.run(main()) == ("hashed:secret", True)
+    stats = pool.stats()
+    assert (stats["queued"], stats["running"], stats["completed"]) == (0, 0, 2)
+
+
+def test_full_queue_is_rejected(pool, context):
+    pool.submit(context.hash, "running")
+    assert context.started.wait(5)
+    queued = [pool.submit(context.hash, "a"), pool.submit(context.hash, "b")]
+
+    with pytest.raises(PasswordPoolBusyError):
+        pool.submit(context.hash, "c")
+    assert pool.stats()["rejected"] == 1
+
+    context.release.set()
+    assert [f.result(5) for f in queued] == ["hashed:a", "hashed:b"]
+
+
+def test_cancelled_jobs_release_their_slot(pool, context):
+    pool.submit(context.hash, "running")
+    assert context.started.wait(5)
+    queued = [pool.submit(context.hash, "a"), pool.submit(context.hash, "b")]
+    assert pool.stats()["queued"] == 2
+
+    assert all(f.cancel() for f in queued)
+    assert pool.stats()["queued"] == 0
+    # 名额归还后可以继续提交
+    later = [pool.submit(context.hash, "c"), pool.submit(context.hash, "d")]
+    context.release.set()
+    assert [f.result(5) for f in later] == ["hashed:c", "hashed:d"]
+    assert pool.stats()["queued"] == 0
+
+
+def test_cancelled_waiters_release_their_slot(pool, context):
+    async def main():
+        pool.submit(context.hash, "running")
+        await asyncio.to_thread(context.started.wait, 5)
+        for _ in range(3):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(pool.hash("slow"), timeout=0.01)
+        return pool.stats()["queued"]
+
+    assert asyncio.run(main()) == 0
+
+
+def test_schedule_rehash(pool, context):
+    context.release.set()
+    saved = []
+
+    assert pool.schedule_rehash("secret", "hashed:secret", saved.append) is None
+    future = pool.schedule_rehash("secret", "legacy", saved.append)
+    future.result(5)
+    assert saved == ["hashed:secret"]
+
+
+
+def test_bcrypt_rounds_outside_target_need_update():
+    context = build_password_context("bcrypt", bcrypt_rounds=5)
+    current = context.hash("secret")
+    lower = build_password_context("bcrypt", bcrypt_rounds=4).hash("secret")
+    higher = build_password_context("bcrypt", bcrypt_rounds=6).hash("secret")
+
+    assert not context.needs_update(current)
+    assert context.needs_update(lower)
+    assert context.needs_update(higher)
+    assert context.verify("secret", higher)
+
+
+def test_app_uses_the_je_stack_pool_and_context():
+    from je_stack.auth import password
+    from src.middleware import auth
+
+    assert auth.password_pool is password.password_pool
+    assert auth.pwd_context is password.pwd_context
+    # conftest 设置了 PASSWORD_BCRYPT_ROUNDS=4
+    assert password.pwd_context.hash("secret").startswith("$2b$04$")
@@ -0,0 +1,98 @@
+"""PoolMetrics 连接池与会话指标"""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, sessionmaker
+
+from je_stack.utils import DatabaseSessionManager, PoolMetrics
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/metrics.db", pool_size=2, max_overflow=0, pool_timeout=0.1
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_counters(engine):
+    metrics = PoolMetrics(engine)
+    with engine.connect() as first:
+        first.execute(text("SELECT 1"))
+        with engine.connect() as second:
+            second.execute(text("SELECT 1"))
+            pool = metrics.snapshot()["pool"]
+            assert (pool["checked_out"], pool["size"], pool["checkedin"]) == (2, 2, 0)
+
+    snapshot = metrics.snapshot()
+    pool = snapshot["pool"]
+    assert (pool["checked_out"], pool["peak_checked_out"], pool["checkouts"]) == (0, 2, 2)
+    assert pool["connects"] == 2
+    assert pool["statements"] == 2
+    assert snapshot["connect_latency_ms"]["count"] == 2
+    assert snapshot["checkout_hold_ms"]["count"] == 2
+
+
+def test_execution_options_copies_are_counted(engine):
+    metrics = PoolMetrics(engine)
+    with engine.execution_options(isolation_level="SERIALIZABLE").connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert metrics.snapshot()["pool"]["checkouts"] == 1
+
+
+def test_statement_counter_is_exact_across_threads(engine):
+    metrics = PoolMetrics(engine)
+
+    def worker():
+        for _ in range(200):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.snapshot()["pool"]["statements"] == 800
+
+
+def test_sessions_and_timeouts(engine):
+    metrics = PoolMetrics(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    metrics.instrument_sessions(SessionLocal)
+
+    with metrics.track_session(SessionLocal()) as session:
+        session.execute(text("SELECT 1"))
+        session.execute(text("SELECT 2"))
+        session.close()
+
+    held = [engine.connect(), engine.connect()]
+    try:
+        with pytest.raises(PoolTimeoutError):
+            with metrics.track_session(SessionLocal()) as session:
+                session.execute(text("SELECT 1"))
+    finally:
+        for connection in held:
+            connection.close()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["pool"]["timeouts"] == 1
+    assert snapshot["sessions"] == {"active": 0, "total": 2}
+    assert snapshot["session_queries"]["max"] == 2
+
+
+def test_managers_are_not_instrumented_by_default(tmp_path):
+    url = f"sqlite:///{tmp_path}/manager.db"
+    assert DatabaseSessionManager(url).stats() == {}
+
+    manager = DatabaseSessionManager(url, instrument=True)
+    for session in manager.get_session():
+        session.execute(text("SELECT 1"))
+    stats = manager.stats()
+    assert stats["write"] is stats["read"]
+    assert stats["write"]["sessions"]["total"] == 1
+    assert stats["write"]["session_queries"]["max"] == 1
@@ -0,0 +1,71 @@
+"""投影查询（columns 参数）"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Row
+
+from src.dao import TaskDAO
+from src.dao.base import FormValidationError
+from src.dao.user_dao import UserDAO
+from src.orm import TaskModel
+
+
+@pytest.fixture
+def statements(db_manager):
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append(statement)
+
+    event.listen(db_manager.engine, "before_cursor_execute", capture)
+    return captured
+
+
+def selected_columns(statement):
+    return statement.upper().split(" FROM ")[0]
+
+
+def test_rows_only_load_requested_columns(session, statements):
+    dao = TaskDAO(session)
+    dao.add_lines([{"title": "a", "description": "long text"}, {"title": "b"}])
+    statements.clear()
+
+    rows = dao.get_lines(columns=["id", "title"])
+
+    assert [type(row) for row in rows] == [Row, Row]
+    assert [row.title for row in rows] == ["a", "b"]
+    assert "DESCRIPTION" not in selected_columns(statements[-1])
+    # 不装配 ORM 实例
+    assert len(session.identity_map) == 0
+
+
+def test_full_entities_without_columns(session):
+    dao = TaskDAO(session)
+    dao.add_line(title="a")
+    assert isinstance(dao.get_lines()[0], TaskModel)
+
+
+def test_dao_helpers_accept_columns(session):
+    users = UserDAO(session)
+    user_id = users.add_user("owner", "hash", "Owner")
+    tasks = TaskDAO(session)
+    tasks.add_lines([{"title": "a", "creator_id": user_id}, {"title": "b"}])
+
+    rows = tasks.get_tasks_by_creator(user_id, columns=["id", "title"])
+    assert [row.title for row in rows] == ["a"]
+
+    page = users.get_users_with_pagination(columns=["id", "username"])
+    assert page["users"][0]._fields == ("id", "username")
+    info = users.get_users_info_by_ids([user_id, 999])
+    assert info == {user_id: {"nickname": "Owner", "full_name": None, "username": "owner"}}
+
+
+def test_unknown_column_is_rejected(session):
+    dao = TaskDAO(session)
+    with pytest.raises(FormValidationError) as error:
+        dao.get_lines(columns=["id", "no_such_column"])
+    assert error.value.error_code == "INVALID_COLUMN"
+    with pytest.raises(FormValidationError):
+        # 关系属性不是表字段
+        dao.get_lines(columns=["creator"])
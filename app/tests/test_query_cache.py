@@ -0,0 +1,109 @@
+"""QueryCache 与 DAO 缓存失效"""
+
+import pytest
+
+from je_stack.crud import QueryCache
+from src.dao import TaskDAO
+from src.dao.base import dao_cache
+
+
+def test_get_set_and_stats():
+    cache = QueryCache(maxsize=10, ttl=60)
+    assert cache.get(("TaskModel", 1)) is None
+    cache.set(("TaskModel", 1), {"id": 1})
+    assert cache.get(("TaskModel", 1)) == {"id": 1}
+
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_expired_entries_are_misses():
+    cache = QueryCache(ttl=0)
+    cache.set(("TaskModel", 1), {"id": 1})
+    assert cache.get(("TaskModel", 1)) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction():
+    cache = QueryCache(maxsize=2)
+    cache.set(("T", 1), 1)
+    cache.set(("T", 2), 2)
+    cache.get(("T", 1))
+    cache.set(("T", 3), 3)
+
+    assert cache.get(("T", 2)) is None
+    assert cache.get(("T", 1)) == 1
+    assert cache.get(("T", 3)) == 3
+    assert cache.evictions == 1
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        QueryCache(maxsize=0)
+
+
+def test_invalidate_namespace():
+    cache = QueryCache()
+    cache.set(("TaskModel", 1), 1)
+    cache.set(("TaskModel", 2), 2)
+    cache.set(("UserModel", 1), 1)
+
+    cache.invalidate_namespace("TaskModel")
+    assert cache.get(("TaskModel", 1)) is None
+    assert cache.get(("TaskModel", 2)) is None
+    assert cache.get(("UserModel", 1)) == 1
+
+    cache.invalidate(("UserModel", 1))
+    assert cache.stats()["size"] == 0
+    # 命名空间索引随条目一起清理
+    cache.invalidate_namespace("UserModel")
+
+
+def test_dao_writes_invalidate_rows_and_counts(db_manager, session):
+    dao = TaskDAO(session)
+    task = dao.add_line(title="a")
+    assert dao.count_where({"status": "pending"}) == 1
+    # 当前 Session 的 identity map 中已有该行，换一个 Session 读取才会写入缓存
+    with db_manager.ReadSessionLocal() as other:
+        assert TaskDAO(other).get_line_by_id(task.id).title == "a"
+    assert dao_cache.get(("TaskModel", task.id)) is not None
+
+    dao.update_where({"id": task.id}, {"status": "completed", "title": "b"})
+    assert dao_cache.get(("TaskModel", task.id)) is None
+    assert dao.count_where({"status": "pending"}) == 0
+
+    dao.add_line(title="c")
+    assert dao.count_where({"status": "pending"}) == 1
+
+    dao.delete_where({"status": "pending"})
+    assert dao.count_where({"status": "pending"}) == 0
+
+
+def test_unit_of_work_invalidates_again_after_commit(db_manager, session):
+    dao = TaskDAO(session)
+    task = dao.add_line(title="old")
+
+    with dao.transaction():
+        dao.update_line(task.id, title="new")
+        # 提交前另一个请求读到旧值并写回缓存
+        with db_manager.ReadSessionLocal() as other:
+            assert TaskDAO(other).get_line_by_id(task.id).title == "old"
+        assert dao_cache.get(("TaskModel", task.id)) is not None
+
+    assert dao_cache.get(("TaskModel", task.id)) is None
+    with db_manager.ReadSessionLocal() as other:
+        assert TaskDAO(other).get_line_by_id(task.id).title == "new"
+
+
+def test_rolled_back_unit_of_work_keeps_cache_consistent(db_manager, session):
+    dao = TaskDAO(session)
+    task = dao.add_line(title="old")
+
+    with pytest.raises(RuntimeError):
+        with dao.transaction():
+            dao.update_line(task.id, title="new")
+            raise RuntimeError
+
+    with db_manager.ReadSessionLocal() as other:
+        assert TaskDAO(other).get_line_by_id(task.id).title == "old"
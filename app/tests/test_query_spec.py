@@ -0,0 +1,106 @@
+"""声明式查询条件（Filter / QuerySpec）"""
+
+from datetime import datetime
+
+import pytest
+
+from je_stack.crud import Filter, QuerySpec
+from je_stack.crud.query import compile_query
+from src.dao import TaskDAO
+from src.dao.base import FormValidationError
+from src.dao.task_dao import task_query
+from src.orm import TaskModel
+
+JAN = datetime(2024, 1, 1)
+FEB = datetime(2024, 2, 1)
+MAR = datetime(2024, 3, 1)
+
+
+@pytest.fixture
+def dao(session):
+    dao = TaskDAO(session)
+    dao.add_lines(
+        [
+            {"title": "write report", "status": "pending", "priority": "high", "due_date": JAN},
+            {"title": "review", "status": "in_progress", "priority": "low", "due_date": FEB,
+             "description": "report draft"},
+            {"title": "deploy", "status": "completed", "priority": "high", "due_date": MAR},
+            {"title": "plan", "status": "pending", "priority": "medium"},
+        ]
+    )
+    return dao
+
+
+def titles(dao, *filters, sort=()):
+    return [t.title for t in dao.find(QuerySpec.build(filters, sort))]
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        (Filter("status", "eq", "pending"), ["write report", "plan"]),
+        (Filter("status", "ne", "pending"), ["review", "deploy"]),
+        (Filter("status", "in", ["pending", "completed"]), ["write report", "deploy", "plan"]),
+        (Filter("status", "not_in", ("pending",)), ["review", "deploy"]),
+        (Filter("due_date", "gt", JAN), ["review", "deploy"]),
+        (Filter("due_date", "le", FEB), ["write report", "review"]),
+        (Filter("due_date", "range", (FEB, None)), ["review", "deploy"]),
+        (Filter("due_date", "range", (JAN, FEB)), ["write report", "review"]),
+        (Filter("due_date", "range", (None, None)), ["write report", "review", "deploy", "plan"]),
+        (Filter("title", "like", "%e%"), ["write report", "review", "deploy"]),
+        (Filter("due_date", "is_null"), ["plan"]),
+        (Filter("due_date", "eq", None), ["plan"]),
+        (Filter("due_date", "ne", None), ["write report", "review", "deploy"]),
+        (Filter(("title", "description"), "contains", "report"), ["write report", "review"]),
+    ],
+)
+def test_operators(dao, spec, expected):
+    assert titles(dao, spec) == expected
+
+
+def test_filters_are_combined_and_sorted(dao):
+    assert titles(
+        dao, Filter("priority", "eq", "high"), Filter("status", "ne", "completed")
+    ) == ["write report"]
+    assert titles(dao, sort=["priority", "-title"]) == ["write report", "deploy", "review", "plan"]
+
+
+def test_count_page_and_update_accept_a_spec(dao):
+    spec = task_query(status="pending")
+
+    assert dao.count_where(spec) == 2
+    lines, cursor = dao.get_page(limit=1, filters=spec)
+    assert [t.title for t in lines] == ["write report"] and cursor is not None
+    assert dao.update_where(spec, {"priority": "low"}) == 2
+    assert titles(dao, Filter("priority", "eq", "low")) == ["write report", "review", "plan"]
+
+
+def test_compiled_once_per_shape():
+    first = compile_query(TaskModel, QuerySpec.build([Filter("status", "eq", "a")]))
+    second = compile_query(TaskModel, QuerySpec.build([Filter("status", "eq", "b")]))
+    other = compile_query(TaskModel, QuerySpec.build([Filter("status", "ne", "a")]))
+
+    assert first is second
+    assert other is not first
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        QuerySpec.build([Filter("password", "eq", "x")]),
+        QuerySpec.build([Filter("status", "between", "x")]),
+        QuerySpec.build([Filter("status", "in", "pending")]),
+        QuerySpec.build([Filter("due_date", "range", JAN)]),
+        QuerySpec.build(sort=["-creator"]),
+    ],
+)
+def test_invalid_specs(dao, spec):
+    # 先执行一次同形状的合法查询：值的格式不能只在第一次编译时检查
+    dao.find(QuerySpec.build([Filter("status", "in", ["pending"])]))
+    dao.find(QuerySpec.build([Filter("due_date", "range", (JAN, None))]))
+
+    with pytest.raises(FormValidationError) as error:
+        dao.find(spec)
+    assert error.value.error_code == "INVALID_QUERY"
+    with pytest.raises(FormValidationError):
+        dao.count_where(spec)
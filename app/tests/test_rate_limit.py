@@ -0,0 +1,93 @@
+"""RateLimiter"""
+
+import pytest
+
+from je_stack.auth import RateLimiter
+from je_stack.auth import rate_limit
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可手动推进的 time.monotonic"""
+
+    class Clock:
+        now = 1000.0
+
+        def advance(self, seconds):
+            self.now += seconds
+
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock.now)
+    return clock
+
+
+def test_burst_then_wait(clock):
+    limiter = RateLimiter(rate=0.5, burst=3)
+
+    assert [limiter.acquire("ip") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("ip") == pytest.approx(2.0)
+    # 其他键不受影响
+    assert limiter.acquire("other") == 0.0
+    stats = limiter.stats()
+    assert (stats["allowed"], stats["rejected"], stats["keys"]) == (4, 1, 2)
+
+
+def test_tokens_refill_over_time(clock):
+    limiter = RateLimiter(rate=1, burst=2)
+    limiter.acquire("ip")
+    limiter.acquire("ip")
+    assert limiter.acquire("ip") > 0
+
+    clock.advance(1)
+    assert limiter.acquire("ip") == 0.0
+    assert limiter.acquire("ip") > 0
+
+    # 补充不超过桶容量
+    clock.advance(100)
+    assert [limiter.acquire("ip") for _ in range(3)][-1] > 0
+
+
+def test_retry_after_does_not_consume(clock):
+    limiter = RateLimiter(rate=1, burst=1)
+    assert limiter.retry_after("user") == 0.0
+    assert limiter.acquire("user") == 0.0
+    assert limiter.retry_after("user") == pytest.approx(1.0)
+
+    limiter.reset("user")
+    assert limiter.retry_after("user") == 0.0
+    assert limiter.acquire("user") == 0.0
+
+
+def test_least_recently_used_keys_are_evicted(clock):
+    limiter = RateLimiter(rate=1, burst=1, maxsize=2)
+    limiter.acquire("a")
+    limiter.acquire("b")
+    limiter.acquire("a")
+    limiter.acquire("c")
+
+    assert len(limiter) == 2
+    assert limiter.evictions == 1
+    # b 被淘汰后以满桶重新开始
+    assert limiter.acquire("b") == 0.0
+
+
+@pytest.mark.parametrize(
+    "spec, rate, burst",
+    [("10/minute", 10 / 60, 10), ("5", 5, 5), (" 2/hour ", 2 / 3600, 2), ("1/day", 1 / 86400, 1)],
+)
+def test_parse(spec, rate, burst):
+    limiter = RateLimiter.parse(spec, name="x")
+    assert limiter.rate == pytest.approx(rate)
+    assert limiter.burst == burst
+    assert limiter.name == "x"
+
+
+@pytest.mark.parametrize("spec", [None, "", "0", " 0 "])
+def test_parse_disabled(spec):
+    assert RateLimiter.parse(spec) is None
+
+
+@pytest.mark.parametrize("spec", ["ten/minute", "10/fortnight", "-1/minute"])
+def test_parse_invalid(spec):
+    with pytest.raises(ValueError):
+        RateLimiter.parse(spec)
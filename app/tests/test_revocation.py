@@ -0,0 +1,63 @@
+"""RevocationList"""
+
+import time
+
+from je_stack.auth import RevocationList
+
+
+def test_revoke_user_invalidates_older_generations():
+    revocations = RevocationList()
+    expires_at = time.time() + 3600
+
+    assert revocations.revoke_user(1, generation=2, expires_at=expires_at)
+    assert revocations.is_revoked(1, generation=0)
+    assert revocations.is_revoked(1, generation=1)
+    assert not revocations.is_revoked(1, generation=2)
+    assert not revocations.is_revoked(2, generation=0)
+
+    # 版本只增不减
+    assert not revocations.revoke_user(1, generation=1, expires_at=expires_at)
+    assert not revocations.is_revoked(1, generation=2)
+
+
+def test_revoke_token():
+    revocations = RevocationList()
+    expires_at = time.time() + 3600
+
+    assert revocations.revoke_token("jti-1", expires_at)
+    assert not revocations.revoke_token("jti-1", expires_at)
+    assert revocations.is_revoked(1, generation=0, token_id="jti-1")
+    assert not revocations.is_revoked(1, generation=0, token_id="jti-2")
+    assert revocations.stats()["rejected"] == 1
+
+
+def test_apply_event_is_idempotent():
+    revocations = RevocationList()
+    expires_at = time.time() + 3600
+
+    assert revocations.apply_event(1, user_id=1, generation=1, token_id=None, expires_at=expires_at)
+    assert revocations.apply_event(2, user_id=None, generation=None, token_id="t", expires_at=expires_at)
+    assert not revocations.apply_event(1, user_id=1, generation=1, token_id=None, expires_at=expires_at)
+    assert not revocations.apply_event(2, user_id=None, generation=None, token_id="t", expires_at=expires_at)
+
+    assert revocations.last_event_id == 2
+    assert len(revocations) == 2
+
+
+def test_prune_removes_expired_records():
+    revocations = RevocationList()
+    now = time.time()
+    revocations.revoke_user(1, generation=1, expires_at=now - 1)
+    revocations.revoke_user(2, generation=1, expires_at=now + 3600)
+    revocations.revoke_token("old", expires_at=now - 1)
+    revocations.revoke_token("new", expires_at=now + 3600)
+
+    assert revocations.prune(now) == 2
+    stats = revocations.stats()
+    assert (stats["users"], stats["tokens"]) == (1, 1)
+    assert not revocations.is_revoked(1, generation=0)
+    assert revocations.is_revoked(2, generation=0)
+
+    revocations.clear()
+    assert len(revocations) == 0
+    assert revocations.last_event_id == 0
@@ -0,0 +1,79 @@
+"""DatabaseSessionManager 的读写连接池"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from je_stack.utils import AsyncDatabaseSessionManager, DatabaseSessionManager
+
+
+@pytest.fixture
+def url(tmp_path):
+    return f"sqlite:///{tmp_path}/manager.db"
+
+
+def test_split_is_opt_in(url):
+    manager = DatabaseSessionManager(url, pool_size=3, max_overflow=2)
+    try:
+        assert not manager.split_read_write
+        assert manager.read_engine is manager.engine
+        assert manager.engine.pool.size() == 3
+        # 默认连接池允许同时持有多个写会话
+        with manager.SessionLocal() as outer, manager.SessionLocal() as inner:
+            outer.execute(text("SELECT 1"))
+            inner.execute(text("SELECT 1"))
+    finally:
+        manager.engine.dispose()
+
+
+def test_split_uses_single_writer_and_query_only_readers(url):
+    manager = DatabaseSessionManager(url, split_read_write=True, read_pool_size=4)
+    try:
+        assert manager.split_read_write
+        assert manager.engine.pool.size() == 1
+        assert manager.read_engine.pool.size() == 4
+
+        with manager.SessionLocal() as session:
+            session.execute(text("CREATE TABLE t (x INTEGER)"))
+            session.execute(text("INSERT INTO t VALUES (1)"))
+            session.commit()
+        with manager.ReadSessionLocal() as session:
+            assert session.scalar(text("SELECT x FROM t")) == 1
+            with pytest.raises(OperationalError):
+                session.execute(text("INSERT INTO t VALUES (2)"))
+    finally:
+        manager.engine.dispose()
+        manager.read_engine.dispose()
+
+
+@pytest.mark.parametrize("kwargs", [{"pool_size": 5}, {"max_overflow": 10}])
+def test_split_rejects_explicit_writer_pool_args(url, kwargs):
+    with pytest.raises(ValueError):
+        DatabaseSessionManager(url, split_read_write=True, **kwargs)
+    with pytest.raises(ValueError):
+        AsyncDatabaseSessionManager(url, split_read_write=True, **kwargs)
+
+
+def test_split_is_ignored_for_memory_databases():
+    manager = DatabaseSessionManager("sqlite://", split_read_write=True, pool_size=5)
+    assert not manager.split_read_write
+    assert manager.read_engine is manager.engine
+
+
+def test_async_split(url):
+    async def main():
+        manager = AsyncDatabaseSessionManager(url, split_read_write=True)
+        try:
+            async with manager.SessionLocal() as session:
+                await session.execute(text("CREATE TABLE t (x INTEGER)"))
+                await session.commit()
+            async with manager.ReadSessionLocal() as session:
+                with pytest.raises(OperationalError):
+                    await session.execute(text("INSERT INTO t VALUES (1)"))
+            return manager.engine.sync_engine.pool.size()
+        finally:
+            await manager.dispose()
+
+    assert asyncio.run(main()) == 1
@@ -0,0 +1,74 @@
+"""update_where / delete_where"""
+
+import pytest
+from sqlalchemy import select
+
+from je_stack.crud import QuerySpec
+from src.dao import TaskDAO
+from src.dao.base import FormValidationError
+from src.orm import TaskModel
+
+
+def titles(db_manager):
+    with db_manager.ReadSessionLocal() as session:
+        return sorted(session.scalars(select(TaskModel.title)))
+
+
+def test_update_where_does_not_load_rows(session):
+    dao = TaskDAO(session)
+    dao.add_lines([{"title": "a"}, {"title": "b"}, {"title": "c", "priority": "high"}])
+    session.expunge_all()
+
+    assert dao.update_where({"priority": "medium"}, {"status": "completed"}) == 2
+    assert len(session.identity_map) == 0
+    assert dao.count_where({"status": "completed"}) == 2
+
+
+def test_expression_filters_and_returning(db_manager, session):
+    dao = TaskDAO(session)
+    dao.add_lines([{"title": f"t{i}"} for i in range(5)])
+
+    ids = dao.update_where([TaskModel.title.in_(["t1", "t3"])], {"status": "done"}, returning=True)
+    assert sorted(ids) == sorted(
+        session.scalars(select(TaskModel.id).where(TaskModel.title.in_(["t1", "t3"])))
+    )
+    assert sorted(dao.delete_where({"status": "done"}, returning=True)) == sorted(ids)
+    assert titles(db_manager) == ["t0", "t2", "t4"]
+
+
+def test_updated_rows_are_not_served_stale_from_cache(db_manager, session):
+    dao = TaskDAO(session)
+    task = dao.add_line(title="a")
+    with db_manager.ReadSessionLocal() as other:
+        TaskDAO(other).get_line_by_id(task.id)
+
+    dao.update_where({"id": task.id}, {"title": "b"})
+    with db_manager.ReadSessionLocal() as other:
+        assert TaskDAO(other).get_line_by_id(task.id).title == "b"
+
+
+@pytest.mark.parametrize("filters", [{}, [], QuerySpec.build([])])
+def test_empty_filters_are_rejected(db_manager, session, filters):
+    dao = TaskDAO(session)
+    dao.add_lines([{"title": "a"}, {"title": "b"}])
+
+    with pytest.raises(FormValidationError) as exc:
+        dao.update_where(filters, {"status": "cancelled"})
+    assert exc.value.error_code == "EMPTY_FILTERS"
+    with pytest.raises(FormValidationError):
+        dao.delete_where(filters)
+    assert titles(db_manager) == ["a", "b"]
+
+    assert dao.delete_where(filters, all_rows=True) == 2
+
+
+def test_unknown_filter_field_is_a_validation_error(session):
+    dao = TaskDAO(session)
+    for call in (
+        lambda: dao.update_where({"nope": 1}, {"status": "x"}),
+        lambda: dao.delete_where({"nope": 1}),
+        lambda: dao.count_where({"nope": 1}),
+    ):
+        with pytest.raises(FormValidationError) as exc:
+            call()
+        assert exc.value.error_code == "INVALID_FILTER"
@@ -0,0 +1,75 @@
+"""SQLite PRAGMA 预设"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from je_stack.utils import create_database_engine
+from je_stack.utils.database import sqlite_pragmas
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    engines = []
+
+    def make_engine(**kwargs):
+        engine = create_database_engine(f"sqlite:///{tmp_path}/profile.db", **kwargs)
+        engines.append(engine)
+        return engine
+
+    yield make_engine
+    for engine in engines:
+        engine.dispose()
+
+
+def pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.scalar(text(f"PRAGMA {name}"))
+
+
+def test_no_profile_by_default(make_engine):
+    engine = make_engine()
+    assert pragma(engine, "journal_mode") == "delete"
+    assert pragma(engine, "foreign_keys") == 0
+
+
+@pytest.mark.parametrize(
+    "profile, synchronous", [("durable", 2), ("throughput", 1)]
+)
+def test_write_profiles(make_engine, profile, synchronous):
+    engine = make_engine(sqlite_profile=profile)
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == synchronous
+    assert pragma(engine, "foreign_keys") == 1
+    assert pragma(engine, "busy_timeout") == 5000
+
+
+def test_readonly_profile_rejects_writes(make_engine):
+    with make_engine().begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+
+    engine = make_engine(sqlite_profile="readonly")
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT count(*) FROM t")) == 0
+        with pytest.raises(OperationalError):
+            connection.execute(text("INSERT INTO t VALUES (1)"))
+
+
+def test_overrides(make_engine):
+    engine = make_engine(
+        sqlite_profile="durable",
+        sqlite_pragma_overrides={"page_size": 8192, "foreign_keys": None},
+    )
+    # page_size 要在切换到 WAL 之前设置才会对新数据库生效
+    assert pragma(engine, "page_size") == 8192
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "foreign_keys") == 0
+
+
+def test_sqlite_pragmas():
+    assert sqlite_pragmas() == {}
+    ordered = list(sqlite_pragmas("throughput", {"auto_vacuum": "INCREMENTAL", "page_size": 4096}))
+    assert ordered[:2] == ["page_size", "auto_vacuum"]
+    assert ordered.index("journal_mode") > 1
+    with pytest.raises(ValueError):
+        sqlite_pragmas("fast")
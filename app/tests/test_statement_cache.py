@@ -0,0 +1,60 @@
+"""预构建语句缓存"""
+
+import pytest
+
+from je_stack.crud import Filter, QuerySpec
+from je_stack.crud.base import _STATEMENT_CACHE
+from src.dao import TaskDAO
+from src.dao.base import FormValidationError
+
+
+@pytest.fixture
+def dao(session):
+    dao = TaskDAO(session)
+    dao.add_lines(
+        [
+            {"title": "a", "priority": "high"},
+            {"title": "b", "priority": "high", "description": "x"},
+            {"title": "c", "priority": "low"},
+        ]
+    )
+    return dao
+
+
+def test_equality_statements_are_built_once(dao):
+    high, params = dao._equality_statement("count", {"priority": "high"})
+    low, _ = dao._equality_statement("count", {"priority": "low"})
+
+    assert high is low
+    assert params == {"priority": "high"}
+    assert dao.count_where({"priority": "high"}) == 2
+    assert dao.count_where({"priority": "low"}) == 1
+    assert dao.get_line_by_unique("title", "c").priority == "low"
+
+
+def test_none_values_are_not_cached(dao):
+    before = len(_STATEMENT_CACHE)
+
+    # 值为 None 时生成 IS NULL，不能复用 "= :description" 的语句
+    assert dao.count_where({"description": None}) == 2
+    assert len(_STATEMENT_CACHE) == before
+    assert dao.count_where({"description": "x"}) == 1
+
+
+def test_find_reuses_the_statement_for_the_same_shape(dao):
+    def spec(priority):
+        return QuerySpec.build([Filter("priority", "eq", priority)], sort=["-title"])
+
+    assert [t.title for t in dao.find(spec("high"))] == ["b", "a"]
+    cached = len(_STATEMENT_CACHE)
+    assert [t.title for t in dao.find(spec("low"))] == ["c"]
+    assert len(_STATEMENT_CACHE) == cached
+    # columns 不同时是另一条语句
+    assert [row.title for row in dao.find(spec("low"), columns=["title"])] == ["c"]
+    assert len(_STATEMENT_CACHE) == cached + 1
+
+
+def test_invalid_fields_are_not_cached(dao):
+    for _ in range(2):
+        with pytest.raises(FormValidationError):
+            dao.count_where({"no_such_field": 1})
@@ -0,0 +1,123 @@
+"""已验证 Token 缓存"""
+
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from je_stack.auth import AuthMiddlewareTool, TokenCache
+from je_stack.auth import token_cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可手动推进的 time.time"""
+
+    class Clock:
+        now = 1_000_000.0
+
+        def advance(self, seconds):
+            self.now += seconds
+
+    clock = Clock()
+    monkeypatch.setattr(token_cache.time, "time", lambda: clock.now)
+    return clock
+
+
+def test_hits_until_expiry(clock):
+    cache = TokenCache(maxsize=10)
+    cache.put("token", "user", expires_at=clock.now + 60, user_id=1)
+
+    assert cache.get("token") == "user"
+    clock.advance(60)
+    assert cache.get("token") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 1, 1, 0)
+
+
+def test_expired_and_disabled_entries_are_not_stored(clock):
+    cache = TokenCache(maxsize=10)
+    cache.put("old", "user", expires_at=clock.now - 1)
+    assert len(cache) == 0
+
+    disabled = TokenCache(maxsize=0)
+    disabled.put("token", "user", expires_at=clock.now + 60)
+    assert disabled.get("token") is None
+
+
+def test_least_recently_used_is_evicted(clock):
+    cache = TokenCache(maxsize=2)
+    cache.put("a", 1, clock.now + 60)
+    cache.put("b", 2, clock.now + 60)
+    cache.get("a")
+    cache.put("c", 3, clock.now + 60)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate(clock):
+    cache = TokenCache()
+    for token, user_id in (("a", 1), ("b", 1), ("c", 2)):
+        cache.put(token, token, clock.now + 60, user_id=user_id)
+
+    assert cache.invalidate_user(1) == 2
+    assert cache.invalidate_user(1) == 0
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (None, None, "c")
+    assert cache.invalidate("c")
+    assert not cache.invalidate("c")
+
+
+def test_token_text_is_not_kept():
+    cache = TokenCache()
+    cache.put("secret-token", "user", time.time() + 60)
+    assert all(b"secret-token" not in key for key in cache._entries)
+
+
+@pytest.fixture
+def auth():
+    return AuthMiddlewareTool(secret_key="test-secret-key-with-at-least-32-bytes")
+
+
+def issue(auth, **claims):
+    return auth.create_access_token({"sub": "john", "user_id": 7, **claims})
+
+
+def test_verified_tokens_are_decoded_once(auth, monkeypatch):
+    token = issue(auth, jti="t1")
+    first = auth.authenticate(token)
+    monkeypatch.setattr(auth, "verify_token", pytest.fail)
+
+    assert auth.authenticate(token) is first
+    assert auth.token_cache.stats()["hits"] == 1
+
+
+def test_cache_hits_still_check_revocation(auth):
+    token = issue(auth, jti="t1")
+    user = auth.authenticate(token)
+
+    assert auth.revoke_token(user)
+    with pytest.raises(HTTPException) as error:
+        auth.authenticate(token)
+    assert error.value.status_code == 401
+
+
+def test_revoke_user_drops_cached_tokens(auth):
+    token = issue(auth, gen=1)
+    auth.authenticate(token)
+
+    auth.revoke_user(7, generation=2)
+
+    assert len(auth.token_cache) == 0
+    with pytest.raises(HTTPException):
+        auth.authenticate(token)
+    assert auth.authenticate(issue(auth, gen=2)).token_version == 2
+
+
+def test_invalid_and_expired_tokens_are_not_cached(auth):
+    expired = auth.create_access_token({"sub": "john", "user_id": 7}, timedelta(seconds=-1))
+    for token in ("not-a-token", expired):
+        with pytest.raises(HTTPException):
+            auth.authenticate(token)
+    assert len(auth.token_cache) == 0
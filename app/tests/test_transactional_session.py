@@ -0,0 +1,64 @@
+"""get_transactional_session：以 scope="function" 声明时在响应前提交"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.dao import TaskDAO
+
+
+@pytest.fixture
+def app(db_manager):
+    app = FastAPI()
+
+    @app.post("/tasks")
+    def create_tasks(
+        session: Session = Depends(db_manager.get_transactional_session, scope="function"),
+    ):
+        dao = TaskDAO(session)
+        dao.add_line(title="a")
+        dao.add_line(title="b")
+        return {"ok": True}
+
+    @app.post("/fail")
+    def fail(
+        session: Session = Depends(db_manager.get_transactional_session, scope="function"),
+    ):
+        TaskDAO(session).add_line(title="rolled back")
+        raise RuntimeError("boom")
+
+    return app
+
+
+def count(db_manager):
+    with db_manager.ReadSessionLocal() as session:
+        return TaskDAO(session).count_where()
+
+
+def test_commits_once_before_the_response(app, db_manager):
+    commits = []
+    event.listen(db_manager.engine, "commit", lambda conn: commits.append(1))
+
+    with TestClient(app) as client:
+        assert client.post("/tasks").json() == {"ok": True}
+    assert len(commits) == 1
+    assert count(db_manager) == 2
+
+
+def test_commit_failure_reaches_the_client(app, db_manager):
+    def fail(connection):
+        raise RuntimeError("commit failed")
+
+    event.listen(db_manager.engine, "commit", fail)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        assert client.post("/tasks").status_code == 500
+    event.remove(db_manager.engine, "commit", fail)
+    assert count(db_manager) == 0
+
+
+def test_route_error_rolls_back(app, db_manager):
+    with TestClient(app, raise_server_exceptions=False) as client:
+        assert client.post("/fail").status_code == 500
+    assert count(db_manager) == 0
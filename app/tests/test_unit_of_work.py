@@ -0,0 +1,100 @@
+"""工作单元与集合式写操作"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from je_stack.crud import in_unit_of_work
+from je_stack.utils.database import create_async_database_engine
+from src.dao import AsyncTaskDAO, TaskDAO
+from src.dao.base import FormValidationError
+from src.orm import TaskModel
+
+
+def titles(db_manager):
+    with db_manager.ReadSessionLocal() as session:
+        return sorted(session.scalars(select(TaskModel.title)))
+
+
+def test_commits_once_at_the_end(db_manager, session):
+    commits = []
+    event.listen(db_manager.engine, "commit", lambda conn: commits.append(1))
+    dao = TaskDAO(session)
+
+    with dao.transaction():
+        assert in_unit_of_work(session)
+        task = dao.add_line(title="a")
+        dao.update_line(task.id, status="completed")
+        dao.add_lines([{"title": "b"}, {"title": "c"}])
+        assert commits == []
+
+    assert not in_unit_of_work(session)
+    assert len(commits) == 1
+    assert titles(db_manager) == ["a", "b", "c"]
+
+
+def test_exception_rolls_back_everything(db_manager, session):
+    dao = TaskDAO(session)
+    with pytest.raises(RuntimeError):
+        with dao.transaction():
+            dao.add_line(title="a")
+            dao.update_where({"title": "a"}, {"status": "completed"})
+            raise RuntimeError
+
+    assert titles(db_manager) == []
+    # 工作单元结束后恢复立即提交
+    dao.add_line(title="b")
+    assert titles(db_manager) == ["b"]
+
+
+def test_nested_scope_uses_savepoint(db_manager, session):
+    dao = TaskDAO(session)
+    with dao.transaction():
+        dao.add_line(title="outer")
+        with pytest.raises(ValueError):
+            with dao.transaction():
+                dao.add_line(title="inner")
+                raise ValueError
+        dao.add_line(title="after")
+
+    assert titles(db_manager) == ["after", "outer"]
+
+
+def test_cache_invalidated_after_unit_ends(session):
+    dao = TaskDAO(session)
+    task = dao.add_line(title="cached")
+    assert dao.get_line_by_id(task.id).title == "cached"
+
+    with dao.transaction():
+        dao.update_where({"id": task.id}, {"title": "changed"})
+
+    session.expire_all()
+    assert dao.get_line_by_id(task.id).title == "changed"
+
+
+def test_async_unit_of_work(db_manager):
+    engine = create_async_database_engine(
+        str(db_manager.engine.url).replace("sqlite://", "sqlite+aiosqlite://", 1)
+    )
+
+    async def main():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            dao = AsyncTaskDAO(session)
+            async with dao.transaction():
+                await dao.create_task("kept", creator_id=None)
+            with pytest.raises(RuntimeError):
+                async with dao.transaction():
+                    await dao.create_task("dropped", creator_id=None)
+                    raise RuntimeError
+            with pytest.raises(FormValidationError):
+                await dao.delete_where([])
+            return await dao.count_where()
+
+    try:
+        assert asyncio.run(main()) == 1
+    finally:
+        asyncio.run(engine.dispose())
+    with db_manager.ReadSessionLocal() as session:
+        assert session.scalar(select(func.count()).select_from(TaskModel)) == 1
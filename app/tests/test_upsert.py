@@ -0,0 +1,78 @@
+"""upsert（INSERT ... ON CONFLICT 与不支持时的逐行退化路径）"""
+
+import pytest
+from sqlalchemy import select
+
+from je_stack.crud import base
+from src.dao.base import BaseDAO
+from src.dao.user_dao import UserDAO
+from src.exc import AlreadyExistsError
+from src.orm import UserModel
+
+
+@pytest.fixture(params=["on_conflict", "fallback"])
+def dao(request, session, monkeypatch):
+    if request.param == "fallback":
+        monkeypatch.delitem(base._UPSERT_INSERTS, "sqlite")
+    return BaseDAO(session, UserModel)
+
+
+def user(username, nickname, **extra):
+    return {"username": username, "password": "hash", "nickname": nickname, **extra}
+
+
+def users(db_manager):
+    with db_manager.ReadSessionLocal() as session:
+        return {
+            u.username: (u.id, u.nickname, u.updated_at)
+            for u in session.scalars(select(UserModel))
+        }
+
+
+def test_inserts_and_updates(db_manager, dao):
+    [john] = dao.upsert(user("john", "J"), ["username"])
+    before = users(db_manager)
+
+    ids = dao.upsert([user("john", "Johnny"), user("amy", "A")], ["username"])
+
+    after = users(db_manager)
+    assert ids[0] == john and len(ids) == 2
+    assert after["john"][:2] == (john, "Johnny")
+    assert after["amy"][1] == "A"
+    # 冲突更新时应用 onupdate
+    assert after["john"][2] > before["john"][2]
+
+
+def test_only_listed_columns_are_updated(db_manager, dao):
+    dao.upsert(user("john", "J", full_name="John"), ["username"])
+
+    dao.upsert(user("john", "Johnny", full_name="Changed"), ["username"], ["nickname"])
+
+    with db_manager.ReadSessionLocal() as session:
+        john = session.scalars(select(UserModel)).one()
+        assert (john.nickname, john.full_name) == ("Johnny", "John")
+
+
+def test_do_nothing_skips_conflicts(db_manager, dao):
+    [john] = dao.upsert(user("john", "J"), ["username"], [])
+
+    ids = dao.upsert([user("john", "other"), user("amy", "A")], ["username"], [])
+
+    assert john not in ids and len(ids) == 1
+    assert users(db_manager)["john"][1] == "J"
+
+
+def test_invalid_arguments(dao):
+    with pytest.raises(ValueError):
+        dao.upsert(user("john", "J"), [])
+    with pytest.raises(ValueError):
+        dao.upsert(user("john", "J"), ["username"], batch_size=0)
+
+
+def test_add_user_rejects_duplicate_usernames(session):
+    dao = UserDAO(session)
+    user_id = dao.add_user("john", "hash", "J")
+
+    with pytest.raises(AlreadyExistsError):
+        dao.add_user("john", "hash", "Other")
+    assert dao.get_line_by_id(user_id).nickname == "J"
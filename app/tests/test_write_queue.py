@@ -0,0 +1,139 @@
+"""WriteQueue 组提交"""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import event, func, select, text
+from sqlalchemy.exc import IntegrityError
+
+from src.dao import TaskDAO, UserDAO
+from src.exc import AlreadyExistsError
+from src.orm import TaskModel, UserModel
+
+
+def add_user(session, username):
+    return UserDAO(session).add_user(username, "hashed", username)
+
+
+def add_task(session, title, creator_id=None):
+    return TaskDAO(session).add_line(title=title, creator_id=creator_id)
+
+
+def count(db_manager, model):
+    with db_manager.ReadSessionLocal() as session:
+        return session.scalar(select(func.count()).select_from(model))
+
+
+def test_run_returns_committed_result(db_manager):
+    with db_manager.create_write_queue() as queue:
+        task = queue.run(add_task, "write docs")
+
+    # 提交后已脱离 Session，属性可以直接读取
+    assert task.id is not None
+    assert task.title == "write docs"
+    assert count(db_manager, TaskModel) == 1
+
+
+def test_concurrent_writes_share_commits(db_manager):
+    commits = []
+    event.listen(db_manager.engine, "commit", lambda conn: commits.append(1))
+    results = []
+
+    with db_manager.create_write_queue(max_delay=0.01) as queue:
+
+        def worker(k):
+            for i in range(20):
+                results.append(queue.run(add_task, f"t{k}-{i}"))
+
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(results) == 160
+    assert count(db_manager, TaskModel) == 160
+    assert len(commits) < 160
+
+
+def test_failed_write_does_not_affect_batch(db_manager):
+    def duplicate(session):
+        add_user(session, "taken")
+
+    def raises(session):
+        add_task(session, "rolled back")
+        raise ValueError("boom")
+
+    with db_manager.create_write_queue(max_delay=0.05) as queue:
+        queue.run(add_user, "taken")
+        futures = [
+            queue.submit(add_task, "before"),
+            queue.submit(duplicate),
+            queue.submit(raises),
+            queue.submit(add_task, "after"),
+        ]
+        first, dup, boom, last = futures
+
+        assert first.result().title == "before"
+        assert last.result().title == "after"
+        with pytest.raises(AlreadyExistsError):
+            dup.result()
+        with pytest.raises(ValueError, match="boom"):
+            boom.result()
+
+    with db_manager.ReadSessionLocal() as session:
+        titles = set(session.scalars(select(TaskModel.title)))
+        users = session.scalar(select(func.count()).select_from(UserModel))
+    assert titles == {"before", "after"}
+    assert users == 1
+
+
+def test_constraint_violation_is_isolated(db_manager):
+    # 外键错误在 flush 时才出现，整批回滚后逐个在 SAVEPOINT 中重新执行
+    with db_manager.create_write_queue(max_delay=0.05) as queue:
+        ok = queue.submit(add_task, "ok")
+        bad = queue.submit(add_task, "bad", creator_id=999)
+        with pytest.raises(IntegrityError):
+            bad.result()
+        assert ok.result().title == "ok"
+
+    with db_manager.ReadSessionLocal() as session:
+        titles = list(session.scalars(select(TaskModel.title)))
+    assert titles == ["ok"]
+
+
+def test_closed_queue_rejects_writes(db_manager):
+    queue = db_manager.create_write_queue()
+    queue.close()
+    with pytest.raises(RuntimeError):
+        queue.submit(add_task, "late")
+
+
+def test_arun(db_manager):
+    async def main():
+        with db_manager.create_write_queue() as queue:
+            return await asyncio.gather(*(queue.arun(add_task, f"a{i}") for i in range(5)))
+
+    tasks = asyncio.run(main())
+    assert sorted(task.title for task in tasks) == [f"a{i}" for i in range(5)]
+
+
+def test_sqlite_raw_statement_errors_are_isolated(db_manager):
+    def raw_duplicate(session):
+        session.execute(
+            text(
+                "INSERT INTO users (username, password, nickname, role, is_active, "
+                "created_at, updated_at) VALUES ('dup', 'x', 'x', 'guest', 1, "
+                "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            )
+        )
+
+    with db_manager.create_write_queue(max_delay=0.05) as queue:
+        queue.run(raw_duplicate)
+        futures = [queue.submit(raw_duplicate), queue.submit(add_user, "other")]
+        with pytest.raises(IntegrityError):
+            futures[0].result()
+        assert futures[1].result()
+
+    assert count(db_manager, UserModel) == 2
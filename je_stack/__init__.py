@@ -18,11 +18,21 @@ from .auth import (
     create_token_for_user,
     hash_password,
     verify_password,
+    ahash_password,
+    averify_password,
     check_user_permission,
+    AuthenticationMiddleware,
+    requires,
 )
 from .crud import BaseDAO, FormValidationError
 from .schemas import UserRole, StandardResponse
-from .utils import setup_logger, get_db_session, create_database_engine
+from .utils import (
+    setup_logger,
+    get_db_session,
+    create_database_engine,
+    get_async_db_session,
+    create_async_database_engine,
+)
 
 __all__ = [
     "__version__",
@@ -36,7 +46,11 @@ __all__ = [
     "create_token_for_user",
     "hash_password",
     "verify_password",
+    "ahash_password",
+    "averify_password",
     "check_user_permission",
+    "AuthenticationMiddleware",
+    "requires",
     # CRUD
     "BaseDAO",
     "FormValidationError",
@@ -47,4 +61,13 @@ __all__ = [
     "setup_logger",
     "get_db_session",
     "create_database_engine",
+    "get_async_db_session",
+    "create_async_database_engine",
 ]
+
+
+def __getattr__(name):
+    # 异步 DAO 需要安装 je-stack[async]，按需导入（见 je_stack.crud）
+    if name == "AsyncBaseDAO":
+        return crud.AsyncBaseDAO
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,8 +9,27 @@ from .jwt_auth import (
     hash_password,
     verify_password,
     check_user_permission,
+    compile_permission_check,
 )
-from .password import pwd_context
+from .asgi import (
+    AuthenticationMiddleware,
+    AuthRoute,
+    get_request_user,
+    requires,
+)
+from .password import (
+    pwd_context,
+    build_password_context,
+    password_context_from_env,
+    ahash_password,
+    averify_password,
+    password_pool,
+    PasswordHasherPool,
+    PasswordPoolBusyError,
+)
+from .rate_limit import RateLimiter, RequestRateLimit, too_many_requests
+from .revocation import RevocationList
+from .token_cache import TokenCache
 
 __all__ = [
     "AuthMiddlewareTool",
@@ -19,5 +38,22 @@ __all__ = [
     "hash_password",
     "verify_password",
     "check_user_permission",
+    "compile_permission_check",
+    "AuthenticationMiddleware",
+    "AuthRoute",
+    "get_request_user",
+    "requires",
     "pwd_context",
+    "build_password_context",
+    "password_context_from_env",
+    "ahash_password",
+    "averify_password",
+    "password_pool",
+    "PasswordHasherPool",
+    "PasswordPoolBusyError",
+    "RateLimiter",
+    "RequestRateLimit",
+    "too_many_requests",
+    "RevocationList",
+    "TokenCache",
 ]
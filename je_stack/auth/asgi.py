@@ -0,0 +1,144 @@
+"""
+纯 ASGI 认证中间件
+
+check_user_permission 以 FastAPI 依赖链的方式工作：每个请求都要解析
+HTTPBearer → get_current_user → 权限检查三层依赖（参数解析、签名检查、
+同步依赖放到线程池执行）。AuthenticationMiddleware 在路由之前直接从 ASGI
+scope 中读取 Authorization 头，只验证一次 Token，把 CurrentUser 放到
+request.state.current_user；路由用 @requires 声明权限，由 AuthRoute 在调用
+处理函数前做一次位运算检查，不再经过依赖注入。
+
+Example:
+    >>> app = FastAPI()
+    >>> app.add_middleware(AuthenticationMiddleware, auth=auth_middleware)
+    >>> router = APIRouter(route_class=AuthRoute)
+    >>>
+    >>> @router.delete("/users/{user_id}")
+    >>> @requires(permission="manage_users")  # 写在路由装饰器下面
+    >>> def delete_user(user_id: int, request: Request):
+    ...     current_user = get_request_user(request)
+"""
+
+from typing import Any, Awaitable, Callable, Dict, MutableMapping, Optional, TypeVar
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+
+from .jwt_auth import AuthMiddlewareTool, CurrentUser, auth_middleware, compile_permission_check
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+Scope = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+Send = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+# 路由处理函数上保存编译后检查函数的属性名
+_REQUIREMENT_ATTR = "__je_stack_auth_check__"
+
+# request.state 中的键
+STATE_USER = "current_user"
+STATE_AUTH_ERROR = "auth_error"
+
+
+class AuthenticationMiddleware:
+    """纯 ASGI 认证中间件
+
+    不拒绝任何请求：没有 Token 或 Token 无效时 current_user 为 None（无效原因
+    保存在 request.state.auth_error），由需要登录的路由返回 401，公开路由不受影响
+    """
+
+    def __init__(self, app: ASGIApp, auth: AuthMiddlewareTool = auth_middleware):
+        """初始化中间件
+
+        Args:
+            app: 下游 ASGI 应用
+            auth: 用于验证 Token 的认证工具（共享其 Token 缓存）
+        """
+        self.app = app
+        self.auth = auth
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            # Starlette 的 request.state 即 scope["state"]；复制一份，避免写入
+            # 服务器在请求之间共享的 lifespan state
+            state: Dict[str, Any] = dict(scope.get("state") or {})
+            state[STATE_USER] = None
+            state[STATE_AUTH_ERROR] = None
+            scope["state"] = state
+            token = _bearer_token(scope)
+            if token is not None:
+                try:
+                    state[STATE_USER] = self.auth.authenticate(token)
+                except HTTPException as e:
+                    state[STATE_AUTH_ERROR] = e.detail
+        await self.app(scope, receive, send)
+
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    """从 scope 的请求头中取出 Bearer Token"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token.strip()
+            return None
+    return None
+
+
+def get_request_user(request: Request) -> CurrentUser:
+    """获取 AuthenticationMiddleware 验证的当前用户
+
+    Raises:
+        HTTPException: 未登录或 Token 无效（401）
+    """
+    state = request.scope.get("state") or {}
+    current_user = state.get(STATE_USER)
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=state.get(STATE_AUTH_ERROR) or "未提供认证信息",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return current_user
+
+
+def requires(
+    permission: Optional[str] = None, role: Optional[str] = None
+) -> Callable[[F], F]:
+    """声明路由需要的登录 / 权限 / 角色（参数同 check_user_permission）
+
+    只在函数上记录编译后的检查函数，由 AuthRoute 执行。必须写在路由装饰器
+    下面，使路由注册时能读取到
+
+    Raises:
+        ValueError: 同时指定 permission 和 role，或权限名不存在
+    """
+    check = compile_permission_check(permission=permission, role=role)
+
+    def decorator(func: F) -> F:
+        setattr(func, _REQUIREMENT_ATTR, check)
+        return func
+
+    return decorator
+
+
+class AuthRoute(APIRoute):
+    """执行 @requires 声明的路由（APIRouter(route_class=AuthRoute)）
+
+    没有 @requires 的路由与 APIRoute 完全相同
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        handler = super().get_route_handler()
+        check: Optional[Callable[[CurrentUser], None]] = getattr(
+            self.endpoint, _REQUIREMENT_ATTR, None
+        )
+        if check is None:
+            return handler
+
+        async def authorized_handler(request: Request) -> Response:
+            check(get_request_user(request))
+            return await handler(request)
+
+        return authorized_handler
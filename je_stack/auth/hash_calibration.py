@@ -0,0 +1,173 @@
+"""
+密码哈希参数校准
+
+在部署机器上测量不同参数下单次哈希的耗时，选出不超过目标耗时的最高强度参数，
+输出对应的 PASSWORD_* 环境变量（见 je_stack.auth.password）。
+
+单次哈希耗时决定了登录的 CPU 成本：PasswordHasherPool 的每个工作线程每秒
+最多处理 1000 / 耗时(ms) 次登录，校准时应同时考虑目标延迟和登录吞吐量。
+
+用法:
+    python -m je_stack.auth.hash_calibration [--scheme bcrypt|argon2|all] [--target-ms 250]
+"""
+
+import os
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from passlib.hash import argon2, bcrypt
+
+from .password import argon2_available
+
+# 校准用的密码（长度接近真实密码即可）
+_SAMPLE_PASSWORD = "calibration-Passw0rd!"
+
+
+def measure_hash_ms(handler: Any, samples: int = 3) -> float:
+    """测量 passlib 哈希处理器单次哈希的耗时（毫秒，取中位数）"""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash(_SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(
+    target_ms: float = 250,
+    min_rounds: int = 10,
+    max_rounds: int = 16,
+    samples: int = 3,
+) -> Dict[str, Any]:
+    """选出单次哈希不超过 target_ms 的最大 bcrypt 轮数
+
+    轮数每加 1 耗时翻倍，超过目标后不再继续测量
+
+    Args:
+        target_ms: 目标耗时（毫秒）
+        min_rounds: 最小轮数（即使超过目标耗时也不会更低）
+        max_rounds: 最大轮数
+        samples: 每个参数测量的次数
+
+    Returns:
+        {"scheme", "params", "ms", "env", "measurements"}
+    """
+    measurements: List[Dict[str, Any]] = []
+    for rounds in range(min_rounds, max_rounds + 1):
+        ms = measure_hash_ms(bcrypt.using(rounds=rounds), samples)
+        measurements.append({"params": {"rounds": rounds}, "ms": ms})
+        if ms >= target_ms:
+            break
+    best = _pick(measurements, target_ms)
+    return {
+        "scheme": "bcrypt",
+        "params": best["params"],
+        "ms": best["ms"],
+        "env": {
+            "PASSWORD_SCHEME": "bcrypt",
+            "PASSWORD_BCRYPT_ROUNDS": str(best["params"]["rounds"]),
+        },
+        "measurements": measurements,
+    }
+
+
+def calibrate_argon2(
+    target_ms: float = 250,
+    memory_cost: int = 64 * 1024,
+    parallelism: Optional[int] = None,
+    max_time_cost: int = 10,
+    samples: int = 3,
+) -> Dict[str, Any]:
+    """固定内存和并行度，选出单次哈希不超过 target_ms 的最大 argon2 迭代次数
+
+    Args:
+        target_ms: 目标耗时（毫秒）
+        memory_cost: 内存（KiB），默认 64 MiB；每个并发计算都会占用这么多内存
+        parallelism: 并行度，默认为 CPU 核数（最多 4）
+        max_time_cost: 最大迭代次数
+        samples: 每个参数测量的次数
+
+    Returns:
+        {"scheme", "params", "ms", "env", "measurements"}
+
+    Raises:
+        RuntimeError: 没有安装 argon2-cffi
+    """
+    if not argon2_available():
+        raise RuntimeError("校准 argon2 需要安装 argon2-cffi")
+    parallelism = parallelism or min(4, os.cpu_count() or 1)
+
+    measurements: List[Dict[str, Any]] = []
+    for time_cost in range(1, max_time_cost + 1):
+        params = {
+            "time_cost": time_cost,
+            "memory_cost": memory_cost,
+            "parallelism": parallelism,
+        }
+        ms = measure_hash_ms(argon2.using(**params), samples)
+        measurements.append({"params": params, "ms": ms})
+        if ms >= target_ms:
+            break
+    best = _pick(measurements, target_ms)
+    return {
+        "scheme": "argon2",
+        "params": best["params"],
+        "ms": best["ms"],
+        "env": {
+            "PASSWORD_SCHEME": "argon2",
+            "PASSWORD_ARGON2_TIME_COST": str(best["params"]["time_cost"]),
+            "PASSWORD_ARGON2_MEMORY_COST": str(best["params"]["memory_cost"]),
+            "PASSWORD_ARGON2_PARALLELISM": str(best["params"]["parallelism"]),
+        },
+        "measurements": measurements,
+    }
+
+
+def _pick(measurements: List[Dict[str, Any]], target_ms: float) -> Dict[str, Any]:
+    """不超过目标耗时的最后一个（强度最高的）参数；都超过时取第一个"""
+    within = [m for m in measurements if m["ms"] <= target_ms]
+    return within[-1] if within else measurements[0]
+
+
+def main():
+    """命令行入口：python -m je_stack.auth.hash_calibration"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="校准密码哈希参数")
+    parser.add_argument(
+        "--scheme", choices=["bcrypt", "argon2", "all"], default="all", help="要校准的算法"
+    )
+    parser.add_argument("--target-ms", type=float, default=250, help="单次哈希的目标耗时（毫秒）")
+    parser.add_argument("--samples", type=int, default=3, help="每个参数的测量次数")
+    parser.add_argument(
+        "--argon2-memory-kib", type=int, default=64 * 1024, help="argon2 内存（KiB）"
+    )
+    args = parser.parse_args()
+
+    results = []
+    if args.scheme in ("bcrypt", "all"):
+        results.append(calibrate_bcrypt(args.target_ms, samples=args.samples))
+    if args.scheme in ("argon2", "all"):
+        if argon2_available():
+            results.append(
+                calibrate_argon2(
+                    args.target_ms, memory_cost=args.argon2_memory_kib, samples=args.samples
+                )
+            )
+        else:
+            print("跳过 argon2：没有安装 argon2-cffi")
+
+    for result in results:
+        print(f"\n{result['scheme']} (目标 {args.target_ms:g} ms)")
+        for m in result["measurements"]:
+            params = ", ".join(f"{k}={v}" for k, v in m["params"].items())
+            mark = "  <- 推荐" if m["params"] == result["params"] else ""
+            print(f"  {params:<48}{m['ms']:>9.1f} ms{mark}")
+        print(f"  每个工作线程约 {1000 / result['ms']:.1f} 次登录/秒")
+        for name, value in result["env"].items():
+            print(f"  {name}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ JWT 认证中间件
 """
 
 import os
+import secrets
 import jwt
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, Callable
@@ -10,7 +11,10 @@ from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 
+from ..schemas import UserRole
 from .password import pwd_context
+from .revocation import RevocationList
+from .token_cache import TokenCache
 
 # JWT配置
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your_jwt_secret_key_change_me_in_production")
@@ -30,6 +34,9 @@ class CurrentUser(BaseModel):
     role: Optional[str] = None
     is_active: bool = True
     full_name: Optional[str] = None
+    # Token 的 jti 和 gen 声明，用于吊销检查
+    token_id: Optional[str] = None
+    token_version: int = 0
     exp: datetime
 
 
@@ -41,10 +48,25 @@ class AuthMiddlewareTool:
         secret_key: Optional[str] = None,
         algorithm: str = ALGORITHM,
         expire_days: int = ACCESS_TOKEN_EXPIRE_DAYS,
+        token_cache_size: int = 10_000,
+        revocations: Optional[RevocationList] = None,
     ):
+        """初始化认证中间件
+
+        Args:
+            secret_key: 签名密钥，默认读取环境变量 JWT_SECRET_KEY
+            algorithm: 签名算法
+            expire_days: Token 有效天数
+            token_cache_size: 已验证 Token 缓存的容量，0 表示不缓存
+            revocations: Token 吊销表，默认创建一个空的吊销表
+        """
         self.secret_key = secret_key or SECRET_KEY
         self.algorithm = algorithm
         self.expire_days = expire_days
+        # 同一个 Token 在有效期内只验证一次，之后直接返回缓存的 CurrentUser
+        self.token_cache = TokenCache(token_cache_size) if token_cache_size else None
+        # 每个请求（包括缓存命中）都检查吊销表，不查询数据库
+        self.revocations = revocations if revocations is not None else RevocationList()
 
     def create_access_token(
         self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None
@@ -124,7 +146,28 @@ class AuthMiddlewareTool:
         Raises:
             HTTPException: token 无效或用户信息不完整
         """
-        token = credentials.credentials
+        return self.authenticate(credentials.credentials)
+
+    def authenticate(self, token: str) -> CurrentUser:
+        """验证 Token 并返回当前用户信息
+
+        验证通过的 Token 会缓存到过期为止，之后的请求直接返回缓存的
+        CurrentUser（多个请求共享同一个对象，不要修改）
+
+        Args:
+            token: Bearer Token 原文
+
+        Returns:
+            CurrentUser 对象
+
+        Raises:
+            HTTPException: token 无效、已被吊销或用户信息不完整
+        """
+        if self.token_cache is not None:
+            cached = self.token_cache.get(token)
+            if cached is not None:
+                self.check_revoked(cached)
+                return cached
         payload = self.verify_token(token)
 
         username = payload.get("sub")
@@ -135,15 +178,56 @@ class AuthMiddlewareTool:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return CurrentUser(
+        current_user = CurrentUser(
             username=username,
             user_id=payload.get("user_id"),  # type: ignore
             nickname=payload.get("nickname"),
             role=payload.get("role"),
             is_active=payload.get("is_active", True),
             full_name=payload.get("full_name"),
+            token_id=payload.get("jti"),
+            token_version=payload.get("gen", 0),
             exp=payload.get("exp"),  # type: ignore
         )
+        self.check_revoked(current_user)
+        exp = payload.get("exp")
+        if self.token_cache is not None and isinstance(exp, (int, float)):
+            self.token_cache.put(token, current_user, exp, user_id=current_user.user_id)
+        return current_user
+
+    def check_revoked(self, current_user: CurrentUser) -> None:
+        """检查 Token 是否已被吊销
+
+        Raises:
+            HTTPException: Token 已被吊销（401）
+        """
+        if self.revocations.is_revoked(
+            current_user.user_id, current_user.token_version, current_user.token_id
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token已失效，请重新登录",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+    def revoke_user(self, user_id: int, generation: int) -> None:
+        """使用户版本低于 generation 的 Token 失效（只影响当前进程）
+
+        Args:
+            user_id: 用户ID
+            generation: 用户新的 token_version
+        """
+        expires_at = datetime.now(timezone.utc) + timedelta(days=self.expire_days)
+        self.revocations.revoke_user(user_id, generation, expires_at.timestamp())
+        if self.token_cache is not None:
+            self.token_cache.invalidate_user(user_id)
+
+    def revoke_token(self, current_user: CurrentUser) -> bool:
+        """吊销单个 Token（只影响当前进程），Token 没有 jti 时返回 False"""
+        if current_user.token_id is None:
+            return False
+        self.revocations.revoke_token(current_user.token_id, current_user.exp.timestamp())
+        return True
 
 
 # 创建全局认证中间件实例
@@ -157,6 +241,7 @@ def create_token_for_user(
     role: Optional[str] = None,
     is_active: bool = True,
     full_name: Optional[str] = None,
+    token_version: int = 0,
 ) -> str:
     """为用户创建令牌
 
@@ -167,6 +252,7 @@ def create_token_for_user(
         role: 角色
         is_active: 是否激活
         full_name: 全名
+        token_version: 用户当前的 Token 版本（吊销检查使用）
 
     Returns:
         JWT token 字符串
@@ -186,6 +272,9 @@ def create_token_for_user(
         "role": role,
         "is_active": is_active,
         "full_name": full_name,
+        # Token 版本和唯一 ID，用于吊销
+        "gen": token_version or None,
+        "jti": secrets.token_urlsafe(12),
     }
     # 移除 None 值，减少 token 大小
     token_data = {k: v for k, v in token_data.items() if v is not None}
@@ -257,56 +346,75 @@ def check_user_permission(
         - 当 permission 不为 None 时，检查用户是否有指定权限
         - 当 role 不为 None 时，检查用户是否有指定角色
         - 不能同时指定 permission 和 role
-        - 需要配合 UserRole 枚举使用（在 schemas 模块中）
+        - 权限名在调用时编译为 UserRole 权限位掩码，不存在的权限名会抛出 ValueError
     """
-    if permission is not None and role is not None:
-        raise ValueError("不能同时指定 permission 和 role")
+    # 在定义路由时编译一次，请求中只做位运算
+    check = compile_permission_check(permission=permission, role=role)
+    get_current_user = auth_middleware.get_current_user
 
     def auth_checker(
-        current_user: CurrentUser = Depends(auth_middleware.get_current_user),
+        current_user: CurrentUser = Depends(get_current_user),
     ) -> CurrentUser:
-        """统一的权限检查器"""
-        # 动态导入，避免循环依赖
-        try:
-            from je_stack.schemas import UserRole
-        except ImportError:
-            # 如果没有安装 schemas 模块，则跳过权限检查
-            if permission or role:
-                raise ImportError(
-                    "需要安装 je_stack.schemas 模块才能使用权限检查功能"
-                )
-            return current_user
+        """检查用户激活状态和权限 / 角色"""
+        check(current_user)
+        return current_user
+
+    return auth_checker
+
+
+def compile_permission_check(
+    permission: Optional[str] = None, role: Optional[str] = None
+) -> Callable[[CurrentUser], None]:
+    """把权限 / 角色要求编译为检查函数（check_user_permission 和 requires 共用）
+
+    Args:
+        permission: 需要的权限字符串
+        role: 需要的角色
 
-        # 检查用户是否激活
+    Returns:
+        check(current_user)，不满足要求时抛出 HTTPException(403)
+
+    Raises:
+        ValueError: 同时指定 permission 和 role，或权限名不存在
+    """
+    if permission is not None and role is not None:
+        raise ValueError("不能同时指定 permission 和 role")
+
+    required_mask = UserRole.permission_mask(permission) if permission is not None else 0
+
+    def check_active(current_user: CurrentUser) -> None:
         if not current_user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="账户已被禁用"
             )
 
-        # 如果没有指定权限和角色，放行
-        if permission is None and role is None:
-            return current_user
-
-        # 超级管理员拥有所有权限，放行
-        if current_user.role == UserRole.SUPER_ADMIN:
-            return current_user
+    if permission is not None:
 
-        # 有权限要求，检查权限
-        if permission is not None:
-            if not UserRole.can_access(current_user.role or "guest", permission):
+        def check_permission(current_user: CurrentUser) -> None:
+            """检查用户激活状态和权限位（超级管理员的掩码包含所有权限）"""
+            check_active(current_user)
+            # 每次按角色查当前的掩码表（不信任 Token 中签发时的权限），修改
+            # 角色权限后对已签发的 Token 立即生效
+            mask = UserRole.role_mask(current_user.role or UserRole.GUEST)
+            if mask & required_mask != required_mask:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"权限不足，需要权限: {permission}",
                 )
 
-        # 有角色要求，检查角色
-        if role is not None:
-            if current_user.role != role:
+        return check_permission
+
+    if role is not None:
+
+        def check_role(current_user: CurrentUser) -> None:
+            """检查用户激活状态和角色（超级管理员放行）"""
+            check_active(current_user)
+            if current_user.role != role and current_user.role != UserRole.SUPER_ADMIN:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"权限不足，需要角色: {role}",
                 )
 
-        return current_user
+        return check_role
 
-    return auth_checker
+    return check_active
@@ -1,11 +1,114 @@
 """
 密码加密工具
+
+哈希算法和参数通过环境变量配置（用 python -m je_stack.auth.hash_calibration
+在部署机器上测出合适的参数）：
+    - PASSWORD_SCHEME: bcrypt（默认）或 argon2（需要安装 argon2-cffi）
+    - PASSWORD_BCRYPT_ROUNDS: bcrypt 轮数（log2），默认使用 passlib 的默认值
+    - PASSWORD_ARGON2_TIME_COST / PASSWORD_ARGON2_MEMORY_COST（KiB）/
+      PASSWORD_ARGON2_PARALLELISM: argon2 参数
+
+旧算法或参数低于当前配置的哈希依然可以验证，登录成功后由
+PasswordHasherPool.schedule_rehash 在后台按当前参数重新哈希。
 """
 
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from loguru import logger
 from passlib.context import CryptContext
 
+from ..utils.histogram import Histogram, LATENCY_BUCKETS_MS
+
+T = TypeVar("T")
+
+PASSWORD_SCHEMES = ("bcrypt", "argon2")
+
+
+def argon2_available() -> bool:
+    """是否安装了 argon2 后端（argon2-cffi）"""
+    return importlib.util.find_spec("argon2") is not None
+
+
+def build_password_context(
+    scheme: str = "bcrypt",
+    bcrypt_rounds: Optional[int] = None,
+    argon2_time_cost: Optional[int] = None,
+    argon2_memory_cost: Optional[int] = None,
+    argon2_parallelism: Optional[int] = None,
+) -> CryptContext:
+    """构造密码哈希上下文
+
+    scheme 用于新哈希，其他算法只用于验证旧哈希（needs_update 为 True）。
+    bcrypt 轮数同时作为最低和最高轮数，轮数不同的旧哈希都需要更新（调低轮数
+    以降低登录 CPU 成本时，已有的高轮数哈希也会在登录时重新哈希）
+
+    Args:
+        scheme: 新哈希使用的算法，bcrypt 或 argon2
+        bcrypt_rounds: bcrypt 轮数（log2），None 时使用 passlib 默认值
+        argon2_time_cost: argon2 迭代次数
+        argon2_memory_cost: argon2 内存（KiB）
+        argon2_parallelism: argon2 并行度
+
+    Returns:
+        CryptContext
+
+    Raises:
+        ValueError: 不支持的算法，或选择 argon2 但没有安装 argon2-cffi
+
+    Example:
+        >>> context = build_password_context("bcrypt", bcrypt_rounds=13)
+        >>> context.needs_update(hash_with_12_rounds)
+        True
+    """
+    if scheme not in PASSWORD_SCHEMES:
+        raise ValueError(f"不支持的密码哈希算法: {scheme}")
+    if scheme == "argon2" and not argon2_available():
+        raise ValueError("使用 argon2 需要安装 argon2-cffi")
+
+    schemes = [scheme] + [
+        other
+        for other in PASSWORD_SCHEMES
+        if other != scheme and (other != "argon2" or argon2_available())
+    ]
+    settings: Dict[str, Any] = {}
+    if bcrypt_rounds is not None:
+        settings["bcrypt__default_rounds"] = bcrypt_rounds
+        settings["bcrypt__min_rounds"] = bcrypt_rounds
+        settings["bcrypt__max_rounds"] = bcrypt_rounds
+    for name, value in (
+        ("time_cost", argon2_time_cost),
+        ("memory_cost", argon2_memory_cost),
+        ("parallelism", argon2_parallelism),
+    ):
+        if value is not None:
+            settings[f"argon2__{name}"] = value
+    return CryptContext(schemes=schemes, deprecated="auto", **settings)
+
+
+def password_context_from_env() -> CryptContext:
+    """按环境变量 PASSWORD_* 构造密码哈希上下文（见模块说明）"""
+
+    def env_int(name: str) -> Optional[int]:
+        value = os.getenv(name)
+        return int(value) if value else None
+
+    return build_password_context(
+        scheme=os.getenv("PASSWORD_SCHEME", "bcrypt"),
+        bcrypt_rounds=env_int("PASSWORD_BCRYPT_ROUNDS"),
+        argon2_time_cost=env_int("PASSWORD_ARGON2_TIME_COST"),
+        argon2_memory_cost=env_int("PASSWORD_ARGON2_MEMORY_COST"),
+        argon2_parallelism=env_int("PASSWORD_ARGON2_PARALLELISM"),
+    )
+
+
 # 密码加密上下文
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = password_context_from_env()
 
 
 def hash_password(password: str) -> str:
@@ -16,3 +119,200 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码"""
     return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordPoolBusyError(RuntimeError):
+    """密码哈希线程池排队已满（应返回 503，让客户端稍后重试）"""
+
+
+class PasswordHasherPool:
+    """密码哈希线程池
+
+    bcrypt 每次哈希 / 验证需要 100~300ms CPU，在 async 路由中直接调用会阻塞
+    事件循环，期间所有其他请求都无法处理。线程池把计算移出事件循环
+    （bcrypt 计算时释放 GIL，多个线程可以并行），并限制：
+        - max_workers: 同时计算的数量，避免登录高峰占满所有 CPU
+        - max_queue: 等待计算的数量，超出时立即抛出 PasswordPoolBusyError，
+          而不是让请求无限排队直到超时
+
+    Example:
+        >>> pool = PasswordHasherPool(max_workers=2)
+        >>> hashed = await pool.hash("secret")
+        >>> await pool.verify("secret", hashed)
+        True
+        >>> pool.stats()["queued"]
+        0
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: int = 64,
+        context: CryptContext = pwd_context,
+    ):
+        """初始化线程池（线程在第一次使用时创建）
+
+        Args:
+            max_workers: 最大并发计算数，默认为 CPU 核数的一半（至少 1）
+            max_queue: 最多排队等待的任务数
+            context: passlib CryptContext
+        """
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.max_queue = max_queue
+        self.context = context
+        self.wait_latency = Histogram(LATENCY_BUCKETS_MS)
+        self.run_latency = Histogram(LATENCY_BUCKETS_MS)
+        self.queued = 0
+        self.peak_queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    async def hash(self, password: str) -> str:
+        """哈希密码（在线程池中计算）"""
+        return await asyncio.wrap_future(self.submit(self.context.hash, password))
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """验证密码（在线程池中计算）"""
+        return await asyncio.wrap_future(
+            self.submit(self.context.verify, plain_password, hashed_password)
+        )
+
+    def schedule_rehash(
+        self,
+        plain_password: str,
+        hashed_password: str,
+        save: Callable[[str], Any],
+    ) -> "Optional[Future[Any]]":
+        """密码验证通过后，在后台按当前算法和参数重新哈希过期的哈希
+
+        Args:
+            plain_password: 已验证通过的明文密码
+            hashed_password: 数据库中的旧哈希
+            save: 保存新哈希的函数（在线程池中调用）
+
+        Returns:
+            后台任务的 Future；哈希不需要更新，或线程池繁忙（下次登录再更新）时为 None
+        """
+        if not self.context.needs_update(hashed_password):
+            return None
+        try:
+            future = self.submit(self._rehash, plain_password, save)
+        except PasswordPoolBusyError:
+            return None
+        future.add_done_callback(_log_rehash_error)
+        return future
+
+    def _rehash(self, plain_password: str, save: Callable[[str], Any]) -> Any:
+        return save(self.context.hash(plain_password))
+
+    def submit(self, func: Callable[..., T], *args: Any) -> "Future[T]":
+        """提交计算任务
+
+        Raises:
+            PasswordPoolBusyError: 排队的任务数已达到 max_queue
+        """
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise PasswordPoolBusyError(
+                    f"密码计算排队已满（{self.max_queue}），请稍后重试"
+                )
+            self.queued += 1
+            if self.queued > self.peak_queued:
+                self.peak_queued = self.queued
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="je-stack-password"
+                )
+            executor = self._executor
+        try:
+            future = executor.submit(self._run, func, args, time.perf_counter())
+        except BaseException:
+            self._release_queued()
+            raise
+        # 等待方被取消（客户端断开、超时、关闭）时 Future 在开始执行前被取消，
+        # _run 不会执行，需要在这里归还排队名额
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: "Future[Any]") -> None:
+        if future.cancelled():
+            self._release_queued()
+
+    def _release_queued(self) -> None:
+        with self._lock:
+            self.queued -= 1
+
+    def _run(self, func: Callable[..., T], args: tuple, submitted: float) -> T:
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_latency.observe((started - submitted) * 1000)
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.run_latency.observe((finished - started) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        """指标快照：排队 / 计算中的任务数、拒绝次数、排队和计算耗时直方图"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "peak_queued": self.peak_queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_ms": self.wait_latency.snapshot(),
+                "run_ms": self.run_latency.snapshot(),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭线程池（应用关闭时调用，之后再使用会重新创建）"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def _log_rehash_error(future: "Future[Any]") -> None:
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.warning(f"重新哈希密码失败: {error}")
+
+
+# 全局密码哈希线程池：并发数和排队上限由 PASSWORD_HASH_WORKERS（0 表示默认值）
+# 和 PASSWORD_HASH_QUEUE 配置，登录高峰时超出排队上限的请求直接返回 503
+password_pool = PasswordHasherPool(
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or None,
+    max_queue=int(os.getenv("PASSWORD_HASH_QUEUE", "64")),
+)
+
+
+async def ahash_password(password: str) -> str:
+    """哈希密码（异步，不阻塞事件循环）
+
+    Raises:
+        PasswordPoolBusyError: 线程池排队已满
+    """
+    return await password_pool.hash(password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """验证密码（异步，不阻塞事件循环）
+
+    Raises:
+        PasswordPoolBusyError: 线程池排队已满
+    """
+    return await password_pool.verify(plain_password, hashed_password)
@@ -0,0 +1,208 @@
+"""
+进程内限流
+
+登录接口对每个存在的用户名都要做一次密码哈希（100~300ms CPU），撞库请求
+很快就能占满所有 CPU。限流在任何数据库查询和密码计算之前拒绝请求，被拒绝
+的请求只做一次字典查找和几次浮点运算：
+    - 按客户端 IP / 全局限制请求速率：RequestRateLimit（FastAPI 依赖）
+    - 按用户名限制失败次数：验证密码前 acquire 预占一次尝试（检查和计数是
+      同一次原子操作，并发请求不会越过限额），登录成功后 reset
+
+限流状态保存在进程内，多进程部署时每个进程各自计数（总限额为单进程的
+进程数倍）。客户端 IP 取 request.client，部署在反向代理之后时需要让 ASGI
+服务器处理 X-Forwarded-For（如 uvicorn --proxy-headers）。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+# 限额写法中的时间单位
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimiter:
+    """按键的令牌桶限流器（线程安全）
+
+    每个键的桶容量为 burst，每秒补充 rate 个令牌；键的数量超过 maxsize 时淘汰
+    最久未使用的键（被淘汰的键下次以满桶开始）
+
+    Example:
+        >>> per_ip = RateLimiter(rate=1, burst=5, name="login_ip")
+        >>> per_ip.acquire("10.0.0.1")  # 允许时返回 0
+        0.0
+        >>> wait = per_ip.acquire("10.0.0.1")  # 拒绝时返回需要等待的秒数
+    """
+
+    def __init__(
+        self, rate: float, burst: float, maxsize: int = 100_000, name: str = ""
+    ):
+        """初始化限流器
+
+        Args:
+            rate: 每秒补充的令牌数（长期平均速率）
+            burst: 桶容量（允许的突发请求数）
+            maxsize: 最多跟踪的键数
+            name: 名称（用于指标）
+        """
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self.name = name
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+        # 键 -> (剩余令牌数, 上次更新时间)
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse(
+        cls, spec: Optional[str], name: str = "", maxsize: int = 100_000
+    ) -> "Optional[RateLimiter]":
+        """按「次数/时间单位」创建限流器，如 "10/minute"（突发 10 次，平均每 6 秒 1 次）
+
+        Args:
+            spec: 限额，时间单位为 second / minute / hour / day；空字符串或 "0" 表示不限流
+            name: 名称
+            maxsize: 最多跟踪的键数
+
+        Returns:
+            RateLimiter，不限流时为 None
+
+        Raises:
+            ValueError: 格式不正确
+        """
+        if not spec or spec.strip() == "0":
+            return None
+        count, _, period = spec.strip().partition("/")
+        try:
+            burst = float(count)
+            seconds = _PERIODS[period.strip() or "second"]
+        except (ValueError, KeyError):
+            raise ValueError(f"无效的限额: {spec!r}，应为如 10/minute 的格式")
+        if burst <= 0:
+            raise ValueError(f"无效的限额: {spec!r}，次数必须大于 0")
+        return cls(rate=burst / seconds, burst=burst, maxsize=maxsize, name=name)
+
+    def acquire(self, key: Hashable = None, cost: float = 1.0) -> float:
+        """尝试消耗令牌
+
+        Args:
+            key: 限流的键（如 IP、用户名），全局限流使用 None
+            cost: 消耗的令牌数
+
+        Returns:
+            0.0 表示允许；否则为需要等待的秒数（不消耗令牌）
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._refill(key, now)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                self.allowed += 1
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            self.rejected += 1
+            return (cost - tokens) / self.rate
+
+    def retry_after(self, key: Hashable = None, cost: float = 1.0) -> float:
+        """检查是否还有令牌（不消耗），返回需要等待的秒数，0.0 表示可以继续"""
+        with self._lock:
+            entry = self._buckets.get(key)
+            if entry is None:
+                return 0.0
+            tokens = min(self.burst, entry[0] + (time.monotonic() - entry[1]) * self.rate)
+        if tokens >= cost:
+            return 0.0
+        with self._lock:
+            self.rejected += 1
+        return (cost - tokens) / self.rate
+
+    def reset(self, key: Hashable = None) -> None:
+        """清除键的状态（如登录成功后清除用户名的失败计数）"""
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def _refill(self, key: Hashable, now: float) -> float:
+        """按经过的时间补充令牌（调用方持有锁）"""
+        entry = self._buckets.get(key)
+        if entry is None:
+            if len(self._buckets) >= self.maxsize:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+            return float(self.burst)
+        self._buckets.move_to_end(key)
+        tokens, updated = entry
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def stats(self) -> Dict[str, Any]:
+        """限流配置、允许 / 拒绝次数和跟踪的键数"""
+        with self._lock:
+            return {
+                "name": self.name,
+                "rate": self.rate,
+                "burst": self.burst,
+                "keys": len(self._buckets),
+                "maxsize": self.maxsize,
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def too_many_requests(retry_after: float, detail: str = "请求过于频繁，请稍后重试") -> HTTPException:
+    """构造 429 异常（带 Retry-After 头）"""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+    )
+
+
+class RequestRateLimit:
+    """按客户端 IP 和全局限流的 FastAPI 依赖
+
+    先检查 IP 限额再检查全局限额，被 IP 限流拒绝的请求不消耗全局限额
+
+    Example:
+        >>> login_limit = RequestRateLimit(
+        ...     per_ip=RateLimiter(rate=0.5, burst=10, name="login_ip"),
+        ...     global_=RateLimiter(rate=20, burst=40, name="login_global"),
+        ... )
+        >>> @router.post("/login", dependencies=[Depends(login_limit)])
+        >>> async def login(...): ...
+    """
+
+    def __init__(
+        self,
+        per_ip: Optional[RateLimiter] = None,
+        global_: Optional[RateLimiter] = None,
+    ):
+        self.per_ip = per_ip
+        self.global_ = global_
+
+    async def __call__(self, request: Request) -> None:
+        """超出限额时抛出 HTTPException(429)"""
+        if self.per_ip is not None:
+            client = request.client
+            wait = self.per_ip.acquire(client.host if client else None)
+            if wait:
+                raise too_many_requests(wait)
+        if self.global_ is not None:
+            wait = self.global_.acquire()
+            if wait:
+                raise too_many_requests(wait, "服务繁忙，请稍后重试")
+
+    def stats(self) -> Dict[str, Any]:
+        """各限流器的指标"""
+        return {
+            "per_ip": self.per_ip.stats() if self.per_ip is not None else None,
+            "global": self.global_.stats() if self.global_ is not None else None,
+        }
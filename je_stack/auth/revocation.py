@@ -0,0 +1,160 @@
+"""
+Token 吊销表
+
+JWT 在有效期内携带签发时的 role / is_active，禁用用户或变更角色后旧 Token
+依然有效；每个请求都查询用户表又失去了无状态 Token 的意义。吊销表在内存中
+维护两类记录，检查只是两次字典查找：
+    - 用户 Token 版本：Token 的 gen 声明为签发时用户的 token_version，用户被
+      禁用 / 角色变更时递增版本，版本低于最小有效版本的 Token 全部失效
+    - 单个 Token：按 jti 吊销（如用户登出）
+
+记录在其覆盖的 Token 全部过期后即可清除，内存占用只与有效期内的吊销次数
+有关。多进程部署时由应用从数据库增量同步吊销事件（见 apply_event）。
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class RevocationList:
+    """进程内 Token 吊销表（线程安全）
+
+    Example:
+        >>> revocations = RevocationList()
+        >>> revocations.revoke_user(42, generation=1, expires_at=time.time() + 86400)
+        True
+        >>> revocations.is_revoked(42, generation=0, token_id="abc")
+        True
+        >>> revocations.revoke_token("abc", expires_at=time.time() + 86400)
+        True
+        >>> revocations.is_revoked(7, generation=0, token_id="abc")
+        True
+    """
+
+    def __init__(self):
+        # 用户 -> (最小有效版本, 记录过期时间)
+        self._generations: Dict[Hashable, Tuple[int, float]] = {}
+        # jti -> Token 过期时间
+        self._tokens: Dict[str, float] = {}
+        # 已应用的最大事件 ID（由同步方维护）
+        self.last_event_id = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def revoke_user(self, user_id: Hashable, generation: int, expires_at: float) -> bool:
+        """使用户版本低于 generation 的 Token 失效
+
+        Args:
+            user_id: 用户标识
+            generation: 新的最小有效版本
+            expires_at: 记录的过期时间（此前签发的 Token 全部过期的时间）
+
+        Returns:
+            是否提高了用户的最小有效版本
+        """
+        with self._lock:
+            current = self._generations.get(user_id)
+            if current is None or generation > current[0]:
+                self._generations[user_id] = (generation, expires_at)
+                return True
+            if generation == current[0] and expires_at > current[1]:
+                self._generations[user_id] = (generation, expires_at)
+            return False
+
+    def revoke_token(self, token_id: str, expires_at: float) -> bool:
+        """吊销单个 Token
+
+        Args:
+            token_id: Token 的 jti 声明
+            expires_at: Token 的过期时间
+
+        Returns:
+            是否为新吊销的 Token
+        """
+        with self._lock:
+            current = self._tokens.get(token_id)
+            if current is None or expires_at > current:
+                self._tokens[token_id] = expires_at
+            return current is None
+
+    def apply_event(
+        self,
+        event_id: int,
+        user_id: Optional[Hashable],
+        generation: Optional[int],
+        token_id: Optional[str],
+        expires_at: float,
+    ) -> bool:
+        """应用一条吊销事件（可重复应用）
+
+        Args:
+            event_id: 事件 ID（单调递增）
+            user_id: 用户标识
+            generation: 用户的最小有效版本（用户级吊销）
+            token_id: Token 的 jti（单个 Token 吊销）
+            expires_at: 记录的过期时间
+
+        Returns:
+            事件是否改变了吊销表（重复应用时为 False）
+        """
+        changed = False
+        if token_id is not None:
+            changed = self.revoke_token(token_id, expires_at)
+        elif user_id is not None and generation is not None:
+            changed = self.revoke_user(user_id, generation, expires_at)
+        with self._lock:
+            if event_id > self.last_event_id:
+                self.last_event_id = event_id
+        return changed
+
+    def is_revoked(
+        self, user_id: Hashable, generation: int, token_id: Optional[str] = None
+    ) -> bool:
+        """Token 是否已失效（请求路径上调用，不加锁）
+
+        Args:
+            user_id: Token 的用户标识
+            generation: Token 的 gen 声明（旧 Token 没有时为 0）
+            token_id: Token 的 jti 声明
+        """
+        entry = self._generations.get(user_id)
+        if entry is not None and generation < entry[0]:
+            self.rejected += 1
+            return True
+        if token_id is not None and token_id in self._tokens:
+            self.rejected += 1
+            return True
+        return False
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """清除已过期的记录，返回清除的数量"""
+        now = time.time() if now is None else now
+        with self._lock:
+            expired_users = [k for k, (_, exp) in self._generations.items() if exp <= now]
+            for key in expired_users:
+                del self._generations[key]
+            expired_tokens = [k for k, exp in self._tokens.items() if exp <= now]
+            for key in expired_tokens:
+                del self._tokens[key]
+        return len(expired_users) + len(expired_tokens)
+
+    def clear(self) -> None:
+        """清空吊销表"""
+        with self._lock:
+            self._generations.clear()
+            self._tokens.clear()
+            self.last_event_id = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """吊销记录数和拒绝次数"""
+        with self._lock:
+            return {
+                "users": len(self._generations),
+                "tokens": len(self._tokens),
+                "last_event_id": self.last_event_id,
+                "rejected": self.rejected,
+            }
+
+    def __len__(self) -> int:
+        return len(self._generations) + len(self._tokens)
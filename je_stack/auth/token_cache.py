@@ -0,0 +1,148 @@
+"""
+已验证 Token 缓存
+
+客户端在 Token 有效期内会反复发送同一个 Token，每次请求都重新 jwt.decode
+（HMAC + JSON 解析 + 声明校验）并构造 CurrentUser 并无必要。缓存以 Token 的
+摘要为键（不保存 Token 原文），保存验证后的用户信息直到 Token 过期。
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+
+def token_digest(token: str) -> bytes:
+    """Token 摘要（缓存键）"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class TokenCache:
+    """有界 LRU 的已验证 Token 缓存（线程安全）
+
+    缓存的值在多个请求之间共享，调用方不应修改
+
+    Example:
+        >>> cache = TokenCache(maxsize=10_000)
+        >>> user = cache.get(token)
+        >>> if user is None:
+        ...     payload = verify(token)
+        ...     user = CurrentUser(**payload)
+        ...     cache.put(token, user, expires_at=payload["exp"], user_id=user.user_id)
+        >>> cache.invalidate_user(user.user_id)  # 用户被禁用 / 角色变更后
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        """初始化缓存
+
+        Args:
+            maxsize: 最多缓存的 Token 数，超出时淘汰最久未使用的
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[bytes, Tuple[Any, float, Optional[Hashable]]]" = (
+            OrderedDict()
+        )
+        self._by_user: Dict[Hashable, Set[bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Any]:
+        """获取 Token 对应的已验证用户，未缓存或已过期时返回 None"""
+        key = token_digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(
+        self,
+        token: str,
+        value: Any,
+        expires_at: float,
+        user_id: Optional[Hashable] = None,
+    ) -> None:
+        """缓存已验证的 Token
+
+        Args:
+            token: Token 原文
+            value: 验证后的用户信息
+            expires_at: 过期时间（Unix 时间戳，即 JWT 的 exp）
+            user_id: 用户标识，用于 invalidate_user
+        """
+        if self.maxsize <= 0 or expires_at <= time.time():
+            return
+        key = token_digest(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, user_id)
+            if user_id is not None:
+                self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, token: str) -> bool:
+        """移除单个 Token（如用户登出），返回是否存在"""
+        key = token_digest(token)
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def invalidate_user(self, user_id: Hashable) -> int:
+        """移除某个用户的所有 Token（如用户被禁用、角色变更），返回移除的数量"""
+        with self._lock:
+            keys = list(self._by_user.get(user_id, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存（如更换签名密钥后）"""
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """命中率等指标"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _remove(self, key: bytes) -> None:
+        """移除条目（调用方持有锁）"""
+        _, _, user_id = self._entries.pop(key)
+        if user_id is not None:
+            keys = self._by_user.get(user_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_user[user_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -3,8 +3,30 @@ CRUD 基类和工具
 """
 
 from .base import BaseDAO, FormValidationError
+from .cache import QueryCache
+from .query import Filter, QuerySpec
+from .loader import BatchLoader, AsyncBatchLoader
+from .unit_of_work import unit_of_work, async_unit_of_work, in_unit_of_work
 
 __all__ = [
     "BaseDAO",
     "FormValidationError",
+    "QueryCache",
+    "Filter",
+    "QuerySpec",
+    "BatchLoader",
+    "AsyncBatchLoader",
+    "unit_of_work",
+    "async_unit_of_work",
+    "in_unit_of_work",
 ]
+
+
+def __getattr__(name):
+    # AsyncBaseDAO 依赖可选的异步支持（je-stack[async]），用到时才导入，
+    # 只安装同步依赖时 import je_stack.crud 依然可用
+    if name == "AsyncBaseDAO":
+        from .async_base import AsyncBaseDAO
+
+        return AsyncBaseDAO
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,502 @@
+"""
+异步数据访问对象基类
+
+与 BaseDAO 提供相同的接口，基于 SQLAlchemy AsyncSession 实现，
+在 async 路由中使用时不会阻塞事件循环
+"""
+
+import time
+from abc import ABC
+from itertools import islice
+from typing import (
+    Type,
+    Generic,
+    Optional,
+    List,
+    Any,
+    Dict,
+    AsyncIterator,
+    Iterable,
+    Sequence,
+    Tuple,
+    Union,
+)
+from sqlalchemy import insert, update, delete, select, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
+from loguru import logger
+
+from .base import BaseDAO, Filters, T, _IDS_CHUNK_SIZE
+from .query import QuerySpec
+from .cache import QueryCache
+from .unit_of_work import async_unit_of_work, in_unit_of_work
+
+
+class AsyncBaseDAO(ABC, Generic[T]):
+    """异步数据访问对象基类
+
+    所有方法都是 BaseDAO 同名方法的协程版本
+
+    Attributes:
+        _session: SQLAlchemy AsyncSession
+        Model: SQLAlchemy ORM 模型类
+        name: 模型名称
+
+    Examples:
+        >>> from sqlalchemy.ext.asyncio import AsyncSession
+        >>> from your_models import UserModel
+        >>>
+        >>> class AsyncUserDAO(AsyncBaseDAO[UserModel]):
+        ...     async def get_by_username(self, username: str):
+        ...         result = await self._session.scalars(
+        ...             select(self.Model).where(self.Model.username == username)
+        ...         )
+        ...         return result.first()
+        >>>
+        >>> # 使用
+        >>> async with db_manager.SessionLocal() as session:
+        ...     user_dao = AsyncUserDAO(session, UserModel)
+        ...     await user_dao.add_line(username="john", password="hashed")
+    """
+
+    # 与会话无关的语句构造逻辑直接复用同步版本
+    _build_criteria = BaseDAO._build_criteria
+    _where_criteria = BaseDAO._where_criteria
+    _check_filter_fields = BaseDAO._check_filter_fields
+    _compile_query = BaseDAO._compile_query
+    _find_statement = BaseDAO._find_statement
+    _ids_statement = BaseDAO._ids_statement
+    _select = BaseDAO._select
+    _page_statement = BaseDAO._page_statement
+    _page_columns = staticmethod(BaseDAO._page_columns)
+    _page_result = staticmethod(BaseDAO._page_result)
+    _parse_cursor_value = staticmethod(BaseDAO._parse_cursor_value)
+    _in_session = BaseDAO._in_session
+    _cache_line = BaseDAO._cache_line
+    _detached_from_cache = BaseDAO._detached_from_cache
+    _invalidate_cache = BaseDAO._invalidate_cache
+    _drop_cached = BaseDAO._drop_cached
+    _affected_ids = staticmethod(BaseDAO._affected_ids)
+    _count_key = BaseDAO._count_key
+    _count_statement = BaseDAO._count_statement
+    _equality_statement = BaseDAO._equality_statement
+    _build_statement = BaseDAO._build_statement
+    _upsert_statement = BaseDAO._upsert_statement
+    _upsert_values = BaseDAO._upsert_values
+
+    cache: Optional[QueryCache] = None
+    cache_unique_fields: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        Model: Type[T],
+        cache: Optional[QueryCache] = None,
+    ):
+        """初始化 DAO
+
+        Args:
+            session: SQLAlchemy AsyncSession 实例
+            Model: SQLAlchemy ORM 模型类
+            cache: 进程内读缓存，不传时使用类属性 cache（默认不缓存）
+        """
+        self._session = session
+        self.name = Model.__name__
+        self.Model = Model
+        if cache is not None:
+            self.cache = cache
+
+    async def add_line(self, **line_data: Any) -> T:
+        """添加数据行，返回创建的模型实例"""
+        new_line = self.Model(**line_data)  # type: ignore
+        self._session.add(new_line)
+        await self._commit()
+        await self._session.refresh(new_line)
+        self._invalidate_cache([new_line.id])  # type: ignore
+        logger.info(f"{self.name}添加成功, ID: {new_line.id}")  # type: ignore
+        return new_line
+
+    async def add_lines(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int = 1000,
+        return_ids: bool = False,
+    ) -> Union[int, List[int]]:
+        """批量添加数据行，参数与返回值同 BaseDAO.add_lines"""
+        if batch_size <= 0:
+            raise ValueError("batch_size 必须大于 0")
+
+        stmt = insert(self.Model)
+        if return_ids:
+            stmt = stmt.returning(self.Model.id, sort_by_parameter_order=True)  # type: ignore
+
+        ids: List[int] = []
+        total = 0
+        started = time.perf_counter()
+        iterator = iter(rows)
+        while batch := list(islice(iterator, batch_size)):
+            try:
+                if return_ids:
+                    ids.extend((await self._session.scalars(stmt, batch)).all())
+                else:
+                    await self._session.execute(stmt, batch)
+                await self._commit()
+            except Exception:
+                await self._rollback()
+                raise
+            total += len(batch)
+
+        self._invalidate_cache([])
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"{self.name}批量添加成功, 共 {total} 条, 耗时 {elapsed:.3f}s ({rate:.0f} rows/s)"
+        )
+        return ids if return_ids else total
+
+    async def upsert(
+        self,
+        rows: Union[Dict[str, Any], Iterable[Dict[str, Any]]],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> List[int]:
+        """插入数据行，冲突时更新或跳过，参数与返回值同 BaseDAO.upsert"""
+        if batch_size <= 0:
+            raise ValueError("batch_size 必须大于 0")
+        if not conflict_columns:
+            raise ValueError("conflict_columns 不能为空")
+        if isinstance(rows, dict):
+            rows = [rows]
+
+        ids: List[int] = []
+        iterator = iter(rows)
+        while batch := list(islice(iterator, batch_size)):
+            stmt = self._upsert_statement(batch[0], conflict_columns, update_columns)
+            try:
+                if stmt is None:
+                    ids.extend(
+                        await self._upsert_fallback(batch, conflict_columns, update_columns)
+                    )
+                else:
+                    ids.extend((await self._session.scalars(stmt, batch)).all())
+                await self._commit()
+            except Exception:
+                await self._rollback()
+                raise
+
+        self._invalidate_cache(ids)
+        logger.info(f"{self.name}批量写入成功（upsert）, 影响 {len(ids)} 条")
+        return ids
+
+    async def _upsert_fallback(
+        self,
+        batch: List[Dict[str, Any]],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]],
+    ) -> List[int]:
+        """不支持 ON CONFLICT 的数据库：逐行查询后插入或更新"""
+        ids: List[int] = []
+        for row in batch:
+            stmt, params = self._equality_statement(
+                "select", {key: row[key] for key in conflict_columns}
+            )
+            line = (await self._session.scalars(stmt, params)).first()
+            if line is None:
+                line = self.Model(**row)  # type: ignore
+                self._session.add(line)
+            else:
+                update_values = self._upsert_values(row, conflict_columns, update_columns)
+                if not update_values:
+                    continue
+                for key, value in update_values.items():
+                    setattr(line, key, row[key] if value is None else value)
+            await self._session.flush()
+            ids.append(line.id)  # type: ignore
+        return ids
+
+    async def _commit(self) -> None:
+        """提交事务；处于工作单元中时只 flush"""
+        if in_unit_of_work(self._session):
+            await self._session.flush()
+        else:
+            await self._session.commit()
+
+    async def _rollback(self) -> None:
+        """回滚事务；处于工作单元中时交给工作单元回滚"""
+        if not in_unit_of_work(self._session):
+            await self._session.rollback()
+
+    def transaction(self):
+        """开启工作单元，语义同 BaseDAO.transaction
+
+        Example:
+            >>> async with task_dao.transaction():
+            ...     await task_dao.update_line(1, status="completed")
+        """
+        return async_unit_of_work(self._session)
+
+    async def get_lines_num(self, approximate: bool = False) -> int:
+        """获取数据行数量，参数同 BaseDAO.get_lines_num"""
+        if not approximate:
+            return await self.count_where()
+
+        approx_key = (f"{self.name}:approx", "total")
+        if self.cache is not None:
+            cached = self.cache.get(approx_key)
+            if cached is None:
+                cached = self.cache.get(self._count_key({}))
+            if cached is not None:
+                return cached
+
+        table_name = self.Model.__tablename__  # type: ignore
+        count = await self._session.run_sync(
+            lambda session: BaseDAO._estimate_row_count(session, table_name)
+        )
+        if count is None:
+            count = await self.count_where()
+        if self.cache is not None:
+            self.cache.set(approx_key, count)
+        return count
+
+    async def count_where(self, filters: Optional[Filters] = None) -> int:
+        """统计符合条件的记录数，参数同 BaseDAO.count_where"""
+        key = self._count_key(filters if filters is not None else {})
+        if key is not None:
+            cached = self.cache.get(key)  # type: ignore
+            if cached is not None:
+                return cached
+
+        stmt, params = self._count_statement(filters)
+        count = (await self._session.execute(stmt, params)).scalar_one()
+
+        if key is not None:
+            self.cache.set(key, count)  # type: ignore
+        return count
+
+    async def get_lines(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """获取所有数据行（支持分页和字段投影），参数同 BaseDAO.get_lines"""
+        stmt = self._select(columns)
+        if offset is not None:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return await self._fetch_all(stmt, columns)
+
+    async def _fetch_all(
+        self,
+        stmt: Select,
+        columns: Optional[Sequence[str]],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        """执行查询：实体查询返回 ORM 实例，投影查询返回 Row"""
+        if columns is None:
+            return list((await self._session.scalars(stmt, params)).all())
+        return list((await self._session.execute(stmt, params)).all())
+
+    async def find(
+        self,
+        query: QuerySpec,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """按声明式条件查询，参数与返回值同 BaseDAO.find"""
+        stmt = self._find_statement(query, limit, offset, columns)
+        return await self._fetch_all(stmt, columns, query.params())
+
+    async def iter_lines(
+        self, chunk_size: int = 1000, filters: Optional[Filters] = None
+    ) -> AsyncIterator[T]:
+        """流式遍历数据行（按 ID 升序），参数同 BaseDAO.iter_lines
+
+        Example:
+            >>> async for user in dao.iter_lines(chunk_size=500):
+            ...     print(user.username)
+        """
+        stmt = select(self.Model).order_by(self.Model.id)  # type: ignore
+        if filters is not None:
+            stmt = stmt.where(*self._build_criteria(filters))
+
+        result = await self._session.stream_scalars(
+            stmt.execution_options(yield_per=chunk_size)
+        )
+        try:
+            async for partition in result.partitions():
+                for line in partition:
+                    yield line
+                for line in partition:
+                    self._session.expunge(line)
+        finally:
+            await result.close()
+
+    async def get_page(
+        self,
+        after: Optional[str] = None,
+        limit: int = 20,
+        order_by: str = "id",
+        descending: bool = False,
+        filters: Optional[Filters] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """游标分页获取数据行，参数与返回值同 BaseDAO.get_page"""
+        columns = self._page_columns(columns, order_by)
+        stmt = self._page_statement(after, limit, order_by, descending, filters, columns)
+        lines = await self._fetch_all(stmt, columns)
+        return self._page_result(lines, limit, order_by, descending)
+
+    async def get_line_by_id(self, id: int) -> Optional[T]:
+        """根据 ID 获取单条数据（启用 cache 时先查进程内缓存）"""
+        if self.cache is None or self._in_session(id):
+            return await self._session.get(self.Model, id)
+
+        data = self.cache.get((self.name, id))
+        if data is not None:
+            return await self._session.merge(self._detached_from_cache(data), load=False)
+
+        line = await self._session.get(self.Model, id)
+        if line is not None:
+            self._cache_line(line)
+        return line
+
+    async def get_lines_by_ids(
+        self, ids: Iterable[int], columns: Optional[Sequence[str]] = None
+    ) -> Dict[int, Any]:
+        """根据一组 ID 批量获取数据行，参数与返回值同 BaseDAO.get_lines_by_ids"""
+        lines: Dict[int, Any] = {}
+        missing: List[int] = []
+        for id in dict.fromkeys(ids):
+            if columns is None and self.cache is not None:
+                line = self._session.identity_map.get(identity_key(self.Model, id))
+                if line is not None:
+                    lines[id] = line
+                    continue
+                data = self.cache.get((self.name, id))
+                if data is not None:
+                    lines[id] = await self._session.merge(
+                        self._detached_from_cache(data), load=False
+                    )
+                    continue
+            missing.append(id)
+
+        columns = self._page_columns(columns, "id")
+        stmt = self._ids_statement(columns)
+        for start in range(0, len(missing), _IDS_CHUNK_SIZE):
+            chunk = missing[start : start + _IDS_CHUNK_SIZE]
+            for line in await self._fetch_all(stmt, columns, {"ids": chunk}):
+                lines[line.id] = line
+        if columns is None and self.cache is not None:
+            for id in missing:
+                if id in lines:
+                    self._cache_line(lines[id])
+        return lines
+
+    async def get_line_by_unique(self, field_name: str, value: Any) -> Optional[T]:
+        """根据唯一字段获取单条数据，参数同 BaseDAO.get_line_by_unique"""
+        if self.cache is not None and field_name in self.cache_unique_fields:
+            id = self.cache.get((self.name, field_name, value))
+            if id is not None:
+                data = self.cache.get((self.name, id))
+                if data is not None and data.get(field_name) == value:
+                    if self._in_session(id):
+                        return await self._session.get(self.Model, id)
+                    return await self._session.merge(
+                        self._detached_from_cache(data), load=False
+                    )
+
+        stmt, params = self._equality_statement("select", {field_name: value})
+        line = (await self._session.scalars(stmt, params)).first()
+        if line is not None and self.cache is not None:
+            self._cache_line(line)
+        return line
+
+    async def update_line(self, id: int, **update_data: Any) -> Optional[T]:
+        """更新数据行，记录不存在时返回 None"""
+        line = await self.get_line_by_id(id)
+        if not line:
+            return None
+
+        for key, value in update_data.items():
+            if hasattr(line, key):
+                setattr(line, key, value)
+
+        await self._commit()
+        self._invalidate_cache([id])
+        await self._session.refresh(line)
+        logger.info(f"{self.name} ID={id} 更新成功")
+        return line
+
+    async def delete_line(self, id: int) -> bool:
+        """删除数据行"""
+        line = await self.get_line_by_id(id)
+        if not line:
+            return False
+
+        await self._session.delete(line)
+        await self._commit()
+        self._invalidate_cache([id])
+        logger.info(f"{self.name} ID={id} 删除成功")
+        return True
+
+    async def update_where(
+        self,
+        filters: Filters,
+        values: Dict[str, Any],
+        returning: bool = False,
+        all_rows: bool = False,
+    ) -> Union[int, List[int]]:
+        """按条件批量更新，参数与返回值同 BaseDAO.update_where"""
+        criteria = self._where_criteria(filters, all_rows)
+        stmt = update(self.Model).where(*criteria).values(**values)
+        return await self._execute_where(stmt, filters, returning, "更新")
+
+    async def delete_where(
+        self, filters: Filters, returning: bool = False, all_rows: bool = False
+    ) -> Union[int, List[int]]:
+        """按条件批量删除，参数与返回值同 BaseDAO.delete_where"""
+        stmt = delete(self.Model).where(*self._where_criteria(filters, all_rows))
+        return await self._execute_where(stmt, filters, returning, "删除")
+
+    async def _execute_where(
+        self, stmt: Any, filters: Filters, returning: bool, action: str
+    ) -> Union[int, List[int]]:
+        """执行集合式 UPDATE/DELETE 并提交"""
+        ids: Optional[List[int]] = None
+        try:
+            if returning:
+                result = await self._session.execute(stmt.returning(self.Model.id))  # type: ignore
+                ids = list(result.scalars())
+                count = len(ids)
+            else:
+                count = (await self._session.execute(stmt)).rowcount  # type: ignore
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+        self._invalidate_cache(self._affected_ids(filters, ids))
+
+        logger.info(f"{self.name}批量{action}成功, 影响 {count} 条")
+        return ids if returning else count
+
+    async def get_lines_by_field(
+        self, field_name: str, value: Any, limit: Optional[int] = None
+    ) -> List[T]:
+        """根据字段值查询数据"""
+        stmt, params = self._equality_statement("select", {field_name: value})
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list((await self._session.scalars(stmt, params)).all())
+
+    async def exists(self, id: int) -> bool:
+        """检查记录是否存在（始终执行 SELECT EXISTS，不使用缓存，见 BaseDAO.exists）"""
+        stmt, params = self._equality_statement("exists", {"id": id})
+        return bool((await self._session.execute(stmt, params)).scalar())
+
+    async def count_by_field(self, field_name: str, value: Any) -> int:
+        """统计符合条件的记录数"""
+        return await self.count_where({field_name: value})
@@ -4,14 +4,68 @@
 所有 DAO 类都应该继承这个基类，提供统一的数据访问接口
 """
 
+import time
 from abc import ABC
-from typing import Type, TypeVar, Generic, Optional, List, Any, Dict
-from sqlalchemy.orm import Session, DeclarativeMeta
+from functools import partial
+from itertools import islice
+from datetime import date, datetime
+from typing import (
+    Type,
+    TypeVar,
+    Generic,
+    Optional,
+    List,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Sequence,
+    Tuple,
+    Union,
+)
+from sqlalchemy import (
+    insert,
+    update,
+    delete,
+    select,
+    func,
+    text,
+    bindparam,
+    ColumnElement,
+    Select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import (
+    Session,
+    DeclarativeMeta,
+    class_mapper,
+    make_transient_to_detached,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from loguru import logger
 
+from .cache import QueryCache
+from .unit_of_work import unit_of_work, in_unit_of_work, after_unit_of_work
+from .pagination import encode_cursor, decode_cursor, seek_predicate, order_by_clause
+from .query import CompiledQuery, QuerySpec, compile_query
+
 # 泛型类型变量
 T = TypeVar("T", bound=DeclarativeMeta)
 
+# 过滤条件：字段名到值的等值映射、声明式 QuerySpec，或 SQLAlchemy 条件表达式列表
+Filters = Union[Dict[str, Any], QuerySpec, Iterable[ColumnElement[bool]]]
+
+# 预构建语句缓存：(模型, 语句类型, 字段名元组) -> 语句
+# 复用同一个语句对象时不再重复构造表达式树，缓存键也只计算一次，直接命中编译缓存
+_STATEMENT_CACHE: Dict[tuple, Select] = {}
+
+# get_lines_by_ids 每条 IN 查询最多包含的 ID 数（避免超出数据库的参数数量限制）
+_IDS_CHUNK_SIZE = 500
+
+# 支持 INSERT ... ON CONFLICT 的数据库方言
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
 
 class FormValidationError(Exception):
     """表单验证错误
@@ -38,6 +92,10 @@ class BaseDAO(ABC, Generic[T]):
         _session: SQLAlchemy Session
         Model: SQLAlchemy ORM 模型类
         name: 模型名称
+        cache: 进程内读缓存（可选），按主键缓存 get_line_by_id 的结果，
+            写操作自动失效；子类可设置为类属性，让所有实例共享同一个缓存。
+            缓存保存整行数据，含密码哈希等敏感字段的模型不要开启
+        cache_unique_fields: 可以通过 get_line_by_unique 走缓存的唯一字段
 
     Examples:
         >>> from sqlalchemy.orm import Session
@@ -55,16 +113,24 @@ class BaseDAO(ABC, Generic[T]):
         >>> user_dao.add_line(username="john", password="hashed")
     """
 
-    def __init__(self, session: Session, Model: Type[T]):
+    cache: Optional[QueryCache] = None
+    cache_unique_fields: Tuple[str, ...] = ()
+
+    def __init__(
+        self, session: Session, Model: Type[T], cache: Optional[QueryCache] = None
+    ):
         """初始化 DAO
 
         Args:
             session: SQLAlchemy Session 实例
             Model: SQLAlchemy ORM 模型类
+            cache: 进程内读缓存，不传时使用类属性 cache（默认不缓存）
         """
         self._session = session
         self.name = Model.__name__
         self.Model = Model
+        if cache is not None:
+            self.cache = cache
 
     def add_line(self, **line_data: Any) -> T:
         """添加数据行
@@ -86,36 +152,342 @@ class BaseDAO(ABC, Generic[T]):
         new_line = self.Model(**line_data)  # type: ignore
         # 添加到会话
         self._session.add(new_line)
-        # 提交事务
-        self._session.commit()
+        # 提交事务（工作单元中只 flush）
+        self._commit()
         # 刷新实例以获取生成的字段（如 ID）
         self._session.refresh(new_line)
+        self._invalidate_cache([new_line.id])  # type: ignore
         logger.info(f"{self.name}添加成功, ID: {new_line.id}")  # type: ignore
         return new_line
 
-    def get_lines_num(self) -> int:
+    def add_lines(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int = 1000,
+        return_ids: bool = False,
+    ) -> Union[int, List[int]]:
+        """批量添加数据行
+
+        使用 SQLAlchemy 的 executemany / insertmanyvalues 路径，每个批次只提交一次，
+        不会为每一行单独 commit 和 refresh，适合数据导入和初始化。
+
+        Args:
+            rows: 数据字典的可迭代对象，每个字典对应一行
+            batch_size: 每批插入并提交的行数
+            return_ids: 是否通过 RETURNING 返回生成的 ID（需要数据库支持 RETURNING）
+
+        Returns:
+            return_ids 为 False 时返回插入的总行数；
+            为 True 时返回按输入顺序排列的 ID 列表
+
+        Raises:
+            ValueError: batch_size 不合法
+
+        Notes:
+            - 每个批次独立提交，某个批次失败时只回滚该批次，之前的批次已经写入；
+              在工作单元中则随工作单元整体提交或回滚
+            - 不会把新对象放入 Session 的 identity map
+
+        Example:
+            >>> count = dao.add_lines(
+            ...     [{"title": f"task {i}", "creator_id": 1} for i in range(100_000)],
+            ...     batch_size=5000,
+            ... )
+            >>> ids = dao.add_lines([{"username": "a"}, {"username": "b"}], return_ids=True)
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size 必须大于 0")
+
+        stmt = insert(self.Model)
+        if return_ids:
+            stmt = stmt.returning(self.Model.id, sort_by_parameter_order=True)  # type: ignore
+
+        ids: List[int] = []
+        total = 0
+        started = time.perf_counter()
+        iterator = iter(rows)
+        while batch := list(islice(iterator, batch_size)):
+            try:
+                if return_ids:
+                    ids.extend(self._session.scalars(stmt, batch).all())
+                else:
+                    self._session.execute(stmt, batch)
+                self._commit()
+            except Exception:
+                self._rollback()
+                raise
+            total += len(batch)
+
+        self._invalidate_cache([])
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"{self.name}批量添加成功, 共 {total} 条, 耗时 {elapsed:.3f}s ({rate:.0f} rows/s)"
+        )
+        return ids if return_ids else total
+
+    def upsert(
+        self,
+        rows: Union[Dict[str, Any], Iterable[Dict[str, Any]]],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> List[int]:
+        """插入数据行，与已有数据冲突时更新或跳过（INSERT ... ON CONFLICT）
+
+        SQLite / PostgreSQL 编译为单条 INSERT ... ON CONFLICT DO UPDATE / DO NOTHING，
+        不需要先 SELECT，也没有「查询后插入」之间的竞态窗口；其他数据库退化为逐行
+        查询后插入或更新。
+
+        Args:
+            rows: 单个数据字典，或数据字典的可迭代对象（同一批次的字典键需一致）
+            conflict_columns: 判断冲突的字段，需要有唯一约束或唯一索引（如 ["username"]）
+            update_columns: 冲突时要更新的字段；None 表示更新数据中除冲突字段外的
+                全部字段，空序列表示冲突时跳过（DO NOTHING）
+            batch_size: 每批执行并提交的行数
+
+        Returns:
+            插入或更新的数据行 ID 列表（被跳过的行不包含在内）
+
+        Raises:
+            ValueError: batch_size 不合法或 conflict_columns 为空
+
+        Example:
+            >>> # 同步任务：按 username 插入或更新
+            >>> dao.upsert(
+            ...     [{"username": "john", "nickname": "J"}, {"username": "amy", "nickname": "A"}],
+            ...     conflict_columns=["username"],
+            ... )
+            >>> # 注册：用户名已存在时不插入，返回空列表
+            >>> ids = dao.upsert({"username": "john", "password": "..."}, ["username"], [])
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size 必须大于 0")
+        if not conflict_columns:
+            raise ValueError("conflict_columns 不能为空")
+        if isinstance(rows, dict):
+            rows = [rows]
+
+        ids: List[int] = []
+        iterator = iter(rows)
+        while batch := list(islice(iterator, batch_size)):
+            stmt = self._upsert_statement(batch[0], conflict_columns, update_columns)
+            try:
+                if stmt is None:
+                    ids.extend(
+                        self._upsert_fallback(batch, conflict_columns, update_columns)
+                    )
+                else:
+                    ids.extend(self._session.scalars(stmt, batch).all())
+                self._commit()
+            except Exception:
+                self._rollback()
+                raise
+
+        self._invalidate_cache(ids)
+        logger.info(f"{self.name}批量写入成功（upsert）, 影响 {len(ids)} 条")
+        return ids
+
+    def _upsert_statement(
+        self,
+        row: Dict[str, Any],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]],
+    ) -> Optional[Any]:
+        """构造 INSERT ... ON CONFLICT 语句，数据库不支持时返回 None"""
+        dialect_insert = _UPSERT_INSERTS.get(self._session.get_bind().dialect.name)
+        if dialect_insert is None:
+            return None
+
+        stmt = dialect_insert(self.Model)
+        update_values = self._upsert_values(row, conflict_columns, update_columns)
+        if update_values:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={
+                    key: stmt.excluded[key] if value is None else value
+                    for key, value in update_values.items()
+                },
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+        return stmt.returning(self.Model.id)  # type: ignore
+
+    def _upsert_values(
+        self,
+        row: Dict[str, Any],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]],
+    ) -> Dict[str, Any]:
+        """冲突时要更新的字段
+
+        值为 None 表示取本次插入的值，否则是字段的 onupdate 默认值（如 updated_at），
+        ON CONFLICT DO UPDATE 不会自动应用 onupdate
+        """
+        if update_columns is None:
+            update_columns = [
+                key for key in row if key not in conflict_columns and key != "id"
+            ]
+        values: Dict[str, Any] = {key: None for key in update_columns}
+        if not values:
+            return values
+
+        for column in self.Model.__table__.columns:  # type: ignore
+            onupdate = column.onupdate
+            if onupdate is None or column.key in values or column.key in row:
+                continue
+            if onupdate.is_callable:
+                values[column.key] = onupdate.arg(None)
+            elif onupdate.is_clause_element or onupdate.is_scalar:
+                values[column.key] = onupdate.arg
+        return values
+
+    def _upsert_fallback(
+        self,
+        batch: List[Dict[str, Any]],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]],
+    ) -> List[int]:
+        """不支持 ON CONFLICT 的数据库：逐行查询后插入或更新"""
+        ids: List[int] = []
+        for row in batch:
+            stmt, params = self._equality_statement(
+                "select", {key: row[key] for key in conflict_columns}
+            )
+            line = self._session.scalars(stmt, params).first()
+            if line is None:
+                line = self.Model(**row)  # type: ignore
+                self._session.add(line)
+            else:
+                update_values = self._upsert_values(row, conflict_columns, update_columns)
+                if not update_values:
+                    continue
+                for key, value in update_values.items():
+                    setattr(line, key, row[key] if value is None else value)
+            self._session.flush()
+            ids.append(line.id)  # type: ignore
+        return ids
+
+    def get_lines_num(self, approximate: bool = False) -> int:
         """获取数据行数量
 
+        启用 cache 时精确计数会被缓存，直到该模型发生写操作
+
+        Args:
+            approximate: 是否允许返回近似值。近似值优先取缓存，其次取数据库统计信息
+                （SQLite 的 sqlite_stat1、PostgreSQL 的 pg_class），都没有时退回精确计数；
+                近似值只随 TTL 过期，不随写操作失效
+
         Returns:
             数据行总数
 
         Example:
             >>> count = dao.get_lines_num()
             >>> print(f"Total records: {count}")
+            >>>
+            >>> # 列表页展示总数，不需要每次扫描全表
+            >>> total = dao.get_lines_num(approximate=True)
         """
-        return self._session.query(self.Model).count()
+        if not approximate:
+            return self.count_where()
+
+        approx_key = (f"{self.name}:approx", "total")
+        if self.cache is not None:
+            cached = self.cache.get(approx_key)
+            if cached is None:
+                cached = self.cache.get(self._count_key({}))
+            if cached is not None:
+                return cached
+
+        count = self._estimate_row_count(self._session, self.Model.__tablename__)  # type: ignore
+        if count is None:
+            count = self.count_where()
+        if self.cache is not None:
+            self.cache.set(approx_key, count)
+        return count
+
+    def count_where(self, filters: Optional[Filters] = None) -> int:
+        """统计符合条件的记录数
+
+        启用 cache 且 filters 为等值字典时，结果按过滤条件缓存，写操作自动失效
+
+        Args:
+            filters: 过滤条件，格式同 update_where，为 None 时统计全表
+
+        Returns:
+            记录数量
+
+        Example:
+            >>> dao.count_where({"role": "admin", "is_active": True})
+        """
+        key = self._count_key(filters if filters is not None else {})
+        if key is not None:
+            cached = self.cache.get(key)  # type: ignore
+            if cached is not None:
+                return cached
+
+        stmt, params = self._count_statement(filters)
+        count = self._session.execute(stmt, params).scalar_one()
+
+        if key is not None:
+            self.cache.set(key, count)  # type: ignore
+        return count
+
+    def _count_key(self, filters: Filters) -> Optional[tuple]:
+        """计数缓存的键，未启用缓存或条件不可缓存时返回 None"""
+        if self.cache is None or not isinstance(filters, dict):
+            return None
+        key = (f"{self.name}:count", tuple(sorted(filters.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @staticmethod
+    def _estimate_row_count(session: Session, table_name: str) -> Optional[int]:
+        """从数据库统计信息读取表行数估计值，不支持或没有统计信息时返回 None"""
+        dialect = session.get_bind().dialect.name
+        if dialect == "sqlite":
+            # sqlite_stat1 由 ANALYZE / PRAGMA optimize 生成，stat 的第一个数字是行数
+            has_stat = session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'")
+            ).first()
+            if not has_stat:
+                return None
+            row = session.execute(
+                text("SELECT stat FROM sqlite_stat1 WHERE tbl = :tbl LIMIT 1"),
+                {"tbl": table_name},
+            ).first()
+            return int(row[0].split()[0]) if row else None
+        if dialect == "postgresql":
+            row = session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:tbl)"),
+                {"tbl": table_name},
+            ).first()
+            # 从未 ANALYZE 过的表 reltuples 为 -1
+            return int(row[0]) if row and row[0] >= 0 else None
+        return None
 
     def get_lines(
-        self, limit: Optional[int] = None, offset: Optional[int] = None
-    ) -> List[T]:
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
         """获取所有数据行（支持分页）
 
         Args:
             limit: 限制返回数量
             offset: 跳过前 N 条记录
+            columns: 只查询指定字段，返回轻量的 Row 对象（可按属性名访问）
+                而不是完整的 ORM 实例，避免加载大字段和对象装配开销
 
         Returns:
-            数据行列表
+            数据行列表（指定 columns 时为 Row 列表）
+
+        Raises:
+            FormValidationError: columns 中包含不存在的字段
 
         Example:
             >>> # 获取所有记录
@@ -123,20 +495,261 @@ class BaseDAO(ABC, Generic[T]):
             >>>
             >>> # 分页获取（第2页，每页10条）
             >>> users_page2 = dao.get_lines(limit=10, offset=10)
+            >>>
+            >>> # 只取列表页需要的字段
+            >>> rows = dao.get_lines(limit=20, columns=["id", "username"])
+            >>> print(rows[0].username)
         """
-        query = self._session.query(self.Model)
+        stmt = self._select(columns)
 
         if offset is not None:
-            query = query.offset(offset)
+            stmt = stmt.offset(offset)
+
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        return self._fetch_all(stmt, columns)
+
+    def find(
+        self,
+        query: QuerySpec,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """按声明式条件查询（过滤、多字段排序、分页都在数据库中完成）
+
+        同一形状的查询（字段、操作符、排序、columns 相同，值不同）只校验和构造
+        一次语句，之后直接复用并命中编译缓存
+
+        Args:
+            query: 查询条件，见 je_stack.crud.query.QuerySpec
+            limit: 限制返回数量
+            offset: 偏移量
+            columns: 只查询指定字段，返回 Row 列表
+
+        Returns:
+            模型实例列表，或指定 columns 时的 Row 列表
+
+        Raises:
+            FormValidationError: 字段不存在或条件格式不正确
 
+        Example:
+            >>> from je_stack.crud import Filter, QuerySpec
+            >>> spec = QuerySpec.build(
+            ...     [Filter("status", "in", ["pending", "in_progress"]),
+            ...      Filter("due_date", "range", (None, deadline))],
+            ...     sort=["-priority", "due_date"],
+            ... )
+            >>> tasks = dao.find(spec, limit=20, columns=["id", "title"])
+        """
+        stmt = self._find_statement(query, limit, offset, columns)
+        return self._fetch_all(stmt, columns, query.params())
+
+    def _find_statement(
+        self,
+        query: QuerySpec,
+        limit: Optional[int],
+        offset: Optional[int],
+        columns: Optional[Sequence[str]],
+    ) -> Select:
+        """获取 find 使用的语句（按查询形状和 columns 缓存，值通过参数传入）"""
+        try:
+            shape = query.shape()
+        except ValueError as e:
+            raise FormValidationError(str(e), "INVALID_QUERY") from e
+        key = (self.Model, "find", shape, tuple(columns or ()))
+        stmt = _STATEMENT_CACHE.get(key)
+        if stmt is None:
+            compiled = self._compile_query(query)
+            stmt = _STATEMENT_CACHE[key] = (
+                self._select(columns).where(*compiled.criteria).order_by(*compiled.order_by)
+            )
+        if offset is not None:
+            stmt = stmt.offset(offset)
         if limit is not None:
-            query = query.limit(limit)
+            stmt = stmt.limit(limit)
+        return stmt
+
+    def _compile_query(self, query: QuerySpec) -> CompiledQuery:
+        """编译声明式查询条件，错误转换为 FormValidationError"""
+        try:
+            return compile_query(self.Model, query)
+        except ValueError as e:
+            raise FormValidationError(str(e), "INVALID_QUERY") from e
+
+    def iter_lines(
+        self, chunk_size: int = 1000, filters: Optional[Filters] = None
+    ) -> Iterator[T]:
+        """流式遍历数据行（按 ID 升序）
+
+        使用 yield_per 分块读取，每处理完一块就把这些对象移出 Session，
+        内存占用只与 chunk_size 有关，与表大小无关，适合导出和全表扫描。
+
+        Args:
+            chunk_size: 每次从数据库读取的行数
+            filters: 过滤条件，格式同 update_where
+
+        Yields:
+            模型实例（处理完所在分块后即与 Session 分离，已加载的字段仍可访问）
+
+        Notes:
+            遍历结束前不要在同一个 Session 上提交事务，否则游标会被关闭
+
+        Example:
+            >>> for user in dao.iter_lines(chunk_size=500, filters={"is_active": True}):
+            ...     writer.writerow([user.id, user.username])
+        """
+        stmt = select(self.Model).order_by(self.Model.id)  # type: ignore
+        if filters is not None:
+            stmt = stmt.where(*self._build_criteria(filters))
+
+        result = self._session.scalars(stmt.execution_options(yield_per=chunk_size))
+        try:
+            for partition in result.partitions():
+                yield from partition
+                for line in partition:
+                    self._session.expunge(line)
+        finally:
+            result.close()
+
+    def get_page(
+        self,
+        after: Optional[str] = None,
+        limit: int = 20,
+        order_by: str = "id",
+        descending: bool = False,
+        filters: Optional[Filters] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """游标（Keyset）分页获取数据行
+
+        使用 seek 谓词代替 OFFSET，排序字段上有索引时任意页的代价都相同
+
+        Args:
+            after: 上一页返回的 next_cursor，为 None 时获取第一页
+            limit: 每页数量
+            order_by: 排序字段名，建议使用有索引的字段（如 id、created_at）
+            descending: 是否降序
+            filters: 额外的过滤条件，格式同 update_where
+            columns: 只查询指定字段，返回 Row 列表（id 和排序字段会自动补充）
+
+        Returns:
+            (数据行列表, 下一页游标)，没有下一页时游标为 None
+
+        Raises:
+            FormValidationError: 排序字段不存在或游标无效
 
-        return query.all()
+        Example:
+            >>> tasks, cursor = dao.get_page(limit=20, order_by="created_at", descending=True)
+            >>> while cursor:
+            ...     tasks, cursor = dao.get_page(after=cursor, limit=20,
+            ...                                  order_by="created_at", descending=True)
+        """
+        columns = self._page_columns(columns, order_by)
+        stmt = self._page_statement(after, limit, order_by, descending, filters, columns)
+        lines = self._fetch_all(stmt, columns)
+        return self._page_result(lines, limit, order_by, descending)
+
+    @staticmethod
+    def _page_columns(
+        columns: Optional[Sequence[str]], order_by: str
+    ) -> Optional[List[str]]:
+        """游标分页需要 id 和排序字段生成下一页游标，投影查询时自动补充"""
+        if columns is None:
+            return None
+        return list(dict.fromkeys([*columns, "id", order_by]))
+
+    def _select(self, columns: Optional[Sequence[str]] = None) -> Select:
+        """构造 SELECT 语句：默认查询完整实体，指定 columns 时只查询这些字段"""
+        if columns is None:
+            return select(self.Model)
+        table_columns = self.Model.__table__.c  # type: ignore
+        for name in columns:
+            if name not in table_columns:
+                raise FormValidationError(f"无效的查询字段: {name}", "INVALID_COLUMN")
+        return select(*(getattr(self.Model, name) for name in columns))
+
+    def _fetch_all(
+        self,
+        stmt: Select,
+        columns: Optional[Sequence[str]],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        """执行查询：实体查询返回 ORM 实例，投影查询返回 Row"""
+        if columns is None:
+            return list(self._session.scalars(stmt, params).all())
+        return list(self._session.execute(stmt, params).all())
+
+    def _page_statement(
+        self,
+        after: Optional[str],
+        limit: int,
+        order_by: str,
+        descending: bool,
+        filters: Optional[Filters],
+        columns: Optional[Sequence[str]] = None,
+    ) -> Select:
+        """构造游标分页的查询语句（多取一行用于判断是否有下一页）"""
+        table_columns = self.Model.__table__.c  # type: ignore
+        if order_by not in table_columns:
+            raise FormValidationError(f"无效的排序字段: {order_by}", "INVALID_ORDER_BY")
+        column = table_columns[order_by]
+        id_column = table_columns["id"]
+
+        stmt = self._select(columns)
+        if filters is not None:
+            stmt = stmt.where(*self._build_criteria(filters))
+
+        if after is not None:
+            try:
+                cursor_order_by, cursor_desc, value, last_id = decode_cursor(after)
+            except ValueError as e:
+                raise FormValidationError(str(e), "INVALID_CURSOR")
+            if (cursor_order_by, cursor_desc) != (order_by, descending):
+                raise FormValidationError("分页游标与排序方式不匹配", "INVALID_CURSOR")
+            value = self._parse_cursor_value(column, value)
+            stmt = stmt.where(seek_predicate(column, id_column, descending, value, last_id))
+
+        return stmt.order_by(*order_by_clause(column, id_column, descending)).limit(
+            limit + 1
+        )
+
+    @staticmethod
+    def _page_result(
+        lines: List[Any], limit: int, order_by: str, descending: bool
+    ) -> Tuple[List[Any], Optional[str]]:
+        """截取当前页并生成下一页游标"""
+        next_cursor = None
+        if len(lines) > limit:
+            lines = lines[:limit]
+            last = lines[-1]
+            next_cursor = encode_cursor(
+                order_by, descending, getattr(last, order_by), last.id
+            )
+        return lines, next_cursor
+
+    @staticmethod
+    def _parse_cursor_value(column: Any, value: Any) -> Any:
+        """将游标中序列化的值还原为字段对应的 Python 类型"""
+        if value is None or not isinstance(value, str):
+            return value
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        return value
 
     def get_line_by_id(self, id: int) -> Optional[T]:
         """根据 ID 获取单条数据
 
+        启用 cache 时先查 Session 的 identity map，再查进程内缓存，
+        都未命中才访问数据库
+
         Args:
             id: 记录 ID
 
@@ -148,7 +761,194 @@ class BaseDAO(ABC, Generic[T]):
             >>> if user:
             ...     print(user.username)
         """
-        return self._session.query(self.Model).filter(self.Model.id == id).first()  # type: ignore
+        if self.cache is None:
+            return self._session.get(self.Model, id)
+
+        if self._in_session(id):
+            return self._session.get(self.Model, id)
+        data = self.cache.get((self.name, id))
+        if data is not None:
+            return self._session.merge(self._detached_from_cache(data), load=False)
+
+        line = self._session.get(self.Model, id)
+        if line is not None:
+            self._cache_line(line)
+        return line
+
+    def get_lines_by_ids(
+        self, ids: Iterable[int], columns: Optional[Sequence[str]] = None
+    ) -> Dict[int, Any]:
+        """根据一组 ID 批量获取数据行（WHERE id IN (...)，一次查询代替逐个查询）
+
+        不指定 columns 时，已在 Session identity map 或进程内缓存中的行不会再查询数据库
+
+        Args:
+            ids: 记录 ID 的可迭代对象（可以重复）
+            columns: 只查询指定字段，返回 Row（会自动包含 id）
+
+        Returns:
+            {id: 模型实例或 Row}，不存在的 ID 不在字典中
+
+        Example:
+            >>> creators = user_dao.get_lines_by_ids({t.creator_id for t in tasks})
+            >>> names = [creators[t.creator_id].nickname for t in tasks]
+        """
+        lines, missing = self._lines_from_cache(ids, columns)
+        columns = self._page_columns(columns, "id")
+        stmt = self._ids_statement(columns)
+        for start in range(0, len(missing), _IDS_CHUNK_SIZE):
+            chunk = missing[start : start + _IDS_CHUNK_SIZE]
+            for line in self._fetch_all(stmt, columns, {"ids": chunk}):
+                lines[line.id] = line
+        if columns is None and self.cache is not None:
+            for id in missing:
+                if id in lines:
+                    self._cache_line(lines[id])
+        return lines
+
+    def _lines_from_cache(
+        self, ids: Iterable[int], columns: Optional[Sequence[str]]
+    ) -> Tuple[Dict[int, Any], List[int]]:
+        """从 identity map 和进程内缓存中取出已有的行，返回 (已找到的行, 需要查询的 ID)"""
+        lines: Dict[int, Any] = {}
+        missing: List[int] = []
+        for id in dict.fromkeys(ids):
+            if columns is None and self.cache is not None:
+                line = self._session.identity_map.get(identity_key(self.Model, id))
+                if line is not None:
+                    lines[id] = line
+                    continue
+                data = self.cache.get((self.name, id))
+                if data is not None:
+                    lines[id] = self._session.merge(
+                        self._detached_from_cache(data), load=False
+                    )
+                    continue
+            missing.append(id)
+        return lines, missing
+
+    def _ids_statement(self, columns: Optional[Sequence[str]]) -> Select:
+        """按 ID 列表查询的语句（expanding bindparam，按 columns 缓存）"""
+        key = (self.Model, "by_ids", tuple(columns or ()))
+        stmt = _STATEMENT_CACHE.get(key)
+        if stmt is None:
+            stmt = _STATEMENT_CACHE[key] = self._select(columns).where(
+                self.Model.id.in_(bindparam("ids", expanding=True))  # type: ignore
+            )
+        return stmt
+
+    def get_line_by_unique(self, field_name: str, value: Any) -> Optional[T]:
+        """根据唯一字段获取单条数据
+
+        field_name 在 cache_unique_fields 中时走进程内缓存，否则直接查询数据库
+
+        Args:
+            field_name: 唯一字段名（如 username）
+            value: 字段值
+
+        Returns:
+            模型实例，如果不存在返回 None
+
+        Example:
+            >>> user = dao.get_line_by_unique("username", "john")
+        """
+        if self.cache is not None and field_name in self.cache_unique_fields:
+            id = self.cache.get((self.name, field_name, value))
+            if id is not None:
+                data = self.cache.get((self.name, id))
+                # 主键条目被失效或字段值已变化时视为未命中
+                if data is not None and data.get(field_name) == value:
+                    if self._in_session(id):
+                        return self._session.get(self.Model, id)
+                    return self._session.merge(
+                        self._detached_from_cache(data), load=False
+                    )
+
+        stmt, params = self._equality_statement("select", {field_name: value})
+        line = self._session.scalars(stmt, params).first()
+        if line is not None and self.cache is not None:
+            self._cache_line(line)
+        return line
+
+    def _in_session(self, id: int) -> bool:
+        """对象是否已在当前 Session 的 identity map 中"""
+        return identity_key(self.Model, id) in self._session.identity_map
+
+    def _cache_line(self, line: Any) -> None:
+        """把数据行的字段快照写入缓存（缓存的是值而不是 ORM 对象本身）
+
+        工作单元中读到的可能是尚未提交的数据，不写入缓存
+        """
+        assert self.cache is not None
+        if in_unit_of_work(self._session):
+            return
+        data = {
+            attr.key: getattr(line, attr.key)
+            for attr in class_mapper(self.Model).column_attrs
+        }
+        self.cache.set((self.name, line.id), data)
+        for field_name in self.cache_unique_fields:
+            self.cache.set((self.name, field_name, data[field_name]), line.id)
+
+    def _detached_from_cache(self, data: Dict[str, Any]) -> Any:
+        """用缓存的字段快照构造一个 detached 实例，可无 SQL 地 merge 进 Session"""
+        line = class_mapper(self.Model).class_manager.new_instance()
+        for key, value in data.items():
+            set_committed_value(line, key, value)
+        make_transient_to_detached(line)
+        return line
+
+    def _invalidate_cache(self, ids: Optional[Iterable[int]] = None) -> None:
+        """失效缓存：指定 ids 时只失效这些行，否则失效该模型的全部条目
+
+        任何写操作都会同时失效该模型的计数缓存。工作单元中提交前其他请求可能
+        又把旧值写回缓存，因此工作单元结束后会再失效一次
+        """
+        if self.cache is None:
+            return
+        if ids is not None:
+            ids = list(ids)
+        self._drop_cached(ids)
+        if in_unit_of_work(self._session):
+            after_unit_of_work(self._session, partial(self._drop_cached, ids))
+
+    def _drop_cached(self, ids: Optional[List[int]]) -> None:
+        """从缓存中删除指定行（ids 为 None 时删除整个模型）及计数"""
+        assert self.cache is not None
+        self.cache.invalidate_namespace(f"{self.name}:count")
+        if ids is None:
+            self.cache.invalidate_namespace(self.name)
+            return
+        for id in ids:
+            self.cache.invalidate((self.name, id))
+
+    def _commit(self) -> None:
+        """提交事务；处于工作单元中时只 flush，由工作单元统一提交"""
+        if in_unit_of_work(self._session):
+            self._session.flush()
+        else:
+            self._session.commit()
+
+    def _rollback(self) -> None:
+        """回滚事务；处于工作单元中时交给工作单元回滚"""
+        if not in_unit_of_work(self._session):
+            self._session.rollback()
+
+    def transaction(self):
+        """开启工作单元：作用域内的写操作只 flush，结束时统一提交一次
+
+        嵌套调用时内层使用 SAVEPOINT；作用域内抛出异常时回滚（内层只回滚到
+        SAVEPOINT）。共用同一个 Session 的其他 DAO 也处于该工作单元中
+
+        Returns:
+            上下文管理器，进入时返回当前 Session
+
+        Example:
+            >>> with task_dao.transaction():
+            ...     task_dao.update_line(1, status="completed")
+            ...     task_dao.add_line(title="follow-up", creator_id=1)
+        """
+        return unit_of_work(self._session)
 
     def update_line(self, id: int, **update_data: Any) -> Optional[T]:
         """更新数据行
@@ -174,7 +974,8 @@ class BaseDAO(ABC, Generic[T]):
             if hasattr(line, key):
                 setattr(line, key, value)
 
-        self._session.commit()
+        self._commit()
+        self._invalidate_cache([id])
         self._session.refresh(line)
         logger.info(f"{self.name} ID={id} 更新成功")
         return line
@@ -198,10 +999,187 @@ class BaseDAO(ABC, Generic[T]):
             return False
 
         self._session.delete(line)
-        self._session.commit()
+        self._commit()
+        self._invalidate_cache([id])
         logger.info(f"{self.name} ID={id} 删除成功")
         return True
 
+    def update_where(
+        self,
+        filters: Filters,
+        values: Dict[str, Any],
+        returning: bool = False,
+        all_rows: bool = False,
+    ) -> Union[int, List[int]]:
+        """按条件批量更新（单条 UPDATE ... WHERE 语句，不加载数据行）
+
+        Args:
+            filters: 过滤条件，字段名到值的等值字典，或 SQLAlchemy 条件表达式列表
+            values: 要更新的字段键值对
+            returning: 是否通过 RETURNING 返回受影响行的 ID（需要数据库支持 RETURNING）
+            all_rows: 允许空过滤条件（更新全表）
+
+        Returns:
+            returning 为 False 时返回受影响的行数；为 True 时返回受影响行的 ID 列表
+
+        Raises:
+            FormValidationError: 过滤条件为空（且 all_rows 为 False）或字段不存在
+
+        Example:
+            >>> # 取消用户 1 所有已逾期的任务
+            >>> count = dao.update_where(
+            ...     [Task.creator_id == 1, Task.due_date < datetime.now()],
+            ...     {"status": "cancelled"},
+            ... )
+            >>> ids = dao.update_where({"role": "guest"}, {"is_active": False}, returning=True)
+        """
+        criteria = self._where_criteria(filters, all_rows)
+        stmt = update(self.Model).where(*criteria).values(**values)
+        return self._execute_where(stmt, filters, returning, "更新")
+
+    def delete_where(
+        self, filters: Filters, returning: bool = False, all_rows: bool = False
+    ) -> Union[int, List[int]]:
+        """按条件批量删除（单条 DELETE ... WHERE 语句，不加载数据行）
+
+        Args:
+            filters: 过滤条件，字段名到值的等值字典，或 SQLAlchemy 条件表达式列表
+            returning: 是否通过 RETURNING 返回被删除行的 ID（需要数据库支持 RETURNING）
+            all_rows: 允许空过滤条件（删除全表）
+
+        Returns:
+            returning 为 False 时返回删除的行数；为 True 时返回被删除行的 ID 列表
+
+        Raises:
+            FormValidationError: 过滤条件为空（且 all_rows 为 False）或字段不存在
+
+        Notes:
+            绕过 ORM 的级联规则（relationship cascade），依赖级联时请使用 delete_line
+
+        Example:
+            >>> count = dao.delete_where({"status": "cancelled"})
+        """
+        stmt = delete(self.Model).where(*self._where_criteria(filters, all_rows))
+        return self._execute_where(stmt, filters, returning, "删除")
+
+    def _count_statement(
+        self, filters: Optional[Filters]
+    ) -> Tuple[Select, Dict[str, Any]]:
+        """构造 COUNT 语句，等值过滤使用预构建语句"""
+        if not filters:
+            return self._equality_statement("count", {})
+        if isinstance(filters, dict):
+            return self._equality_statement("count", filters)
+        return self._build_statement("count", self._build_criteria(filters)), {}
+
+    def _equality_statement(
+        self, kind: str, filters: Dict[str, Any]
+    ) -> Tuple[Select, Dict[str, Any]]:
+        """获取按字段等值过滤的语句及其参数
+
+        字段值通过同名 bindparam 传入，同一模型、同一组字段只构造一次语句；
+        值为 None 时需要生成 IS NULL，不走缓存
+
+        Args:
+            kind: 语句类型，"select"、"count" 或 "exists"
+            filters: 字段名到值的映射
+
+        Returns:
+            (语句, 执行参数)
+        """
+        if any(value is None for value in filters.values()):
+            return self._build_statement(kind, self._build_criteria(filters)), {}
+
+        key = (self.Model, kind, tuple(filters))
+        stmt = _STATEMENT_CACHE.get(key)
+        if stmt is None:
+            self._check_filter_fields(filters)
+            criteria = [
+                getattr(self.Model, field_name) == bindparam(field_name)
+                for field_name in filters
+            ]
+            stmt = _STATEMENT_CACHE[key] = self._build_statement(kind, criteria)
+        return stmt, filters
+
+    def _build_statement(
+        self, kind: str, criteria: List[ColumnElement[bool]]
+    ) -> Select:
+        """按语句类型构造 SELECT / COUNT / EXISTS 语句"""
+        if kind == "count":
+            return select(func.count()).select_from(self.Model).where(*criteria)
+        if kind == "exists":
+            return select(select(self.Model.id).where(*criteria).exists())  # type: ignore
+        return select(self.Model).where(*criteria)
+
+    def _build_criteria(self, filters: Filters) -> List[ColumnElement[bool]]:
+        """将过滤条件统一转换为 SQLAlchemy 条件表达式列表
+
+        QuerySpec 只取过滤条件（排序由调用方决定），参数值绑定到表达式副本中
+        """
+        if isinstance(filters, QuerySpec):
+            criteria = self._compile_query(filters).criteria
+            params = filters.params()
+            return [criterion.params(params) for criterion in criteria]
+        if isinstance(filters, dict):
+            self._check_filter_fields(filters)
+            return [
+                getattr(self.Model, field_name) == value
+                for field_name, value in filters.items()
+            ]
+        return list(filters)
+
+    def _where_criteria(
+        self, filters: Filters, all_rows: bool
+    ) -> List[ColumnElement[bool]]:
+        """集合式 UPDATE/DELETE 的条件，空条件（会作用于全表）需要显式 all_rows"""
+        criteria = self._build_criteria(filters)
+        if not criteria and not all_rows:
+            raise FormValidationError(
+                "批量更新 / 删除的过滤条件为空，操作全表需要传入 all_rows=True",
+                "EMPTY_FILTERS",
+            )
+        return criteria
+
+    def _check_filter_fields(self, filters: Dict[str, Any]) -> None:
+        """校验等值过滤的字段名"""
+        table_columns = self.Model.__table__.c  # type: ignore
+        for name in filters:
+            if name not in table_columns:
+                raise FormValidationError(f"无效的过滤字段: {name}", "INVALID_FILTER")
+
+    @staticmethod
+    def _affected_ids(
+        filters: Filters, ids: Optional[List[int]]
+    ) -> Optional[List[int]]:
+        """推断集合式写操作影响的 ID，无法确定时返回 None（失效整个模型的缓存）"""
+        if ids is not None:
+            return ids
+        if isinstance(filters, dict) and list(filters) == ["id"]:
+            return [filters["id"]]
+        return None
+
+    def _execute_where(
+        self, stmt: Any, filters: Filters, returning: bool, action: str
+    ) -> Union[int, List[int]]:
+        """执行集合式 UPDATE/DELETE 并提交"""
+        ids: Optional[List[int]] = None
+        try:
+            if returning:
+                ids = list(
+                    self._session.execute(stmt.returning(self.Model.id)).scalars()  # type: ignore
+                )
+                count = len(ids)
+            else:
+                count = self._session.execute(stmt).rowcount  # type: ignore
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        self._invalidate_cache(self._affected_ids(filters, ids))
+
+        logger.info(f"{self.name}批量{action}成功, 影响 {count} 条")
+        return ids if returning else count
+
     def get_lines_by_field(
         self, field_name: str, value: Any, limit: Optional[int] = None
     ) -> List[T]:
@@ -220,14 +1198,10 @@ class BaseDAO(ABC, Generic[T]):
             >>> for user in users:
             ...     print(user.username)
         """
-        query = self._session.query(self.Model).filter(
-            getattr(self.Model, field_name) == value
-        )
-
+        stmt, params = self._equality_statement("select", {field_name: value})
         if limit is not None:
-            query = query.limit(limit)
-
-        return query.all()
+            stmt = stmt.limit(limit)
+        return list(self._session.scalars(stmt, params).all())
 
     def exists(self, id: int) -> bool:
         """检查记录是否存在
@@ -235,6 +1209,9 @@ class BaseDAO(ABC, Generic[T]):
         Args:
             id: 记录 ID
 
+        始终执行 SELECT EXISTS：进程内缓存最多滞后 ttl 秒，其他进程或按非 ID
+        条件删除的行在缓存中可能还在
+
         Returns:
             记录是否存在
 
@@ -242,9 +1219,8 @@ class BaseDAO(ABC, Generic[T]):
             >>> if dao.exists(123):
             ...     print("Record exists")
         """
-        return (
-            self._session.query(self.Model).filter(self.Model.id == id).count() > 0  # type: ignore
-        )
+        stmt, params = self._equality_statement("exists", {"id": id})
+        return bool(self._session.execute(stmt, params).scalar())
 
     def count_by_field(self, field_name: str, value: Any) -> int:
         """统计符合条件的记录数
@@ -259,8 +1235,4 @@ class BaseDAO(ABC, Generic[T]):
         Example:
             >>> active_count = dao.count_by_field("is_active", True)
         """
-        return (
-            self._session.query(self.Model)
-            .filter(getattr(self.Model, field_name) == value)
-            .count()
-        )
+        return self.count_where({field_name: value})
@@ -0,0 +1,126 @@
+"""
+进程内查询缓存
+
+LRU + TTL 的线程安全缓存，BaseDAO 用它缓存按主键（及唯一字段）读取的数据行，
+写操作会自动失效相关条目。缓存只在当前进程内有效，多进程部署时其他进程的写入
+最多在 TTL 之后可见。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set
+
+
+class QueryCache:
+    """LRU + TTL 缓存
+
+    键的第一个元素约定为命名空间（如模型名），便于按模型整体失效
+
+    Attributes:
+        maxsize: 最大条目数，超出时淘汰最久未使用的条目
+        ttl: 条目存活时间（秒）
+        hits: 命中次数
+        misses: 未命中次数
+        evictions: 因容量淘汰的条目数
+
+    Example:
+        >>> cache = QueryCache(maxsize=10_000, ttl=60)
+        >>> cache.set(("UserModel", 1), {"id": 1, "username": "john"})
+        >>> cache.get(("UserModel", 1))
+        {'id': 1, 'username': 'john'}
+        >>> cache.invalidate_namespace("UserModel")
+        >>> cache.stats()["size"]
+        0
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        """初始化缓存
+
+        Args:
+            maxsize: 最大条目数
+            ttl: 条目存活时间（秒）
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize 必须大于 0")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        # 命名空间 -> 键集合，按命名空间失效时不需要扫描全部条目
+        self._namespaces: Dict[Hashable, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """读取缓存，未命中或已过期时返回 None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存"""
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            if isinstance(key, tuple) and key:
+                self._namespaces.setdefault(key[0], set()).add(key)
+            while len(self._data) > self.maxsize:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """删除单个条目"""
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def invalidate_namespace(self, namespace: Hashable) -> None:
+        """删除某个命名空间（键的第一个元素）下的所有条目"""
+        with self._lock:
+            for key in self._namespaces.pop(namespace, ()):
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存（不重置统计）"""
+        with self._lock:
+            self._data.clear()
+            self._namespaces.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        """删除条目并维护命名空间索引（调用方需持有锁）"""
+        del self._data[key]
+        if isinstance(key, tuple) and key:
+            keys = self._namespaces.get(key[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._namespaces[key[0]]
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息
+
+        Returns:
+            包含 size、hits、misses、evictions、hit_rate 的字典
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,153 @@
+"""
+按 ID 批量加载（DataLoader）
+
+列表接口需要为每一行解析关联记录（如任务的创建者）时，逐个 get_line_by_id
+会产生 N+1 次查询。加载器把同一时刻请求的 ID 合并成一条
+WHERE id IN (...) 查询，并在请求内记住结果，同一个 ID 只查询一次。
+
+加载器应当是请求级的（每个请求创建一个），不要在请求之间共享。
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+class BatchLoader:
+    """同步批量加载器（配合 BaseDAO 使用）
+
+    先用 prime 登记需要的 ID，第一次 load 时一次性查询所有已登记的 ID
+
+    Example:
+        >>> loader = BatchLoader(user_dao, columns=["id", "nickname"])
+        >>> loader.prime(task.creator_id for task in tasks)
+        >>> for task in tasks:
+        ...     creator = loader.load(task.creator_id)  # 只有第一次会查询数据库
+    """
+
+    def __init__(self, dao: Any, columns: Optional[Sequence[str]] = None):
+        """初始化加载器
+
+        Args:
+            dao: BaseDAO 实例
+            columns: 只查询指定字段，结果为 Row
+        """
+        self._dao = dao
+        self._columns = columns
+        self._memo: Dict[int, Any] = {}
+        self._pending: Dict[int, None] = {}
+
+    def prime(self, ids: Iterable[int]) -> None:
+        """登记稍后需要加载的 ID（None 会被忽略）"""
+        for id in ids:
+            if id is not None and id not in self._memo:
+                self._pending[id] = None
+
+    def load(self, id: Optional[int]) -> Optional[Any]:
+        """加载单条记录，不存在时返回 None"""
+        if id is None:
+            return None
+        if id not in self._memo:
+            self._pending[id] = None
+            self._dispatch()
+        return self._memo[id]
+
+    def load_many(self, ids: Iterable[int]) -> List[Optional[Any]]:
+        """加载多条记录，返回与 ids 顺序一致的列表"""
+        ids = list(ids)
+        self.prime(ids)
+        self._dispatch()
+        return [self._memo.get(id) for id in ids]
+
+    def clear(self, id: Optional[int] = None) -> None:
+        """清除记住的结果（数据被修改后调用）"""
+        if id is None:
+            self._memo.clear()
+        else:
+            self._memo.pop(id, None)
+
+    def _dispatch(self) -> None:
+        """一次性查询所有待加载的 ID"""
+        if not self._pending:
+            return
+        ids, self._pending = list(self._pending), {}
+        found = self._dao.get_lines_by_ids(ids, columns=self._columns)
+        for id in ids:
+            self._memo[id] = found.get(id)
+
+
+class AsyncBatchLoader:
+    """异步批量加载器（配合 AsyncBaseDAO 使用）
+
+    同一轮事件循环中发起的 load 调用会被合并为一次查询，
+    并发的协程（如 asyncio.gather）无需预先登记 ID
+
+    Example:
+        >>> loader = AsyncBatchLoader(user_dao, columns=["id", "nickname"])
+        >>> creators = await asyncio.gather(*(loader.load(t.creator_id) for t in tasks))
+        >>> # 或者
+        >>> creators = await loader.load_many(t.creator_id for t in tasks)
+    """
+
+    def __init__(self, dao: Any, columns: Optional[Sequence[str]] = None):
+        """初始化加载器
+
+        Args:
+            dao: AsyncBaseDAO 实例
+            columns: 只查询指定字段，结果为 Row
+        """
+        self._dao = dao
+        self._columns = columns
+        self._memo: Dict[int, asyncio.Future] = {}
+        self._pending: List[int] = []
+        self._dispatch_task: Optional[asyncio.Task] = None
+        # 同一个 AsyncSession 不能并发执行查询
+        self._lock = asyncio.Lock()
+
+    def load(self, id: Optional[int]) -> "asyncio.Future[Optional[Any]]":
+        """加载单条记录，返回可 await 的 Future，不存在时结果为 None"""
+        loop = asyncio.get_running_loop()
+        if id is None:
+            future = loop.create_future()
+            future.set_result(None)
+            return future
+
+        future = self._memo.get(id)
+        if future is None:
+            future = self._memo[id] = loop.create_future()
+            self._pending.append(id)
+            if self._dispatch_task is None:
+                # 延迟到本轮已就绪的协程都执行过之后再查询，以便合并更多 ID
+                self._dispatch_task = loop.create_task(self._dispatch())
+        return future
+
+    async def load_many(self, ids: Iterable[int]) -> List[Optional[Any]]:
+        """加载多条记录，返回与 ids 顺序一致的列表"""
+        return list(await asyncio.gather(*(self.load(id) for id in ids)))
+
+    def clear(self, id: Optional[int] = None) -> None:
+        """清除记住的结果（数据被修改后调用）"""
+        if id is None:
+            self._memo = {
+                key: future for key, future in self._memo.items() if not future.done()
+            }
+        elif id in self._memo and self._memo[id].done():
+            del self._memo[id]
+
+    async def _dispatch(self) -> None:
+        """一次性查询所有待加载的 ID，并把结果分发给各个 Future"""
+        async with self._lock:
+            ids, self._pending = self._pending, []
+            self._dispatch_task = None
+            try:
+                found = await self._dao.get_lines_by_ids(ids, columns=self._columns)
+            except Exception as e:
+                for id in ids:
+                    # 失败的 ID 不记住，之后可以重试
+                    future = self._memo.pop(id)
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            for id in ids:
+                future = self._memo[id]
+                if not future.done():
+                    future.set_result(found.get(id))
@@ -0,0 +1,98 @@
+"""
+游标（Keyset）分页工具
+
+游标是对「上一页最后一行的排序键」的不透明编码，配合 WHERE 条件中的
+seek 谓词使用，翻到第 N 页的代价与第 1 页相同，不再依赖 OFFSET。
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Tuple
+
+from sqlalchemy import and_, or_, ColumnElement
+
+
+def encode_cursor(order_by: str, descending: bool, value: Any, id: int) -> str:
+    """编码分页游标
+
+    Args:
+        order_by: 排序字段名
+        descending: 是否降序
+        value: 最后一行排序字段的值
+        id: 最后一行的 ID（作为排序的唯一性补充）
+
+    Returns:
+        URL 安全的游标字符串
+    """
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    raw = json.dumps([order_by, int(descending), value, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, bool, Any, int]:
+    """解码分页游标
+
+    Args:
+        cursor: encode_cursor 生成的游标字符串
+
+    Returns:
+        (排序字段名, 是否降序, 排序字段值, ID)
+
+    Raises:
+        ValueError: 游标格式错误
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        order_by, descending, value, id = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+    except Exception as e:
+        raise ValueError(f"无效的分页游标: {cursor}") from e
+    if not isinstance(order_by, str) or not isinstance(id, int):
+        raise ValueError(f"无效的分页游标: {cursor}")
+    return order_by, bool(descending), value, id
+
+
+def seek_predicate(
+    column: Any, id_column: Any, descending: bool, value: Any, id: int
+) -> ColumnElement[bool]:
+    """生成 seek 谓词，定位到游标之后的数据行
+
+    排序规则为 (column, id)，升序时 NULL 在前，降序时 NULL 在后，
+    与 order_by_clause 保持一致
+
+    Args:
+        column: 排序字段
+        id_column: 主键字段
+        descending: 是否降序
+        value: 游标中的排序字段值
+        id: 游标中的 ID
+
+    Returns:
+        SQLAlchemy 条件表达式
+    """
+    if column is id_column:
+        return id_column < id if descending else id_column > id
+
+    if value is None:
+        same_key = and_(column.is_(None), id_column < id if descending else id_column > id)
+        # 升序时 NULL 排在最前，之后还有所有非 NULL 行
+        return same_key if descending else or_(same_key, column.is_not(None))
+
+    if descending:
+        after = or_(column < value, and_(column == value, id_column < id))
+        return or_(after, column.is_(None)) if column.nullable else after
+    return or_(column > value, and_(column == value, id_column > id))
+
+
+def order_by_clause(column: Any, id_column: Any, descending: bool) -> list:
+    """生成与 seek_predicate 对应的排序子句"""
+    if column is id_column:
+        return [id_column.desc() if descending else id_column.asc()]
+    if descending:
+        ordered = column.desc().nulls_last() if column.nullable else column.desc()
+        return [ordered, id_column.desc()]
+    ordered = column.asc().nulls_first() if column.nullable else column.asc()
+    return [ordered, id_column.asc()]
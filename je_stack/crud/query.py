@@ -0,0 +1,235 @@
+"""
+声明式查询条件
+
+用 Filter / QuerySpec 描述过滤和排序条件，编译为带 bindparam 的 SQLAlchemy
+表达式。编译结果按「形状」（模型、字段、操作符、排序，不含具体值）缓存，
+字段只在第一次编译时校验，之后同形状的查询直接复用表达式并命中编译缓存。
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from sqlalchemy import and_, bindparam, or_, ColumnElement
+from sqlalchemy.orm import class_mapper
+
+# 支持的操作符
+OPERATORS = (
+    "eq",
+    "ne",
+    "in",
+    "not_in",
+    "gt",
+    "ge",
+    "lt",
+    "le",
+    "range",
+    "like",
+    "ilike",
+    "contains",
+    "is_null",
+    "not_null",
+)
+
+_COMPARATORS: Dict[str, Callable[[Any, Any], ColumnElement[bool]]] = {
+    "eq": lambda column, param: column == param,
+    "ne": lambda column, param: column != param,
+    "in": lambda column, param: column.in_(param),
+    "not_in": lambda column, param: column.not_in(param),
+    "gt": lambda column, param: column > param,
+    "ge": lambda column, param: column >= param,
+    "lt": lambda column, param: column < param,
+    "le": lambda column, param: column <= param,
+    "like": lambda column, param: column.like(param),
+    "ilike": lambda column, param: column.ilike(param),
+    "contains": lambda column, param: column.contains(param),
+}
+
+
+@dataclass(frozen=True)
+class Filter:
+    """单个过滤条件
+
+    Attributes:
+        field: 字段名；传入多个字段时任一字段满足即可（OR），如关键词搜索
+        op: 操作符，见 OPERATORS
+        value: 比较值；in / not_in 为序列，range 为 (下限, 上限) 闭区间，
+            任一端为 None 表示不限；is_null / not_null 不需要值
+
+    Example:
+        >>> Filter("status", "in", ["pending", "in_progress"])
+        >>> Filter("created_at", "range", (start, None))
+        >>> Filter(("username", "nickname"), "contains", "john")
+    """
+
+    field: Union[str, Tuple[str, ...]]
+    op: str = "eq"
+    value: Any = None
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return (self.field,) if isinstance(self.field, str) else tuple(self.field)
+
+    def normalized(self) -> "Filter":
+        """eq / ne 与 None 比较时转换为 is_null / not_null"""
+        if self.value is None and self.op in ("eq", "ne"):
+            return Filter(self.field, "is_null" if self.op == "eq" else "not_null")
+        return self
+
+    def shape(self) -> tuple:
+        """与具体值无关的结构，用作编译缓存键
+
+        值的格式每次都检查（同形状的查询不会重新编译，值的错误不能只在编译时发现）
+
+        Raises:
+            ValueError: 值的格式与操作符不匹配
+        """
+        if self.op == "range":
+            if not (isinstance(self.value, (tuple, list)) and len(self.value) == 2):
+                raise ValueError(f"range 的值必须是 (下限, 上限): {self.field}")
+            low, high = self.value
+            return (self.fields, self.op, low is not None, high is not None)
+        if self.op in ("in", "not_in") and (
+            isinstance(self.value, (str, bytes)) or not hasattr(self.value, "__iter__")
+        ):
+            raise ValueError(f"{self.op} 的值必须是序列: {self.field}")
+        return (self.fields, self.op)
+
+
+@dataclass(frozen=True)
+class QuerySpec:
+    """过滤 + 排序条件
+
+    Attributes:
+        filters: 过滤条件，全部满足（AND）
+        sort: 排序字段，"-" 前缀表示降序，如 ("-created_at", "username")；
+            未包含 id 时自动追加 id 作为最后的排序键，保证分页结果稳定
+
+    Example:
+        >>> spec = QuerySpec(
+        ...     filters=(Filter("role", "eq", "admin"), Filter("is_active", "eq", True)),
+        ...     sort=("-created_at",),
+        ... )
+        >>> users = user_dao.find(spec, limit=20)
+    """
+
+    filters: Tuple[Filter, ...] = ()
+    sort: Tuple[str, ...] = ()
+
+    @classmethod
+    def build(
+        cls, filters: Sequence[Filter] = (), sort: Sequence[str] = ()
+    ) -> "QuerySpec":
+        """从任意序列构造，并规范化过滤条件"""
+        return cls(tuple(f.normalized() for f in filters), tuple(sort))
+
+    def shape(self) -> tuple:
+        """与具体值无关的结构（同时检查各过滤条件的值，见 Filter.shape）"""
+        return (tuple(f.normalized().shape() for f in self.filters), self.sort)
+
+    def params(self) -> Dict[str, Any]:
+        """本次查询的参数值，键与 CompiledQuery 中的 bindparam 对应"""
+        params: Dict[str, Any] = {}
+        for i, f in enumerate(self.filters):
+            f = f.normalized()
+            if f.op in ("is_null", "not_null"):
+                continue
+            if f.op == "range":
+                low, high = f.value
+                if low is not None:
+                    params[f"q{i}_lo"] = low
+                if high is not None:
+                    params[f"q{i}_hi"] = high
+            elif f.op in ("in", "not_in"):
+                params[f"q{i}"] = list(f.value)
+            else:
+                params[f"q{i}"] = f.value
+        return params
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    """编译后的查询条件
+
+    Attributes:
+        criteria: WHERE 条件表达式（值为 bindparam）
+        order_by: ORDER BY 子句
+    """
+
+    criteria: Tuple[ColumnElement[bool], ...]
+    order_by: Tuple[Any, ...]
+
+
+# (模型, 查询形状) -> 编译结果
+_COMPILED: Dict[tuple, CompiledQuery] = {}
+
+
+def compile_query(Model: Any, spec: QuerySpec) -> CompiledQuery:
+    """编译查询条件（按形状缓存）
+
+    Args:
+        Model: SQLAlchemy ORM 模型类
+        spec: 查询条件
+
+    Returns:
+        编译结果，执行时配合 spec.params() 传入参数
+
+    Raises:
+        ValueError: 字段不存在、操作符不支持或值的格式不正确
+    """
+    key = (Model, spec.shape())
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        compiled = _COMPILED[key] = _compile(Model, spec)
+    return compiled
+
+
+def _compile(Model: Any, spec: QuerySpec) -> CompiledQuery:
+    """校验字段并生成表达式"""
+    columns = {attr.key for attr in class_mapper(Model).column_attrs}
+
+    def column(name: str) -> Any:
+        if name not in columns:
+            raise ValueError(f"未知字段: {name}")
+        return getattr(Model, name)
+
+    criteria: List[ColumnElement[bool]] = []
+    for i, f in enumerate(spec.filters):
+        f = f.normalized()
+        if f.op not in OPERATORS:
+            raise ValueError(f"不支持的操作符: {f.op}")
+        if not f.fields:
+            raise ValueError("过滤条件缺少字段")
+
+        alternatives = [_criterion(column(name), f, i) for name in f.fields]
+        criteria.append(alternatives[0] if len(alternatives) == 1 else or_(*alternatives))
+
+    order_by = []
+    sort_fields = []
+    for item in spec.sort:
+        descending = item.startswith("-")
+        name = item.lstrip("-")
+        sort_fields.append(name)
+        order_by.append(column(name).desc() if descending else column(name).asc())
+    if "id" not in sort_fields:
+        order_by.append(Model.id.asc())
+
+    return CompiledQuery(tuple(criteria), tuple(order_by))
+
+
+def _criterion(column: Any, f: Filter, index: int) -> ColumnElement[bool]:
+    """单个字段的条件表达式"""
+    if f.op == "is_null":
+        return column.is_(None)
+    if f.op == "not_null":
+        return column.is_not(None)
+    if f.op == "range":
+        low, high = f.value
+        bounds = []
+        if low is not None:
+            bounds.append(column >= bindparam(f"q{index}_lo"))
+        if high is not None:
+            bounds.append(column <= bindparam(f"q{index}_hi"))
+        return and_(*bounds) if bounds else and_(True)
+    if f.op in ("in", "not_in"):
+        return _COMPARATORS[f.op](column, bindparam(f"q{index}", expanding=True))
+    return _COMPARATORS[f.op](column, bindparam(f"q{index}"))
@@ -0,0 +1,115 @@
+"""
+工作单元（Unit of Work）
+
+默认情况下 BaseDAO 的每个写操作都会立即提交。在工作单元内，写操作只 flush，
+由最外层作用域在结束时统一提交一次（出错则整体回滚）；嵌套的作用域使用
+SAVEPOINT，内层失败只回滚内层的修改。
+
+工作单元的状态保存在 Session.info 中，共用同一个 Session 的多个 DAO
+自动处于同一个工作单元。
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterator, List, Union
+
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+_DEPTH_KEY = "je_stack.uow_depth"
+_CALLBACKS_KEY = "je_stack.uow_callbacks"
+
+
+def in_unit_of_work(session: Union[Session, "AsyncSession"]) -> bool:
+    """判断 Session 当前是否处于工作单元中"""
+    return session.info.get(_DEPTH_KEY, 0) > 0
+
+
+def after_unit_of_work(
+    session: Union[Session, "AsyncSession"], callback: Callable[[], None]
+) -> None:
+    """登记在最外层工作单元结束（提交或回滚）后执行的回调，用于失效缓存等"""
+    session.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+
+
+def _finish(session: Union[Session, "AsyncSession"]) -> None:
+    """退出最外层作用域：重置状态并执行回调"""
+    session.info[_DEPTH_KEY] = 0
+    callbacks: List[Callable[[], None]] = session.info.pop(_CALLBACKS_KEY, [])
+    for callback in callbacks:
+        callback()
+
+
+@contextmanager
+def unit_of_work(session: Session) -> Iterator[Session]:
+    """在同一个事务中执行多个写操作
+
+    Args:
+        session: SQLAlchemy Session
+
+    Yields:
+        传入的 Session
+
+    Example:
+        >>> with unit_of_work(session):
+        ...     task_dao.update_task(1, status="completed")
+        ...     with unit_of_work(session):  # SAVEPOINT
+        ...         user_dao.update_user("john", nickname="J")
+    """
+    depth = session.info.get(_DEPTH_KEY, 0)
+    if depth:
+        savepoint = session.begin_nested()
+        session.info[_DEPTH_KEY] = depth + 1
+        try:
+            yield session
+            savepoint.commit()
+        except BaseException:
+            savepoint.rollback()
+            raise
+        finally:
+            session.info[_DEPTH_KEY] = depth
+        return
+
+    session.info[_DEPTH_KEY] = 1
+    try:
+        yield session
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        _finish(session)
+
+
+@asynccontextmanager
+async def async_unit_of_work(session: "AsyncSession") -> AsyncIterator["AsyncSession"]:
+    """unit_of_work 的 AsyncSession 版本
+
+    Example:
+        >>> async with async_unit_of_work(session):
+        ...     await task_dao.update_task(1, status="completed")
+    """
+    depth = session.info.get(_DEPTH_KEY, 0)
+    if depth:
+        savepoint = await session.begin_nested()
+        session.info[_DEPTH_KEY] = depth + 1
+        try:
+            yield session
+            await savepoint.commit()
+        except BaseException:
+            await savepoint.rollback()
+            raise
+        finally:
+            session.info[_DEPTH_KEY] = depth
+        return
+
+    session.info[_DEPTH_KEY] = 1
+    try:
+        yield session
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        _finish(session)
@@ -3,10 +3,35 @@
 """
 
 from .logger import setup_logger
-from .database import get_db_session, create_database_engine
+from .database import (
+    get_db_session,
+    create_database_engine,
+    get_async_db_session,
+    create_async_database_engine,
+    DatabaseSessionManager,
+    AsyncDatabaseSessionManager,
+    init_database,
+    init_async_database,
+    SQLITE_PROFILES,
+    is_sqlite_file_url,
+    WriteQueue,
+)
+from .db_metrics import PoolMetrics
+from .histogram import Histogram
 
 __all__ = [
     "setup_logger",
     "get_db_session",
     "create_database_engine",
+    "get_async_db_session",
+    "create_async_database_engine",
+    "DatabaseSessionManager",
+    "AsyncDatabaseSessionManager",
+    "init_database",
+    "init_async_database",
+    "SQLITE_PROFILES",
+    "is_sqlite_file_url",
+    "WriteQueue",
+    "PoolMetrics",
+    "Histogram",
 ]
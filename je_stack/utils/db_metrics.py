@@ -0,0 +1,182 @@
+"""
+数据库连接池与会话指标
+
+只通过 SQLAlchemy 的公开事件（连接池 / 方言 / 会话）采集：
+    - 正在使用的连接数、历史峰值、溢出连接数
+    - 每次取出连接的占用时间、新建连接的耗时
+    - 会话存活时间、每个会话执行的查询数、会话中取连接超时的次数
+
+连接池没有「开始等待连接」的事件，因此不直接测量等待时间：峰值达到
+pool_size + max_overflow 说明请求在排队等待连接，需要的连接数约为每秒
+取连接次数 × 平均占用时间。用于根据实际负载确定 pool_size /
+max_overflow，而不是凭经验猜测。
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from sqlalchemy import event, Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from .histogram import Histogram, LATENCY_BUCKETS_MS
+
+# 直方图桶的上界
+LIFETIME_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 30000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_QUERIES_KEY = "je_stack.query_count"
+# 连接记录（ConnectionRecord.info）中保存的时间戳
+_CONNECT_STARTED_KEY = "je_stack.connect_started"
+_CHECKED_OUT_AT_KEY = "je_stack.checked_out_at"
+
+
+class PoolMetrics:
+    """单个引擎的连接池与会话指标
+
+    Example:
+        >>> metrics = PoolMetrics(engine)
+        >>> metrics.instrument_sessions(SessionLocal)
+        >>> with metrics.track_session(SessionLocal()) as session:
+        ...     session.execute(select(User)).all()
+        >>> metrics.snapshot()["pool"]["peak_checked_out"]
+        1
+    """
+
+    def __init__(self, engine: Engine):
+        """在引擎上注册事件（异步引擎传入 engine.sync_engine）
+
+        Args:
+            engine: SQLAlchemy 引擎
+        """
+        self.engine = engine
+        self.connect_latency = Histogram(LATENCY_BUCKETS_MS)
+        self.checkout_hold = Histogram(LIFETIME_BUCKETS_MS)
+        self.session_lifetime = Histogram(LIFETIME_BUCKETS_MS)
+        self.session_queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.statements = 0
+        self.active_sessions = 0
+        self.sessions = 0
+        self._lock = threading.Lock()
+        self._attach()
+
+    def _attach(self) -> None:
+        """注册连接池 / 方言事件（在 dispose() 重建连接池后依然有效）"""
+
+        @event.listens_for(self.engine, "do_connect")
+        def _on_do_connect(dialect, connection_record, cargs, cparams):
+            connection_record.info[_CONNECT_STARTED_KEY] = time.perf_counter()
+
+        @event.listens_for(self.engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            started = connection_record.info.pop(_CONNECT_STARTED_KEY, None)
+            with self._lock:
+                self.connects += 1
+                if started is not None:
+                    self.connect_latency.observe((time.perf_counter() - started) * 1000)
+
+        @event.listens_for(self.engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            connection_record.info[_CHECKED_OUT_AT_KEY] = time.perf_counter()
+            with self._lock:
+                self.checkouts += 1
+                self.checked_out += 1
+                if self.checked_out > self.peak_checked_out:
+                    self.peak_checked_out = self.checked_out
+
+        @event.listens_for(self.engine, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            checked_out_at = None
+            if connection_record is not None:
+                checked_out_at = connection_record.info.pop(_CHECKED_OUT_AT_KEY, None)
+            with self._lock:
+                self.checked_out -= 1
+                if checked_out_at is not None:
+                    self.checkout_hold.observe((time.perf_counter() - checked_out_at) * 1000)
+
+        @event.listens_for(self.engine, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+        @event.listens_for(self.engine, "before_cursor_execute")
+        def _on_execute(conn, cursor, statement, parameters, context, executemany):
+            with self._lock:
+                self.statements += 1
+
+    def instrument_sessions(self, target: Any) -> None:
+        """统计 target（sessionmaker 或 Session 子类）创建的会话执行的查询数
+
+        只统计通过 Session 执行的语句（execute / scalars / query / get），
+        flush 产生的 INSERT / UPDATE 计入连接池的 statements
+        """
+
+        @event.listens_for(target, "do_orm_execute")
+        def _on_orm_execute(orm_execute_state):
+            info = orm_execute_state.session.info
+            info[_QUERIES_KEY] = info.get(_QUERIES_KEY, 0) + 1
+
+    @contextmanager
+    def track_session(self, session: Any) -> Iterator[Any]:
+        """记录会话的存活时间、查询数和取连接超时（Session 或 AsyncSession）"""
+        session.info[_QUERIES_KEY] = 0
+        with self._lock:
+            self.active_sessions += 1
+            self.sessions += 1
+        started = time.perf_counter()
+        try:
+            yield session
+        except PoolTimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.active_sessions -= 1
+                self.session_lifetime.observe(elapsed)
+                self.session_queries.observe(session.info.get(_QUERIES_KEY, 0))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前指标快照
+
+        Returns:
+            {"pool": 连接池状态, "checkout_hold_ms": 直方图, "connect_latency_ms": 直方图,
+             "sessions": 会话计数, "session_lifetime_ms": 直方图,
+             "session_queries": 直方图}
+        """
+        pool = self.engine.pool
+        with self._lock:
+            pool_stats: Dict[str, Any] = {
+                "class": type(pool).__name__,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "statements": self.statements,
+            }
+            # QueuePool 才有容量相关的信息
+            for name in ("size", "overflow", "checkedin", "timeout"):
+                method = getattr(pool, name, None)
+                if callable(method):
+                    pool_stats[name] = method()
+            return {
+                "pool": pool_stats,
+                "checkout_hold_ms": self.checkout_hold.snapshot(),
+                "connect_latency_ms": self.connect_latency.snapshot(),
+                "sessions": {
+                    "active": self.active_sessions,
+                    "total": self.sessions,
+                },
+                "session_lifetime_ms": self.session_lifetime.snapshot(),
+                "session_queries": self.session_queries.snapshot(),
+            }
@@ -0,0 +1,66 @@
+"""
+固定桶直方图
+
+连接池指标（db_metrics）和密码线程池（auth.password）共用，只依赖标准库，
+不会引入数据库相关模块。
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+# 耗时直方图桶的上界（毫秒）
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class Histogram:
+    """固定桶直方图（非线程安全，由使用方加锁）
+
+    Example:
+        >>> h = Histogram((1, 5, 10))
+        >>> h.observe(3)
+        >>> h.snapshot()["buckets"]
+        {'<=1': 0, '<=5': 1, '<=10': 0, '+Inf': 0}
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """估算分位数（返回所在桶的上界，落在最后一个桶时返回最大值）"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bound in enumerate(self.bounds):
+            seen += self.counts[i]
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {f"<={bound:g}": n for bound, n in zip(self.bounds, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+            "buckets": buckets,
+        }